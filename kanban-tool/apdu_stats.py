@@ -0,0 +1,184 @@
+"""
+CWT Thread Verification System - APDU Statistics
+Per-command latency histograms, status words and counters for card I/O
+"""
+
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+from config import APDU_STATS_WINDOW, APDU_LATENCY_BUCKETS_MS
+
+
+# ACR122U pseudo-APDU instructions (CLA FF) by INS byte
+APDU_NAMES = {
+    0xCA: 'get_uid',
+    0x82: 'load_key',
+    0x86: 'auth',
+    0xB0: 'read',
+    0xD6: 'write',
+    0x00: 'reader',
+}
+
+
+# Card commands sent through the reader's direct transmit (FF 00 00 00 Lc
+# D4 42 + command), by command byte
+DIRECT_NAMES = {
+    0x3A: 'fast_read',
+    0x30: 'page_read',
+    0xA2: 'page_write',
+}
+
+
+def command_name(apdu: List[int]) -> str:
+    """Short name of an APDU's command ('read', 'auth', ... or the INS in hex)"""
+    if len(apdu) < 2:
+        return 'invalid'
+    if apdu[0] != 0xFF:
+        return f"{apdu[0]:02X} {apdu[1]:02X}"
+    if apdu[1] == 0x00 and len(apdu) > 7 and list(apdu[5:7]) == [0xD4, 0x42]:
+        return DIRECT_NAMES.get(apdu[7], 'reader')
+    if apdu[1] == 0x00 and len(apdu) > 2 and apdu[2] == 0x40:
+        return 'led'
+    return APDU_NAMES.get(apdu[1], f"FF {apdu[1]:02X}")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class _CommandStats:
+    """Counters and recent latencies of one command"""
+    
+    def __init__(self):
+        self.count = 0
+        self.failures = 0  # Completed with a status word other than 90 00
+        self.errors = 0    # Raised instead of returning a status word
+        self.status_words: Counter = Counter()
+        self.recent: deque = deque(maxlen=APDU_STATS_WINDOW)  # Latencies in ms
+    
+    def snapshot(self) -> dict:
+        latencies = sorted(self.recent)
+        
+        histogram = {}
+        lower = 0
+        for bound in APDU_LATENCY_BUCKETS_MS:
+            histogram[f"<={bound}ms"] = sum(1 for v in latencies if lower < v <= bound)
+            lower = bound
+        histogram[f">{lower}ms"] = sum(1 for v in latencies if v > lower)
+        
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'errors': self.errors,
+            'status_words': dict(self.status_words),
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'p50_ms': round(_percentile(latencies, 0.5), 2) if latencies else 0.0,
+            'p95_ms': round(_percentile(latencies, 0.95), 2) if latencies else 0.0,
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'histogram': histogram,
+        }
+
+
+class ApduStats:
+    """
+    Instrumentation for one reader's APDU traffic
+    
+    Every transmit is recorded with its command, latency and status word
+    (or the exception it raised). Latency histograms and percentiles cover
+    the last APDU_STATS_WINDOW APDUs of each command; counts are totals
+    since the last reset. Named counters track events around the APDUs
+    such as authentication cache hits and retries. Thread-safe.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[str, _CommandStats] = {}
+        self._counters: Counter = Counter()
+    
+    def record(self, apdu: List[int], latency_s: float,
+               sw1: Optional[int] = None, sw2: Optional[int] = None,
+               error: Optional[Exception] = None):
+        """
+        Record one transmitted APDU
+        
+        Args:
+            apdu: Command sent
+            latency_s: Round-trip time in seconds
+            sw1: Status word byte 1 (None if the transmit raised)
+            sw2: Status word byte 2
+            error: Exception raised by the transmit, if any
+        """
+        name = command_name(apdu)
+        
+        with self._lock:
+            stats = self._commands.get(name)
+            if stats is None:
+                stats = self._commands[name] = _CommandStats()
+            
+            stats.count += 1
+            stats.recent.append(latency_s * 1000)
+            
+            if error is not None:
+                stats.errors += 1
+                stats.status_words[type(error).__name__] += 1
+            else:
+                stats.status_words[f"{sw1:02X} {sw2:02X}"] += 1
+                if (sw1, sw2) != (0x90, 0x00):
+                    stats.failures += 1
+    
+    def count(self, counter: str, amount: int = 1):
+        """Increment a named counter (e.g. 'auth_cache_hit', 'retry')"""
+        with self._lock:
+            self._counters[counter] += amount
+    
+    def reset(self):
+        """Clear all statistics"""
+        with self._lock:
+            self._commands.clear()
+            self._counters.clear()
+    
+    def snapshot(self) -> dict:
+        """
+        Current statistics
+        
+        Returns:
+            dict: {'commands': {name: {count, failures, errors, status_words,
+                mean_ms, p50_ms, p95_ms, max_ms, histogram}}, 'counters': {...}}
+        """
+        with self._lock:
+            return {
+                'commands': {
+                    name: stats.snapshot() for name, stats in sorted(self._commands.items())
+                },
+                'counters': dict(self._counters),
+            }
+    
+    @staticmethod
+    def format_report(snapshot: dict) -> str:
+        """Render a snapshot as a fixed-width text table"""
+        lines = [
+            f"{'Command':<10}{'Count':>7}{'Fail':>6}{'Err':>5}"
+            f"{'Mean':>8}{'p50':>8}{'p95':>8}{'Max':>8}  Status words"
+        ]
+        for name, stats in snapshot['commands'].items():
+            status_words = ", ".join(f"{sw}: {n}" for sw, n in stats['status_words'].items())
+            lines.append(
+                f"{name:<10}{stats['count']:>7}{stats['failures']:>6}{stats['errors']:>5}"
+                f"{stats['mean_ms']:>8.1f}{stats['p50_ms']:>8.1f}{stats['p95_ms']:>8.1f}"
+                f"{stats['max_ms']:>8.1f}  {status_words}"
+            )
+        
+        for name, stats in snapshot['commands'].items():
+            buckets = "  ".join(f"{bucket} {n}" for bucket, n in stats['histogram'].items() if n)
+            if buckets:
+                lines.append(f"{name} latency: {buckets}")
+        
+        if snapshot['counters']:
+            lines.append("Counters: " + ", ".join(
+                f"{name} {n}" for name, n in sorted(snapshot['counters'].items())
+            ))
+        
+        return "\n".join(lines)
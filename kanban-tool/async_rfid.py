@@ -0,0 +1,183 @@
+"""
+CWT Thread Verification System - Async RFID Manager
+asyncio front end for RFIDManager, for services running an event loop
+
+Usage:
+    async with AsyncRFIDManager() as rfid:
+        success, msg = await rfid.connect_reader()
+        success, msg = await rfid.wait_for_card(timeout=10)
+        success, thread1, thread2, msg = await rfid.read_kanban()
+        
+        async for event in rfid.card_events():
+            ...
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+from rfid_manager import RFIDManager
+from card_monitor import CardMonitor, CardEvent
+from config import READER_TIMEOUT
+
+
+class _LoopQueue:
+    """
+    Stand-in for CardMonitor's queue that hands events to an event loop
+    
+    CardMonitor calls put() on its own thread; the event is moved onto
+    the asyncio.Queue on the loop thread.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, events: asyncio.Queue):
+        self.loop = loop
+        self.events = events
+    
+    def put(self, event: CardEvent):
+        self.loop.call_soon_threadsafe(self.events.put_nowait, event)
+
+
+class AsyncRFIDManager:
+    """
+    Awaitable RFIDManager
+    
+    Every RFIDManager call runs on one dedicated executor thread, so all
+    PC/SC calls for the reader stay on the same thread (as with
+    ReaderWorker) and the event loop never blocks. Calls are executed in
+    the order they are awaited. Results are those of RFIDManager:
+    (success, ..., message) tuples, never exceptions for card errors.
+    """
+    
+    def __init__(self, rfid: Optional[RFIDManager] = None,
+                 on_timeout: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            rfid: Manager to drive (default: a new RFIDManager)
+            on_timeout: Passed to a new RFIDManager, see RFIDManager
+        """
+        self.rfid = rfid if rfid is not None else RFIDManager(on_timeout)
+        self.logger = logging.getLogger(__name__)
+        
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncRFID")
+    
+    async def __aenter__(self) -> 'AsyncRFIDManager':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _call(self, func: Callable, *args):
+        """Run a blocking RFIDManager call on the executor thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def _call_cancellable(self, func: Callable, *args):
+        """
+        Run a blocking wait that takes a cancelled callable as last argument
+        
+        If the awaiting task is cancelled the wait is told to stop, so the
+        executor thread is free for the next call.
+        """
+        stop = threading.Event()
+        try:
+            return await self._call(func, *args, stop.is_set)
+        except asyncio.CancelledError:
+            stop.set()
+            raise
+    
+    async def connect_reader(self, reader=None) -> Tuple[bool, str]:
+        """Connect to the reader, see RFIDManager.connect_reader"""
+        return await self._call(self.rfid.connect_reader, reader)
+    
+    async def wait_for_card(self, timeout: int = READER_TIMEOUT) -> Tuple[bool, str]:
+        """
+        Wait for a card to be placed on the reader
+        
+        Args:
+            timeout: Maximum seconds to wait for card
+            
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        return await self._call_cancellable(self.rfid.wait_for_card, timeout)
+    
+    async def wait_for_removal(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the card is taken off the reader
+        
+        Returns:
+            bool: True if no card is present, False on timeout/error
+        """
+        return await self._call_cancellable(self.rfid.wait_for_removal, timeout)
+    
+    async def read_kanban(self) -> Tuple[bool, Optional[str], Optional[str], str]:
+        """
+        Read thread codes from the card, see RFIDManager.read_kanban
+        
+        Returns:
+            Tuple[bool, Optional[str], Optional[str], str]:
+                (Success status, Thread 1, Thread 2, Message)
+        """
+        return await self._call(self.rfid.read_kanban)
+    
+    async def write_kanban(self, thread1: str, thread2: str,
+                           skip_identical: bool = False) -> Tuple[bool, str]:
+        """
+        Write thread codes to the card, see RFIDManager.write_kanban
+        
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        return await self._call(self.rfid.write_kanban, thread1, thread2, skip_identical)
+    
+    async def write_bypass(self) -> Tuple[bool, str]:
+        """Write a bypass card, see RFIDManager.write_bypass"""
+        return await self._call(self.rfid.write_bypass)
+    
+    async def clear_card(self) -> Tuple[bool, str]:
+        """
+        Clear the Kanban blocks, see RFIDManager.clear_card
+        
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        return await self._call(self.rfid.clear_card)
+    
+    async def disconnect(self):
+        """Release the card handle (the reader stays connected)"""
+        await self._call(self.rfid.disconnect)
+    
+    async def card_events(self) -> AsyncIterator[CardEvent]:
+        """
+        Stream card insert/remove events of the connected reader
+        
+        Events come from a CardMonitor with its own PC/SC context, so the
+        stream does not hold up card operations. Each stream has its own
+        monitor, stopped when the iteration ends.
+        
+        Raises:
+            RuntimeError: If no reader is connected
+        """
+        reader = self.rfid.reader
+        if reader is None:
+            raise RuntimeError("Reader not connected")
+        
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        monitor = CardMonitor(reader, _LoopQueue(loop, events))
+        monitor.start()
+        try:
+            while True:
+                yield await events.get()
+        finally:
+            # stop() joins the monitor thread; keep that off the loop
+            await loop.run_in_executor(None, monitor.stop)
+    
+    async def close(self):
+        """Close the reader and stop the executor thread"""
+        try:
+            await self._call(self.rfid.close)
+        finally:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,222 @@
+"""
+CWT Thread Verification System - Batch Writer
+Streaming batch writing of Kanban cards, keyed by card UID
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from rfid_manager import RFIDManager
+
+
+class BatchItem(NamedTuple):
+    """One card to be written in a batch"""
+    thread1: str
+    thread2: str
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one card presented during a batch"""
+    number: int
+    uid: str
+    item: BatchItem
+    success: bool
+    unchanged: bool
+    message: str
+    timings: Optional[Dict[str, float]] = None  # Per-phase durations (ms)
+    index: Optional[int] = None  # Index of the item in BatchJob.items
+
+
+class BatchJob:
+    """
+    Shared state of one batch write
+    
+    Hands out items to writers and records which UIDs have been handled,
+    so a card that is presented again is not rewritten. All methods are
+    thread-safe.
+    """
+    
+    def __init__(self, items: List[BatchItem], skip_identical: bool = False,
+                 stop_event: Optional[threading.Event] = None):
+        self.items = list(items)
+        self.skip_identical = skip_identical
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        self.results: List[BatchResult] = []
+        
+        self._lock = threading.Lock()
+        self._pending = list(range(len(self.items)))  # Unclaimed item indexes
+        self._written: Dict[str, int] = {}  # UID -> card number
+    
+    @classmethod
+    def repeat(cls, thread1: str, thread2: str, quantity: int,
+               **kwargs) -> 'BatchJob':
+        """Create a job that writes the same codes to quantity cards"""
+        return cls([BatchItem(thread1, thread2)] * quantity, **kwargs)
+    
+    @property
+    def quantity(self) -> int:
+        """Number of cards the batch should produce"""
+        return len(self.items)
+    
+    @property
+    def success_count(self) -> int:
+        with self._lock:
+            return len(self._written)
+    
+    @property
+    def failed_count(self) -> int:
+        with self._lock:
+            return sum(1 for r in self.results if not r.success)
+    
+    @property
+    def unchanged_count(self) -> int:
+        with self._lock:
+            return sum(1 for r in self.results if r.success and r.unchanged)
+    
+    @property
+    def finished(self) -> bool:
+        """True once every item has been written (or the job was stopped)"""
+        with self._lock:
+            return len(self._written) >= len(self.items) or self.stop_event.is_set()
+    
+    def written_number(self, uid: str) -> Optional[int]:
+        """Card number a UID was written as in this batch, if any"""
+        with self._lock:
+            return self._written.get(uid)
+    
+    def claim(self) -> Optional[int]:
+        """
+        Reserve the next unwritten item
+        
+        Returns:
+            Optional[int]: Item index, or None if nothing is left to claim
+        """
+        with self._lock:
+            if not self._pending or self.stop_event.is_set():
+                return None
+            return self._pending.pop(0)
+    
+    def complete(self, index: int, uid: str, success: bool, unchanged: bool,
+                 message: str, timings: Optional[Dict[str, float]] = None) -> BatchResult:
+        """
+        Record the outcome of a claimed item
+        
+        A failed item goes back to the front of the queue so the next
+        card picks it up.
+        """
+        with self._lock:
+            if success:
+                number = len(self._written) + 1
+                self._written[uid] = number
+            else:
+                number = 0
+                self._pending.insert(0, index)
+            
+            result = BatchResult(
+                number, uid, self.items[index], success, unchanged, message,
+                timings, index
+            )
+            self.results.append(result)
+            return result
+
+
+class StreamingBatchWriter:
+    """
+    Writes a BatchJob as cards are swapped on one reader
+    
+    Card swaps are handled as a stream of UIDs: the write starts as soon
+    as the reader reports a new card, a UID already written in this batch
+    is refused, and the writer then blocks until that card is removed.
+    No step waits on a fixed sleep interval.
+    """
+    
+    def __init__(self, rfid: RFIDManager, job: BatchJob,
+                 log: Optional[Callable[[str, str], None]] = None,
+                 label: str = "",
+                 on_result: Optional[Callable[[BatchResult], None]] = None):
+        self.rfid = rfid
+        self.job = job
+        self.label = label  # Prefix for log lines (e.g. reader name)
+        self.on_result = on_result  # Called (from this thread) per written card
+        self.logger = logging.getLogger(__name__)
+        self._log_callback = log
+    
+    def _log(self, message: str, level: str = 'info'):
+        """Send a progress line to the log callback"""
+        if self.label:
+            message = f"{self.label} {message}"
+        if self._log_callback is not None:
+            self._log_callback(message, level)
+        else:
+            self.logger.info(message)
+    
+    def run(self):
+        """Process cards until the job is finished or stopped"""
+        # Also ends the wait when another reader completes the job
+        def cancelled() -> bool:
+            return self.job.finished
+        
+        reader_error = False
+        
+        while not self.job.finished:
+            # Blocks on reader status changes until a card is present
+            success, msg = self.rfid.wait_for_card(timeout=60, cancelled=cancelled)
+            if not success:
+                if not cancelled() and msg != "Timeout waiting for card":
+                    # Reported once; the batch resumes when the reader is back
+                    if not reader_error:
+                        self._log(f"Reader error: {msg} - waiting for the reader", 'error')
+                        reader_error = True
+                    self.job.stop_event.wait(1.0)
+                continue
+            
+            reader_error = False
+            
+            if not self.job.finished:
+                self._process_card()
+            
+            self.rfid.disconnect()
+            
+            # Same card stays on the reader until it is swapped
+            if not self.job.finished:
+                self.rfid.wait_for_removal(cancelled=cancelled)
+    
+    def _process_card(self):
+        """Write the card currently on the reader, unless already done"""
+        uid = self.rfid.get_card_uid()
+        if uid is None:
+            self._log("✗ Could not read card UID - please re-place the card", 'error')
+            self.rfid.feedback('failure')
+            return
+        
+        number = self.job.written_number(uid)
+        if number is not None:
+            self._log(f"[{uid}] Already written as card {number} in this batch - skipped", 'warning')
+            self.rfid.feedback('failure')
+            return
+        
+        index = self.job.claim()
+        if index is None:
+            return
+        
+        item = self.job.items[index]
+        success, msg = self.rfid.write_kanban(item.thread1, item.thread2, self.job.skip_identical)
+        unchanged = success and self.rfid.last_blocks_written == 0
+        self.rfid.feedback('success' if success else 'failure')
+        result = self.job.complete(
+            index, uid, success, unchanged, msg, dict(self.rfid.last_timings)
+        )
+        if self.on_result is not None:
+            self.on_result(result)
+        
+        progress = f"[Card {result.number}/{self.job.quantity}] [{uid}]"
+        if not success:
+            self._log(f"[{uid}] ✗ Failed: {msg}", 'error')
+        elif unchanged:
+            self._log(f"{progress} ✓ Already up to date", 'success')
+        else:
+            self._log(f"{progress} ✓ Success!", 'success')
+        
+        if not self.job.finished:
+            self._log("Remove card and place next card", 'warning')
@@ -0,0 +1,266 @@
+"""
+CWT Thread Verification System - Benchmark
+Times card operations and counts APDUs against the simulated reader
+
+Usage:
+    python benchmark.py
+    python benchmark.py --latency-ms 15 --repeat 50 --cards 20
+    python benchmark.py --card ntag
+    python benchmark.py --profiles
+    python benchmark.py --json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, NamedTuple, Optional
+
+from rfid_manager import RFIDManager
+from batch_writer import BatchJob, StreamingBatchWriter
+from simulator import SimulatedCard, SimulatedNtag, SimulatedReader
+from reader_profiles import ProfileResult, load_profiles, measure_profile, best_profile, print_results
+
+
+class Measurement(NamedTuple):
+    """Timing and APDU count of one benchmarked operation"""
+    name: str
+    runs: int
+    mean_ms: float
+    min_ms: float
+    max_ms: float
+    apdus: float  # APDUs per operation (per card for the multiple modes)
+    breakdown: dict  # APDU name -> count per operation
+
+
+# Simulated card types (--card)
+CARD_TYPES = {
+    'classic': SimulatedCard,
+    'ntag': SimulatedNtag,
+}
+
+
+def new_card(number: int, card: str = 'classic'):
+    """Fresh simulated card with a UID derived from number"""
+    return CARD_TYPES[card]([0x04, (number >> 16) & 0xFF, (number >> 8) & 0xFF, number & 0xFF])
+
+
+def _summarize(name: str, durations: List[float], counts: Counter, per: int) -> Measurement:
+    """Build a Measurement from per-run durations (s) and total APDU counts"""
+    return Measurement(
+        name,
+        len(durations),
+        statistics.mean(durations) * 1000,
+        min(durations) * 1000,
+        max(durations) * 1000,
+        sum(counts.values()) / per,
+        {key: round(value / per, 2) for key, value in sorted(counts.items())}
+    )
+
+
+def bench_single(reader: SimulatedReader, rfid: RFIDManager, name: str,
+                 operation: Callable[[], tuple], repeat: int, card: str) -> Measurement:
+    """
+    Time one single-card operation the way the GUI runs it
+    
+    Each run places a fresh card, waits for it, runs the operation and
+    disconnects, so caches start cold like on the floor.
+    """
+    durations = []
+    counts: Counter = Counter()
+    
+    for i in range(repeat):
+        reader.insert(new_card(i, card))
+        reader.reset_stats()
+        
+        start = time.perf_counter()
+        success, msg = rfid.wait_for_card(timeout=5)
+        if success:
+            result = operation()
+            success, msg = result[0], result[-1]
+        rfid.disconnect()
+        durations.append(time.perf_counter() - start)
+        
+        counts.update(reader.apdu_counts)
+        reader.remove()
+        
+        if not success:
+            raise RuntimeError(f"{name} failed: {msg}")
+    
+    return _summarize(name, durations, counts, repeat)
+
+
+def bench_write_multiple(reader: SimulatedReader, rfid: RFIDManager, cards: int,
+                         card: str) -> Measurement:
+    """Time a streamed batch write, swapping cards as soon as each is written"""
+    job = BatchJob.repeat("TH-BENCH-001", "TH-BENCH-002", cards)
+    written = threading.Event()
+    
+    def on_result(result):
+        if result.success:
+            written.set()
+    
+    writer = StreamingBatchWriter(rfid, job, on_result=on_result)
+    thread = threading.Thread(target=writer.run, daemon=True)
+    
+    durations = []
+    reader.reset_stats()
+    thread.start()
+    
+    for i in range(cards):
+        written.clear()
+        start = time.perf_counter()
+        reader.insert(new_card(i, card))
+        if not written.wait(10):
+            job.stop_event.set()
+            raise RuntimeError(f"write_multiple stalled on card {i + 1}")
+        durations.append(time.perf_counter() - start)
+        reader.remove()
+    
+    thread.join(5)
+    return _summarize("write_multiple", durations, reader.apdu_counts, cards)
+
+
+def bench_read_multiple(reader: SimulatedReader, rfid: RFIDManager, cards: int,
+                        card: str) -> Measurement:
+    """Time the continuous read loop (wait, read, disconnect, wait for removal)"""
+    durations = []
+    reader.reset_stats()
+    
+    for i in range(cards):
+        start = time.perf_counter()
+        reader.insert(new_card(i, card))
+        
+        success, msg = rfid.wait_for_card(timeout=5)
+        if success:
+            success, _, _, msg = rfid.read_kanban()
+        rfid.disconnect()
+        
+        reader.remove()
+        rfid.wait_for_removal(timeout=5)
+        durations.append(time.perf_counter() - start)
+        
+        if not success:
+            raise RuntimeError(f"read_multiple failed on card {i + 1}: {msg}")
+    
+    return _summarize("read_multiple", durations, reader.apdu_counts, cards)
+
+
+def run_benchmarks(latency_ms: float, repeat: int, cards: int,
+                   card: str = 'classic') -> List[Measurement]:
+    """Run every benchmark on a fresh simulated reader"""
+    reader = SimulatedReader(latency_ms=latency_ms)
+    rfid = RFIDManager()
+    # LED/buzzer feedback is sent in the background after the operation;
+    # leave it out so the APDU counts cover the card transaction only
+    rfid.feedback_enabled = False
+    success, msg = rfid.connect_reader(reader)
+    if not success:
+        raise RuntimeError(msg)
+    
+    try:
+        return [
+            bench_single(reader, rfid, "write_kanban",
+                         lambda: rfid.write_kanban("TH-BENCH-001", "TH-BENCH-002"), repeat, card),
+            bench_single(reader, rfid, "read_kanban", rfid.read_kanban, repeat, card),
+            bench_single(reader, rfid, "clear_card", rfid.clear_card, repeat, card),
+            bench_write_multiple(reader, rfid, cards, card),
+            bench_read_multiple(reader, rfid, cards, card),
+        ]
+    finally:
+        rfid.close()
+
+
+def run_profile_benchmarks(latency_ms: float, cycles: int, card: str = 'classic') -> List[ProfileResult]:
+    """
+    Time card detection and a Kanban read under every reader profile
+    
+    Uses a simulated reader that models the PICC polling interval, so
+    the detection times show the effect of the polling settings.
+    """
+    reader = SimulatedReader(latency_ms=latency_ms, poll_detection=True)
+    rfid = RFIDManager()
+    rfid.feedback_enabled = False
+    success, msg = rfid.connect_reader(reader)
+    if not success:
+        raise RuntimeError(msg)
+    
+    def place_card(cycle: int) -> float:
+        reader.insert(new_card(cycle, card))
+        return time.perf_counter()
+    
+    def remove_card(cycle: int):
+        reader.remove()
+    
+    try:
+        return [
+            measure_profile(rfid, profile, cycles, place_card, remove_card, timeout=2)
+            for profile in load_profiles().values()
+        ]
+    finally:
+        rfid.close()
+
+
+def print_table(results: List[Measurement], latency_ms: float, card: str):
+    """Print results as a text table"""
+    print(f"Simulated reader, {card} cards, {latency_ms:g} ms per APDU")
+    print(f"{'Operation':<16}{'Runs':>6}{'Mean ms':>10}{'Min ms':>10}{'Max ms':>10}{'APDUs':>8}  Breakdown")
+    for r in results:
+        breakdown = ", ".join(f"{key} {value:g}" for key, value in r.breakdown.items())
+        print(f"{r.name:<16}{r.runs:>6}{r.mean_ms:>10.2f}{r.min_ms:>10.2f}"
+              f"{r.max_ms:>10.2f}{r.apdus:>8.2f}  {breakdown}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(
+        description="Time Kanban card operations against a simulated reader"
+    )
+    parser.add_argument('--latency-ms', type=float, default=10.0,
+                        help="simulated time per APDU (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=20,
+                        help="runs per single-card operation (default: %(default)s)")
+    parser.add_argument('--cards', type=int, default=10,
+                        help="cards for the multiple modes (default: %(default)s)")
+    parser.add_argument('--card', choices=sorted(CARD_TYPES), default='classic',
+                        help="simulated card type (default: %(default)s)")
+    parser.add_argument('--profiles', action='store_true',
+                        help="compare reader profiles (card detection and read latency)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args(argv)
+    
+    if args.profiles:
+        profile_results = run_profile_benchmarks(args.latency_ms, args.cards, args.card)
+        best = best_profile(profile_results)
+        if args.json:
+            print(json.dumps({
+                'latency_ms': args.latency_ms,
+                'card': args.card,
+                'profiles': [r._asdict() for r in profile_results],
+                'best': best.profile if best is not None else None,
+            }, indent=2))
+        else:
+            print(f"Simulated reader, {args.card} cards, {args.latency_ms:g} ms per APDU")
+            print_results(profile_results)
+            print(f"Fastest stable profile: {best.profile if best is not None else 'none'}")
+        return 0
+    
+    results = run_benchmarks(args.latency_ms, args.repeat, args.cards, args.card)
+    
+    if args.json:
+        print(json.dumps({
+            'latency_ms': args.latency_ms,
+            'card': args.card,
+            'results': [r._asdict() for r in results],
+        }, indent=2))
+    else:
+        print_table(results, args.latency_ms, args.card)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+CWT Thread Verification System - Card Monitor
+Event-driven card insert/remove detection using PC/SC status changes
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+from config import CARD_MONITOR_TIMEOUT_MS
+
+
+# Event kinds
+CARD_INSERTED = "inserted"
+CARD_REMOVED = "removed"
+
+
+class CardEvent(NamedTuple):
+    """Card insert/remove event delivered by CardMonitor"""
+    kind: str
+    reader: str
+    atr: List[int]
+    timestamp: float
+
+
+class CardMonitor:
+    """
+    Watches one reader for card insert/remove events
+    
+    A background thread blocks in SCardGetStatusChange on its own PC/SC
+    context and puts a CardEvent on the queue whenever the card state
+    changes, so nothing has to poll the reader.
+    """
+    
+    def __init__(self, reader, events: Optional[queue.Queue] = None):
+        self.reader_name = str(reader)
+        self.events = events if events is not None else queue.Queue()
+        self.logger = logging.getLogger(__name__)
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._context = None
+    
+    def start(self):
+        """Start monitoring in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="CardMonitor", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop monitoring and wait for the thread to exit"""
+        self._stop.set()
+        
+        # Wake the thread out of SCardGetStatusChange
+        context = self._context
+        if context is not None:
+            try:
+                from smartcard.scard import SCardCancel
+                SCardCancel(context)
+            except:
+                pass
+        
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Thread body: block on status changes and emit events"""
+        # Imported here so loading this module doesn't pull in pyscard
+        from smartcard.scard import (
+            SCardEstablishContext, SCardGetStatusChange, SCardGetErrorMessage,
+            SCARD_SCOPE_USER, SCARD_S_SUCCESS, SCARD_E_TIMEOUT, SCARD_E_CANCELLED,
+            SCARD_STATE_UNAWARE, SCARD_STATE_CHANGED, SCARD_STATE_PRESENT,
+            SCARD_STATE_MUTE
+        )
+        
+        current_state = SCARD_STATE_UNAWARE
+        card_present = False
+        
+        while not self._stop.is_set():
+            try:
+                if self._context is None:
+                    hresult, self._context = SCardEstablishContext(SCARD_SCOPE_USER)
+                    if hresult != SCARD_S_SUCCESS:
+                        self._context = None
+                        raise RuntimeError(SCardGetErrorMessage(hresult))
+                
+                # Bounded wait so a stop() racing the cancel still returns
+                hresult, states = SCardGetStatusChange(
+                    self._context, CARD_MONITOR_TIMEOUT_MS,
+                    [(self.reader_name, current_state)]
+                )
+                
+                if hresult in (SCARD_E_TIMEOUT, SCARD_E_CANCELLED):
+                    continue
+                if hresult != SCARD_S_SUCCESS:
+                    raise RuntimeError(SCardGetErrorMessage(hresult))
+                
+                _, event_state, atr = states[0]
+                current_state = event_state & ~SCARD_STATE_CHANGED
+                
+                present = bool(event_state & SCARD_STATE_PRESENT) and \
+                    not (event_state & SCARD_STATE_MUTE)
+                
+                if present != card_present:
+                    card_present = present
+                    kind = CARD_INSERTED if present else CARD_REMOVED
+                    self.events.put(CardEvent(kind, self.reader_name, list(atr), time.time()))
+                    self.logger.debug(f"Card {kind} on {self.reader_name}")
+                    
+            except Exception as e:
+                self.logger.debug(f"Card monitor error: {e}")
+                self._release_context()
+                current_state = SCARD_STATE_UNAWARE
+                # Back off before re-establishing the context
+                self._stop.wait(1.0)
+        
+        self._release_context()
+    
+    def _release_context(self):
+        """Release the monitor's PC/SC context"""
+        context = self._context
+        self._context = None
+        if context is not None:
+            try:
+                from smartcard.scard import SCardReleaseContext
+                SCardReleaseContext(context)
+            except:
+                pass
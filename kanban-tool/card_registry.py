@@ -0,0 +1,156 @@
+"""
+CWT Thread Verification System - Card Registry
+UID-indexed record of issued Kanban cards (SQLite, cached in memory)
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from config import REGISTRY_FILE
+
+
+class CardRecord(NamedTuple):
+    """Last known state of one card"""
+    uid: str
+    thread1: str
+    thread2: str
+    write_count: int
+    last_written: str  # ISO timestamp
+
+
+class CardRegistry:
+    """
+    Local registry of cards keyed by UID
+    
+    The whole index is loaded into a dict when opened, so lookups never
+    touch the disk or the card. Writes go to the dict and to SQLite (WAL
+    mode). All methods are thread-safe, so reader workers can record
+    writes directly.
+    """
+    
+    def __init__(self, path: str = REGISTRY_FILE):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._cards: Dict[str, CardRecord] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        
+        self._open()
+    
+    def _open(self):
+        """Open (or create) the index and load it into memory"""
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cards ("
+                "uid TEXT PRIMARY KEY, thread1 TEXT, thread2 TEXT, "
+                "write_count INTEGER, last_written TEXT)"
+            )
+            self._db.commit()
+            
+            for row in self._db.execute(
+                "SELECT uid, thread1, thread2, write_count, last_written FROM cards"
+            ):
+                record = CardRecord(*row)
+                self._cards[record.uid] = record
+            
+            self.logger.info(f"Card registry loaded: {len(self._cards)} cards")
+            
+        except sqlite3.Error as e:
+            # Keep working from memory only; history is lost on exit
+            self.logger.error(f"Cannot open card registry {self.path}: {e}")
+            self._db = None
+    
+    def __len__(self) -> int:
+        return len(self._cards)
+    
+    def get(self, uid: Optional[str]) -> Optional[CardRecord]:
+        """
+        Look up a card by UID
+        
+        Args:
+            uid: Card UID as returned by RFIDManager.get_card_uid()
+            
+        Returns:
+            Optional[CardRecord]: Last known state, or None for an unknown card
+        """
+        if not uid:
+            return None
+        return self._cards.get(uid)
+    
+    def record_write(self, uid: str, thread1: str, thread2: str) -> CardRecord:
+        """
+        Record that thread codes were written to a card
+        
+        Args:
+            uid: Card UID
+            thread1: Thread 1 code written (empty when cleared)
+            thread2: Thread 2 code written (empty when cleared)
+            
+        Returns:
+            CardRecord: Updated record
+        """
+        with self._lock:
+            previous = self._cards.get(uid)
+            record = CardRecord(
+                uid, thread1, thread2,
+                previous.write_count + 1 if previous else 1,
+                datetime.now().isoformat(timespec='seconds')
+            )
+            self._cards[uid] = record
+            
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?)", record
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Failed to update card registry: {e}")
+            
+            return record
+    
+    def check_read(self, uid: Optional[str], thread1: str, thread2: str) -> Optional[str]:
+        """
+        Compare data read from a card with the registry
+        
+        A mismatch means the card was rewritten outside this station, or
+        that another card carries the same UID (a clone).
+        
+        Returns:
+            Optional[str]: Warning message, or None if consistent or unknown
+        """
+        record = self.get(uid)
+        if record is None or (record.thread1, record.thread2) == (thread1, thread2):
+            return None
+        
+        return (
+            f"Card {uid} holds '{thread1}' / '{thread2}' but was last written here "
+            f"with '{record.thread1}' / '{record.thread2}' ({record.last_written}) - "
+            f"rewritten elsewhere or cloned UID"
+        )
+    
+    @staticmethod
+    def describe(record: Optional[CardRecord]) -> str:
+        """One-line history of a card for the log"""
+        if record is None:
+            return "New card (not in registry)"
+        if not record.thread1 and not record.thread2:
+            return f"Known card: cleared, written {record.write_count}x, last {record.last_written}"
+        return (
+            f"Known card: {record.thread1} / {record.thread2}, "
+            f"written {record.write_count}x, last {record.last_written}"
+        )
+    
+    def close(self):
+        """Close the on-disk index"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,198 @@
+"""
+CWT Thread Verification System - Kanban Tool CLI
+Headless command-line entry point (no tkinter) with JSON output
+
+Usage:
+    python cli.py write TH-001 TH-002
+    python cli.py read
+    python cli.py clear
+    python cli.py bypass
+    python cli.py batch cards.csv
+    python cli.py batch order.xlsx --results
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from rfid_manager import RFIDManager
+from batch_writer import BatchResult, StreamingBatchWriter
+from work_order import load_work_order, build_job, export_results
+from config import BYPASS_KEYWORD, READER_TIMEOUT
+
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_NO_READER = 2
+
+
+def emit(record: dict):
+    """Write one JSON record to stdout"""
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def connect() -> Optional[RFIDManager]:
+    """Connect to the reader, emitting an error record on failure"""
+    rfid = RFIDManager()
+    success, msg = rfid.connect_reader()
+    
+    if not success:
+        emit({'operation': 'connect', 'success': False, 'message': msg})
+        return None
+    
+    return rfid
+
+
+def run_single(rfid: RFIDManager, args) -> int:
+    """Run a single-card command (write/read/clear/bypass)"""
+    record = {'operation': args.command}
+    
+    success, msg = rfid.wait_for_card(timeout=args.timeout)
+    if not success:
+        record.update(success=False, message=msg)
+        emit(record)
+        return EXIT_FAILED
+    
+    info = rfid.get_card_info()
+    if info is not None:
+        record.update(uid=info.uid, card_type=info.card_type)
+    else:
+        record['uid'] = None
+    
+    if args.command == 'write':
+        success, msg = rfid.write_kanban(args.thread1, args.thread2, args.skip_identical)
+        record.update(thread1=args.thread1, thread2=args.thread2,
+                      blocks_written=rfid.last_blocks_written)
+    elif args.command == 'bypass':
+        success, msg = rfid.write_bypass()
+        record.update(thread1=BYPASS_KEYWORD, thread2="")
+    elif args.command == 'clear':
+        success, msg = rfid.clear_card()
+    else:
+        success, thread1, thread2, msg = rfid.read_kanban()
+        record.update(
+            thread1=thread1, thread2=thread2,
+            is_bypass=bool(success and thread1.lower() == BYPASS_KEYWORD.lower())
+        )
+    
+    rfid.disconnect()
+    record.update(success=success, message=msg)
+    emit(record)
+    return EXIT_OK if success else EXIT_FAILED
+
+
+def run_batch(rfid: RFIDManager, args) -> int:
+    """Write every card of a work order file, one JSON line per card"""
+    try:
+        lines, errors = load_work_order(args.file)
+    except (OSError, ValueError) as e:
+        emit({'operation': 'batch', 'success': False, 'message': f"Cannot load batch file: {e}"})
+        return EXIT_FAILED
+    
+    if errors:
+        emit({'operation': 'batch', 'success': False, 'message': "Invalid batch file", 'errors': errors})
+        return EXIT_FAILED
+    
+    job = build_job(lines, skip_identical=args.skip_identical)
+    
+    def on_result(result: BatchResult):
+        emit({
+            'operation': 'write',
+            'card': result.number,
+            'uid': result.uid,
+            'thread1': result.item.thread1,
+            'thread2': result.item.thread2,
+            'success': result.success,
+            'unchanged': result.unchanged,
+            'message': result.message,
+        })
+    
+    def log(message: str, level: str):
+        # Operator prompts go to stderr so stdout stays machine-readable
+        print(message, file=sys.stderr, flush=True)
+    
+    try:
+        StreamingBatchWriter(rfid, job, log=log, on_result=on_result).run()
+    except KeyboardInterrupt:
+        job.stop_event.set()
+    
+    summary = {
+        'operation': 'batch',
+        'success': job.success_count == job.quantity,
+        'quantity': job.quantity,
+        'written': job.success_count,
+        'unchanged': job.unchanged_count,
+        'failed_attempts': job.failed_count,
+    }
+    if args.results:
+        try:
+            summary['results_file'] = export_results(args.file, lines, job)
+        except OSError as e:
+            summary['message'] = f"Failed to save results: {e}"
+    
+    emit(summary)
+    return EXIT_OK if job.success_count == job.quantity else EXIT_FAILED
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser"""
+    parser = argparse.ArgumentParser(
+        description="Headless Kanban card tool (JSON output on stdout)"
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help="log reader details to stderr")
+    parser.add_argument('-t', '--timeout', type=int, default=READER_TIMEOUT,
+                        help="seconds to wait for a card (default: %(default)s)")
+    parser.add_argument('--stats', action='store_true',
+                        help="emit APDU statistics as a final JSON record")
+    
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    write = sub.add_parser('write', help="write thread codes to one card")
+    write.add_argument('thread1')
+    write.add_argument('thread2')
+    write.add_argument('--skip-identical', action='store_true',
+                       help="read first and skip blocks that already match")
+    
+    sub.add_parser('read', help="read thread codes from one card")
+    sub.add_parser('clear', help="clear one card")
+    sub.add_parser('bypass', help="write a bypass card")
+    
+    batch = sub.add_parser('batch', help="write cards from a CSV/xlsx work order (thread1,thread2[,quantity])")
+    batch.add_argument('file')
+    batch.add_argument('--results', action='store_true',
+                       help="save per-line results next to the work order")
+    batch.add_argument('--skip-identical', action='store_true',
+                       help="read first and skip blocks that already match")
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point"""
+    args = build_parser().parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+    
+    rfid = connect()
+    if rfid is None:
+        return EXIT_NO_READER
+    
+    try:
+        if args.command == 'batch':
+            return run_batch(rfid, args)
+        return run_single(rfid, args)
+    finally:
+        if args.stats:
+            emit({'operation': 'stats', **rfid.get_stats()})
+        rfid.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,11 @@ BLOCK_THREAD1 = 4  # Block number for Thread 1 data
 BLOCK_THREAD2 = 5  # Block number for Thread 2 data
 BLOCK_SIZE = 16    # MIFARE Classic block size in bytes
 
+# NTAG21x / MIFARE Ultralight Page Mapping
+NTAG_USER_PAGE = 4   # First user page; Thread 1 uses pages 4-7, Thread 2 pages 8-11
+NTAG_PAGE_SIZE = 4   # Bytes per page
+NTAG_FAST_READ_MAX_PAGES = 60  # Max pages per FAST_READ (reader frame limit)
+
 # Default MIFARE Classic Key (Key A)
 # Factory default: all bytes are 0xFF
 DEFAULT_KEY_A = [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
@@ -19,11 +24,18 @@ BYPASS_KEYWORD = "bypass"  # Keyword for bypass mode
 APP_TITLE = "Thread Verification - Kanban Card Tool"
 APP_VERSION = "1.0.0"
 APP_WIDTH = 750
-APP_HEIGHT = 650
+APP_HEIGHT = 680
 
 # Reader Settings
 READER_TIMEOUT = 10  # Seconds to wait for card
 READER_NAME_FILTER = "acr122"  # Filter for ACR122U reader (case-insensitive)
+CARD_MONITOR_TIMEOUT_MS = 5000  # Max block in one SCardGetStatusChange call
+CARD_WAIT_SLICE_MS = 100  # Status-wait slice when a wait can be cancelled
+READER_ERROR_BACKOFF_MAX_S = 1.0  # Longest pause between retries while the reader is unavailable
+READER_POLL_INTERVAL = 2.0  # Seconds between reader list checks (hot-plug)
+READER_FEEDBACK = True  # Blink/beep the reader's LED and buzzer on results
+READER_PROFILE_FILE = "reader_profiles.json"  # Reader settings selected per station
+READER_PROFILE_CYCLES = 10  # Cards per profile in the reader profile benchmark
 
 # UI Colors
 COLOR_SUCCESS = "#28a745"  # Green
@@ -32,5 +44,34 @@ COLOR_WARNING = "#ffc107"  # Yellow
 COLOR_INFO = "#17a2b8"     # Blue
 COLOR_BG = "#f8f9fa"       # Light gray background
 
+# Notifications (non-modal result banners)
+NOTIFY_DURATION_MS = 3000        # Success/info banners close after this
+NOTIFY_ERROR_DURATION_MS = 8000  # Warning/error banners stay up longer
+NOTIFY_SOUND = True              # Beep on results (errors beep twice)
+
 # Log Settings
 LOG_MAX_LINES = 1000  # Maximum lines in log display
+LOG_FLUSH_MS = 100    # Delay before buffered messages are written to the log display (batches bursts)
+
+# Audit Journal
+JOURNAL_FILE = "kanban_journal.jsonl"  # Append-only record of every card operation
+JOURNAL_FSYNC_INTERVAL = 1.0  # Max seconds between fsyncs of the journal
+JOURNAL_FSYNC_BATCH = 50      # Fsync after this many entries, even within the interval
+
+# Card Registry
+REGISTRY_FILE = "kanban_registry.db"  # SQLite index of issued cards, keyed by UID
+
+# APDU Statistics
+APDU_STATS_WINDOW = 500  # Recent APDUs per command kept for latency histograms
+APDU_LATENCY_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500)  # Histogram upper bounds
+STATS_REFRESH_MS = 1000  # Refresh interval of the APDU statistics window
+
+# Card I/O Retry
+IO_RETRIES = 3                # Retries of a failed card I/O step
+IO_RETRY_BACKOFF_S = 0.05     # First retry delay, doubled after each retry
+IO_RETRY_BACKOFF_MAX_S = 0.4  # Upper bound of the retry delay
+
+# Transaction Watchdog
+APDU_TIMEOUT_S = 2.0        # Max time for one APDU or card connect before it is cancelled
+OPERATION_TIMEOUT_S = 10.0  # Max time for one card operation, retries included
+ROLLBACK_TIMEOUT_S = 5.0    # Own deadline for restoring a card after a failed write
@@ -4,16 +4,79 @@ Tkinter-based graphical user interface for Kanban card management
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+from collections import deque
 from datetime import datetime
+import queue
+import threading
 from typing import Callable, Optional
 
 from config import (
     APP_TITLE, APP_VERSION, APP_WIDTH, APP_HEIGHT,
-    COLOR_SUCCESS, COLOR_ERROR, COLOR_WARNING, COLOR_INFO, COLOR_BG
+    COLOR_SUCCESS, COLOR_ERROR, COLOR_WARNING, COLOR_INFO, COLOR_BG,
+    LOG_MAX_LINES, LOG_FLUSH_MS, STATS_REFRESH_MS,
+    NOTIFY_DURATION_MS, NOTIFY_ERROR_DURATION_MS, NOTIFY_SOUND
 )
 
 
+# Banner and status strip colors by level: (background, foreground)
+NOTIFY_COLORS = {
+    'success': (COLOR_SUCCESS, 'white'),
+    'error': (COLOR_ERROR, 'white'),
+    'warning': (COLOR_WARNING, 'black'),
+    'info': (COLOR_INFO, 'white'),
+}
+
+
+def post_event(root: tk.Tk, sequence: str) -> bool:
+    """
+    Queue a virtual event on the Tk loop (safe from any thread)
+    
+    Returns:
+        bool: False if it could not be posted (window closed, or the Tk
+            loop not running yet)
+    """
+    try:
+        root.event_generate(sequence, when='tail')
+        return True
+    except (tk.TclError, RuntimeError):
+        return False
+
+
+class WakeQueue(queue.Queue):
+    """
+    Queue that wakes the Tk loop when something is put on it
+    
+    The first put after a drain posts a virtual event whose handler
+    drains the queue, so the Tk thread never polls and an idle window
+    does not wake up. The handler calls woken() before draining.
+    """
+    
+    def __init__(self, root: tk.Tk, sequence: str):
+        super().__init__()
+        self.root = root
+        self.sequence = sequence
+        self._wake_lock = threading.Lock()
+        self._wake_pending = False
+    
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        
+        with self._wake_lock:
+            if self._wake_pending:
+                return
+            self._wake_pending = True
+        
+        if not post_event(self.root, self.sequence):
+            # Picked up by the next wake (or the drain at startup)
+            self.woken()
+    
+    def woken(self):
+        """Re-arm the wake-up; items put from now on post a new event"""
+        with self._wake_lock:
+            self._wake_pending = False
+
+
 class KanbanGUI:
     """Main GUI window for Kanban card tool"""
     
@@ -39,6 +102,15 @@ class KanbanGUI:
         self.on_write_multiple: Optional[Callable] = None
         self.on_read_multiple: Optional[Callable] = None
         self.on_clear_multiple: Optional[Callable] = None  # NEW
+        self.on_work_order: Optional[Callable] = None
+        self.on_show_stats: Optional[Callable] = None
+        
+        self.stats_window: Optional[tk.Toplevel] = None
+        
+        # Notification banner currently shown and its auto-dismiss timer
+        self._banner: Optional[tk.Frame] = None
+        self._banner_timer: Optional[str] = None
+        self.sound_enabled = NOTIFY_SOUND
         
         # Status variables
         self.reader_status = tk.StringVar(value="Not Connected")
@@ -48,8 +120,17 @@ class KanbanGUI:
         # Thread input variables
         self.thread1_var = tk.StringVar()
         self.thread2_var = tk.StringVar()
+        self.skip_identical_var = tk.BooleanVar(value=False)
+        
+        # Pending log messages; filled by log() from any thread and
+        # written to the widget in batches by _flush_log()
+        self._log_buffer: deque = deque(maxlen=LOG_MAX_LINES)
+        self._log_lock = threading.Lock()
+        self._log_flush_pending = False
         
         self._create_widgets()
+        # log() posts <<FlushLog>> when the buffer gets its first message
+        self.root.bind('<<FlushLog>>', lambda e: self.root.after(LOG_FLUSH_MS, self._flush_log))
     
     def _create_widgets(self):
         """Create all GUI widgets"""
@@ -129,6 +210,17 @@ class KanbanGUI:
             font=('Consolas', 9)
         )
         uid_label.grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        
+        # Result strip: colored by the outcome of the last operation
+        self.result_strip = tk.Label(
+            status_frame,
+            text="Ready",
+            anchor=tk.W,
+            padx=8,
+            font=('Arial', 10, 'bold'),
+            background=COLOR_BG
+        )
+        self.result_strip.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(8, 0))
     
     def _create_input_section(self, parent):
         """Create thread input section"""
@@ -190,6 +282,14 @@ class KanbanGUI:
             foreground='gray'
         )
         example_label.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        # Read-first write mode (re-issuing cards)
+        skip_check = ttk.Checkbutton(
+            input_frame,
+            text="Skip blocks that already hold these codes (read first)",
+            variable=self.skip_identical_var
+        )
+        skip_check.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
     
     def _create_button_section(self, parent):
         """Create action buttons section"""
@@ -263,6 +363,22 @@ class KanbanGUI:
             style='Large.TButton'
         )
         clear_multi_btn.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=(0, 5), pady=(8, 0), ipady=5)
+        
+        work_order_btn = ttk.Button(
+            button_frame,
+            text="📋 Work Order",
+            command=self._handle_work_order,
+            style='Large.TButton'
+        )
+        work_order_btn.grid(row=2, column=2, sticky=(tk.W, tk.E), pady=(8, 0), ipady=5)
+        
+        # Row 4: Diagnostics
+        stats_btn = ttk.Button(
+            button_frame,
+            text="📊 APDU Statistics",
+            command=lambda: self.on_show_stats and self.on_show_stats()
+        )
+        stats_btn.grid(row=3, column=2, sticky=tk.E, pady=(8, 0))
     
     def _create_log_section(self, parent):
         """Create log display section"""
@@ -297,20 +413,20 @@ class KanbanGUI:
             thread2 = self.thread2_var.get().strip()
             
             if not thread1 or not thread2:
-                messagebox.showwarning(
+                self.show_warning(
                     "Invalid Input",
                     "Please enter both Thread 1 and Thread 2 codes."
                 )
                 return
             
             if len(thread1) > 16 or len(thread2) > 16:
-                messagebox.showerror(
+                self.show_error(
                     "Invalid Input",
                     "Thread codes must be 16 characters or less."
                 )
                 return
             
-            self.on_write_kanban(thread1, thread2)
+            self.on_write_kanban(thread1, thread2, self.skip_identical_var.get())
     
     def _handle_write_multiple(self):
         """Handle Write Multiple button click"""
@@ -319,14 +435,14 @@ class KanbanGUI:
             thread2 = self.thread2_var.get().strip()
             
             if not thread1 or not thread2:
-                messagebox.showwarning(
+                self.show_warning(
                     "Invalid Input",
                     "Please enter both Thread 1 and Thread 2 codes."
                 )
                 return
             
             if len(thread1) > 16 or len(thread2) > 16:
-                messagebox.showerror(
+                self.show_error(
                     "Invalid Input",
                     "Thread codes must be 16 characters or less."
                 )
@@ -335,7 +451,23 @@ class KanbanGUI:
             # Ask for quantity
             quantity = self._ask_quantity()
             if quantity > 0:
-                self.on_write_multiple(thread1, thread2, quantity)
+                self.on_write_multiple(thread1, thread2, quantity, self.skip_identical_var.get())
+    
+    def _handle_work_order(self):
+        """Handle Work Order button click"""
+        if self.on_work_order:
+            path = filedialog.askopenfilename(
+                parent=self.root,
+                title="Open Work Order",
+                filetypes=[
+                    ("Work orders", "*.csv *.xlsx"),
+                    ("CSV files", "*.csv"),
+                    ("Excel files", "*.xlsx"),
+                    ("All files", "*.*"),
+                ]
+            )
+            if path:
+                self.on_work_order(path, self.skip_identical_var.get())
     
     def _ask_quantity(self) -> int:
         """Ask user for number of cards to write"""
@@ -562,6 +694,10 @@ class KanbanGUI:
         """
         Add message to log display
         
+        Messages are buffered and written to the widget in one batch
+        LOG_FLUSH_MS after the first of them, so this is cheap and safe
+        to call from any thread.
+        
         Args:
             message: Message to log
             level: Log level ('info', 'success', 'warning', 'error')
@@ -569,10 +705,39 @@ class KanbanGUI:
         timestamp = datetime.now().strftime("%H:%M:%S")
         full_message = f"[{timestamp}] {message}\n"
         
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, full_message, level)
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        with self._log_lock:
+            self._log_buffer.append((full_message, level))
+            if self._log_flush_pending:
+                return
+            self._log_flush_pending = True
+        
+        if not post_event(self.root, '<<FlushLog>>'):
+            with self._log_lock:
+                self._log_flush_pending = False
+    
+    def _flush_log(self):
+        """Write buffered messages to the log display and trim it to LOG_MAX_LINES"""
+        with self._log_lock:
+            pending = list(self._log_buffer)
+            self._log_buffer.clear()
+            self._log_flush_pending = False
+        
+        if pending:
+            # One insert call for the whole batch: text, tag, text, tag, ...
+            chunks = []
+            for full_message, level in pending:
+                chunks.extend((full_message, level))
+            
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, *chunks)
+            
+            # The widget always ends with an empty line after the last newline
+            lines = int(self.log_text.index('end-1c').split('.')[0]) - 1
+            if lines > LOG_MAX_LINES:
+                self.log_text.delete('1.0', f"{lines - LOG_MAX_LINES + 1}.0")
+            
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
     
     def set_reader_status(self, status: str, connected: bool = False):
         """Update reader status indicator"""
@@ -596,14 +761,133 @@ class KanbanGUI:
         self.thread1_var.set("")
         self.thread2_var.set("")
     
+    def notify(self, title: str, message: str, level: str = 'info',
+               duration_ms: Optional[int] = None):
+        """
+        Show an operation result without blocking the operator
+        
+        Sets the result strip, shows a banner over the top of the window
+        that closes by itself (or on click) and beeps if sound is enabled.
+        A newer notification replaces the banner at once, so the operator
+        can go straight on with the next card.
+        
+        Args:
+            title: Short headline
+            message: Details (may span several lines)
+            level: 'success', 'error', 'warning' or 'info'
+            duration_ms: Time before the banner closes (default by level)
+        """
+        background, foreground = NOTIFY_COLORS.get(level, NOTIFY_COLORS['info'])
+        
+        if duration_ms is None:
+            duration_ms = NOTIFY_ERROR_DURATION_MS if level in ('error', 'warning') else NOTIFY_DURATION_MS
+        
+        headline = message.strip().splitlines()[0] if message.strip() else ""
+        self.result_strip.config(
+            text=f"{title}: {headline}" if headline else title,
+            background=background,
+            foreground=foreground
+        )
+        
+        self._dismiss_banner()
+        
+        banner = tk.Frame(self.root, background=background, padx=12, pady=8)
+        tk.Label(
+            banner, text=title, font=('Arial', 12, 'bold'),
+            background=background, foreground=foreground
+        ).pack(anchor=tk.W)
+        if message:
+            tk.Label(
+                banner, text=message, font=('Arial', 10), justify=tk.LEFT,
+                wraplength=APP_WIDTH - 120, background=background, foreground=foreground
+            ).pack(anchor=tk.W)
+        
+        banner.place(relx=0.5, y=10, anchor=tk.N, relwidth=0.9)
+        for widget in [banner] + banner.winfo_children():
+            widget.bind('<Button-1>', lambda e: self._dismiss_banner())
+        
+        self._banner = banner
+        self._banner_timer = self.root.after(duration_ms, self._dismiss_banner)
+        
+        if self.sound_enabled:
+            self.root.bell()
+            if level == 'error':
+                self.root.after(200, self.root.bell)
+    
+    def _dismiss_banner(self):
+        """Close the notification banner, if one is shown"""
+        if self._banner_timer is not None:
+            self.root.after_cancel(self._banner_timer)
+            self._banner_timer = None
+        if self._banner is not None:
+            self._banner.destroy()
+            self._banner = None
+    
     def show_error(self, title: str, message: str):
-        """Show error dialog"""
-        messagebox.showerror(title, message)
+        """Show error notification (non-modal)"""
+        self.notify(title, message, 'error')
     
     def show_success(self, title: str, message: str):
-        """Show success dialog"""
-        messagebox.showinfo(title, message)
+        """Show success notification (non-modal)"""
+        self.notify(title, message, 'success')
     
     def show_warning(self, title: str, message: str):
-        """Show warning dialog"""
-        messagebox.showwarning(title, message)
+        """Show warning notification (non-modal)"""
+        self.notify(title, message, 'warning')
+    
+    def show_fatal(self, title: str, message: str):
+        """
+        Show a modal error dialog
+        
+        Only for conditions the operator must not miss before the next
+        card (e.g. a card left partially written); everything else uses
+        the non-modal notifications.
+        """
+        self.notify(title, message, 'error')
+        messagebox.showerror(title, message)
+    
+    def show_stats_window(self, get_report: Callable[[], str], on_reset: Callable[[], None]):
+        """
+        Show the APDU statistics window, refreshed every STATS_REFRESH_MS
+        
+        Args:
+            get_report: Returns the report text (called on the Tk thread)
+            on_reset: Clears the statistics
+        """
+        if self.stats_window is not None:
+            self.stats_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("APDU Statistics")
+        window.geometry("720x360")
+        window.transient(self.root)
+        self.stats_window = window
+        
+        text = scrolledtext.ScrolledText(window, font=('Consolas', 9), wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        
+        def refresh():
+            if self.stats_window is not window:
+                return
+            text.config(state=tk.NORMAL)
+            text.delete('1.0', tk.END)
+            text.insert(tk.END, get_report())
+            text.config(state=tk.DISABLED)
+            window.after(STATS_REFRESH_MS, refresh)
+        
+        def on_close():
+            self.stats_window = None
+            window.destroy()
+        
+        button_frame = ttk.Frame(window)
+        button_frame.pack(pady=(0, 10))
+        ttk.Button(button_frame, text="Reset", command=on_reset, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Close", command=on_close, width=10).pack(side=tk.LEFT, padx=5)
+        
+        window.protocol("WM_DELETE_WINDOW", on_close)
+        refresh()
+    
+    def ask_yes_no(self, title: str, message: str) -> bool:
+        """Show confirmation dialog"""
+        return messagebox.askyesno(title, message)
@@ -0,0 +1,131 @@
+"""
+CWT Thread Verification System - Audit Journal
+Append-only JSON Lines record of every card operation
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import JOURNAL_FILE, JOURNAL_FSYNC_INTERVAL, JOURNAL_FSYNC_BATCH
+
+
+class Journal:
+    """
+    Append-only audit journal of card operations
+    
+    Each operation becomes one JSON object per line (UID, operation,
+    thread codes, result and per-phase timings in ms). record() only
+    queues the entry; a background thread appends it to the file and
+    fsyncs in batches, so the card loop never waits on the disk.
+    """
+    
+    _STOP = object()  # Sentinel that ends the writer loop
+    
+    def __init__(self, path: str = JOURNAL_FILE):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        
+        self._entries: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the background writer"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._thread = threading.Thread(
+            target=self._run, name="Journal", daemon=True
+        )
+        self._thread.start()
+    
+    def close(self, timeout: float = 5.0):
+        """Write and fsync everything queued so far, then stop the writer"""
+        if self._thread is None:
+            return
+        
+        self._entries.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def record(self, operation: str, success: bool, message: str = "",
+               uid: Optional[str] = None, thread1: Optional[str] = None,
+               thread2: Optional[str] = None,
+               timings: Optional[Dict[str, float]] = None, **fields):
+        """
+        Queue one journal entry (thread-safe, never blocks on I/O)
+        
+        Args:
+            operation: Operation name ('write', 'read', 'clear', 'bypass')
+            success: Whether the operation succeeded
+            message: Result message
+            uid: Card UID
+            thread1: Thread 1 code written or read
+            thread2: Thread 2 code written or read
+            timings: Per-phase durations in milliseconds
+            **fields: Extra fields stored with the entry
+        """
+        entry = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'operation': operation,
+            'uid': uid,
+            'thread1': thread1,
+            'thread2': thread2,
+            'success': success,
+            'message': message,
+        }
+        if timings:
+            entry['timings'] = timings
+        entry.update(fields)
+        
+        self._entries.put(entry)
+    
+    def _run(self):
+        """Thread body: append queued entries and fsync in batches"""
+        try:
+            f = open(self.path, 'a', encoding='utf-8')
+        except OSError as e:
+            self.logger.error(f"Cannot open journal {self.path}: {e}")
+            f = None
+        
+        unsynced = 0
+        last_sync = time.monotonic()
+        
+        while True:
+            try:
+                entry = self._entries.get(timeout=JOURNAL_FSYNC_INTERVAL)
+            except queue.Empty:
+                entry = None
+            
+            if entry is not None and entry is not self._STOP and f is not None:
+                try:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+                    unsynced += 1
+                except (OSError, TypeError, ValueError) as e:
+                    self.logger.error(f"Failed to write journal entry: {e}")
+            
+            due = unsynced >= JOURNAL_FSYNC_BATCH or \
+                time.monotonic() - last_sync >= JOURNAL_FSYNC_INTERVAL
+            if unsynced and (due or entry is self._STOP):
+                self._sync(f)
+                unsynced = 0
+                last_sync = time.monotonic()
+            
+            if entry is self._STOP:
+                break
+        
+        if f is not None:
+            f.close()
+    
+    def _sync(self, f):
+        """Flush and fsync the journal file"""
+        try:
+            f.flush()
+            os.fsync(f.fileno())
+        except OSError as e:
+            self.logger.error(f"Failed to sync journal: {e}")
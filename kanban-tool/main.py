@@ -7,13 +7,27 @@ Version: 1.0.0
 License: MIT
 """
 
+import time
+
+# Taken before the heavier imports so the startup log covers them too
+STARTUP_TIME = time.perf_counter()
+
 import tkinter as tk
 import logging
+import queue
 import sys
-from typing import Optional
+import threading
+from typing import List, Optional, Tuple
 
-from gui import KanbanGUI
-from rfid_manager import RFIDManager
+from gui import KanbanGUI, WakeQueue
+from reader_pool import ReaderPool
+from rfid_manager import CardInfo
+from batch_writer import BatchJob, BatchResult
+from card_monitor import CardMonitor, CARD_INSERTED
+from reader_supervisor import ReaderSupervisor
+from journal import Journal
+from work_order import WorkOrderLine, load_work_order, build_job, export_results
+from card_registry import CardRegistry
 from config import APP_TITLE, BYPASS_KEYWORD
 
 
@@ -32,8 +46,12 @@ class KanbanToolApp:
         self.root = tk.Tk()
         self.gui = KanbanGUI(self.root)
         
-        # Create RFID manager
-        self.rfid = RFIDManager()
+        # One RFID manager + worker thread per reader; the primary reader
+        # handles single-card operations and card detection
+        self.ui_queue: queue.Queue = WakeQueue(self.root, '<<ProcessEvents>>')
+        self.pool = ReaderPool(self.ui_queue, on_timeout=self._reader_timeout)
+        self.worker = self.pool.primary
+        self.rfid = self.worker.rfid
         
         # Connect GUI callbacks
         self.gui.on_write_kanban = self.write_kanban
@@ -43,107 +61,306 @@ class KanbanToolApp:
         self.gui.on_write_multiple = self.write_multiple
         self.gui.on_read_multiple = self.read_multiple
         self.gui.on_clear_multiple = self.clear_multiple  # NEW
+        self.gui.on_work_order = self.write_work_order
+        self.gui.on_show_stats = self.show_stats
         
         # Card detection state
         self.card_present = False
+        # Card selected for the running operation (reader worker side);
+        # taken before the operation so failed ones are still traced by UID
+        self.card_info: Optional[CardInfo] = None
         self.is_busy = False  # Flag to prevent checking during operations
-        self.stop_multiple_operation = False  # Flag to stop continuous operations
-        
-        # Initialize reader
+        self.stop_event = threading.Event()  # Set to stop continuous operations
+        self.stop_window: Optional[tk.Toplevel] = None
+        
+        # Card insert/remove events from the monitor thread
+        self.card_events: queue.Queue = WakeQueue(self.root, '<<ProcessEvents>>')
+        self.card_monitor: Optional[CardMonitor] = None
+        
+        # Rebinds readers that are unplugged and plugged back in
+        self.supervisor = ReaderSupervisor(self.ui_queue, self._readers_changed)
+        
+        # On-disk audit trail of every card operation
+        self.journal = Journal()
+        self.journal.start()
+        
+        # Last known codes and write history of every card, by UID
+        self.registry = CardRegistry()
+        
+        # Show the window first; reader discovery (which loads pyscard and
+        # talks to the PC/SC service) runs on the worker in the background
+        self.pool.start()
+        # Both queues post <<ProcessEvents>> when something arrives; the
+        # idle drain picks up anything queued before the Tk loop started
+        self.root.bind('<<ProcessEvents>>', lambda e: self.process_events())
+        self.root.after_idle(self.process_events)
         self.initialize_reader()
-        
-        # Start card detection polling
-        self.start_card_detection()
+        self.root.after_idle(self._report_startup)
+    
+    def _report_startup(self):
+        """Log how long it took for the window to become usable"""
+        elapsed_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        self.logger.info(f"Window ready in {elapsed_ms:.0f} ms")
     
     def initialize_reader(self):
-        """Initialize RFID reader connection"""
+        """Start RFID reader discovery on the reader worker"""
         self.gui.log("Initializing RFID reader...", 'info')
-        
-        success, msg = self.rfid.connect_reader()
+        self.gui.set_reader_status("Searching...", False)
+        self.worker.submit(self._connect_job, on_done=self._reader_connected)
+    
+    def _connect_job(self) -> Tuple[bool, List[str], float]:
+        """Reader worker side of initialize_reader"""
+        start = time.perf_counter()
+        success, messages = self.pool.connect()
+        return success, messages, time.perf_counter() - start
+    
+    def _reader_connected(self, result: Tuple[bool, List[str], float]):
+        """Show the result of reader discovery and start card detection"""
+        success, messages, elapsed = result
+        self.logger.info(f"Reader discovery took {elapsed * 1000:.0f} ms")
         
         if success:
-            self.gui.log(msg, 'success')
-            self.gui.set_reader_status("Connected", True)
+            for msg in messages:
+                self.gui.log(msg, 'success')
         else:
-            self.gui.log(msg, 'error')
-            self.gui.set_reader_status("Not Connected", False)
-            self.gui.show_warning(
-                "Reader Not Found",
-                "ACR122U reader not detected.\n\n"
-                "Please connect the reader and restart the application.\n\n"
-                "You can still use the interface, but card operations will fail."
+            for msg in messages:
+                self.gui.log(msg, 'error')
+            self.gui.log(
+                "ACR122U reader not detected. Connect the reader; it will be "
+                "picked up automatically.", 'warning'
             )
+        self.gui.set_reader_status(*self.pool.status())
+        
+        # Workers for any extra readers found, then card detection
+        self.pool.start()
+        self.start_card_detection()
+        self.supervisor.start()
+    
+    def _readers_changed(self, readers: list):
+        """Rebind readers after a hot-plug change (called on the Tk thread)"""
+        messages = self.pool.handle_reader_change(readers)
+        if not messages:
+            return
+        
+        for msg, level in messages:
+            self.gui.log(msg, level)
+        if self.is_busy and any(level == 'success' for _, level in messages):
+            self.gui.log("Resuming the current operation on the reconnected reader", 'info')
+        
+        self.gui.set_reader_status(*self.pool.status())
+        self.start_card_detection()
+    
+    def _post(self, func, *args):
+        """Run a GUI call on the Tk thread (safe from the reader worker)"""
+        self.ui_queue.put((func, args))
+    
+    def _log(self, message: str, level: str = 'info'):
+        """Log to the GUI from the reader worker (gui.log is thread-safe)"""
+        self.gui.log(message, level)
+    
+    def _reader_timeout(self, message: str):
+        """
+        A reader transaction was cancelled by its watchdog (watchdog thread)
+        
+        The operation itself then fails with a "Reader timeout" message and
+        reports it through its usual result banner.
+        """
+        self._log(message, 'error')
+    
+    def _begin_operation(self) -> bool:
+        """
+        Mark the app busy before submitting a card operation
+        
+        Returns:
+            bool: False if another operation is still running
+        """
+        if self.is_busy:
+            self.gui.log("Another operation is in progress", 'warning')
+            return False
+        
+        self.is_busy = True  # Disable card detection during operation
+        self.stop_event.clear()
+        return True
+    
+    def _finish_operation(self, _result=None):
+        """Called on the Tk thread when a card operation has finished"""
+        if self.stop_window is not None:
+            self.stop_window.destroy()
+            self.stop_window = None
+        
+        self.is_busy = False  # Re-enable card detection
+        
+        # Force immediate card status check
+        self.root.after(100, self.update_card_status_now)
+    
+    def _operation_failed(self, error: Exception):
+        """Called on the Tk thread when a card operation raised"""
+        self.gui.log(f"Operation failed: {error}", 'error')
+        self.rfid.feedback('failure')
+        self._finish_operation()
+    
+    def _submit_operation(self, job, *args):
+        """Run an operation job on the reader worker"""
+        self.worker.submit(
+            job, *args,
+            on_done=self._finish_operation,
+            on_error=self._operation_failed
+        )
+    
+    def _record_operation(self, operation: str, success: bool, msg: str,
+                          thread1: Optional[str] = None, thread2: Optional[str] = None,
+                          **fields):
+        """
+        Record the operation on the current card (reader worker side)
+        
+        Signals the result on the reader's LED/buzzer. Every operation goes
+        to the audit journal. Successful writes update the card registry;
+        successful reads are checked against it.
+        """
+        # Queued, not awaited: the operator sees the result on the reader
+        # while the journal and registry are updated
+        if not success:
+            self.rfid.feedback('failure')
+        elif operation == 'bypass' or (thread1 or "").lower() == BYPASS_KEYWORD.lower():
+            self.rfid.feedback('bypass')
+        else:
+            self.rfid.feedback('success')
+        
+        # Taken when the card was selected: a failed transmit drops the
+        # card handle, and the failures need the UID most
+        info = self.card_info
+        uid = info.uid if info is not None else None
+        if info is not None:
+            fields.setdefault('card_type', info.card_type)
+        self.journal.record(
+            operation, success, msg, uid=uid, thread1=thread1, thread2=thread2,
+            timings=dict(self.rfid.last_timings), **fields
+        )
+        
+        if not success or uid is None:
+            return
+        
+        if operation == 'read':
+            warning = self.registry.check_read(uid, thread1, thread2)
+            if warning:
+                self._log(f"⚠️ {warning}", 'warning')
+        elif fields.get('blocks_written') != 0:
+            # A skip-identical write that found the codes already there is
+            # not a write: keep its write count and date
+            self.registry.record_write(uid, thread1 or "", thread2 or "")
+    
+    def _record_batch_result(self, result: BatchResult):
+        """Record one card of a batch write (reader worker side)"""
+        if result.success:
+            # The batch itself refuses repeats; this catches cards issued by an earlier run
+            previous = self.registry.get(result.uid)
+            if previous is not None:
+                self._log(
+                    f"[{result.uid}] Previously issued card - {self.registry.describe(previous)}",
+                    'warning'
+                )
+            if not result.unchanged:
+                self.registry.record_write(result.uid, result.item.thread1, result.item.thread2)
+        
+        self.journal.record(
+            'write', result.success, result.message,
+            uid=result.uid,
+            thread1=result.item.thread1,
+            thread2=result.item.thread2,
+            timings=result.timings,
+            card=result.number,
+            unchanged=result.unchanged
+        )
     
     def wait_for_card(self) -> bool:
         """
-        Wait for card to be placed on reader
+        Wait for card to be placed on reader (runs on the reader worker)
         
         Returns:
             bool: True if card detected, False otherwise
         """
-        self.gui.log("Waiting for card... Please place card on reader.", 'info')
-        self.gui.set_card_status("Waiting...", False)
-        
-        # Allow GUI to update
-        self.root.update()
+        self._log("Waiting for card... Please place card on reader.", 'info')
+        self._post(self.gui.set_card_status, "Waiting...", False)
         
         success, msg = self.rfid.wait_for_card(timeout=10)
+        self.card_info = self.rfid.get_card_info() if success else None
         
         if success:
-            self.gui.log(msg, 'success')
-            self.gui.set_card_status("Card Detected", True)
+            self._log(msg, 'success')
+            self._post(self.gui.set_card_status, "Card Detected", True)
             return True
         else:
-            self.gui.log(msg, 'warning')
-            self.gui.set_card_status("No Card", False)
+            self._log(msg, 'warning')
+            self._post(self.gui.set_card_status, "No Card", False)
+            # Sent to the reader itself: there is no card to go through
+            self.rfid.feedback('failure')
             return False
     
-    def write_kanban(self, thread1: str, thread2: str):
+    def write_kanban(self, thread1: str, thread2: str, skip_identical: bool = False):
         """
         Write thread codes to Kanban card
         
         Args:
             thread1: Thread 1 code
             thread2: Thread 2 code
+            skip_identical: Read first and skip blocks that already match
         """
-        self.is_busy = True  # Disable card detection during operation
-        self.gui.log(f"Writing Kanban: Thread1='{thread1}', Thread2='{thread2}'", 'info')
+        if not self._begin_operation():
+            return
         
+        self.gui.log(f"Writing Kanban: Thread1='{thread1}', Thread2='{thread2}'", 'info')
+        self._submit_operation(self._write_kanban_job, thread1, thread2, skip_identical)
+    
+    def _write_kanban_job(self, thread1: str, thread2: str, skip_identical: bool):
+        """Reader worker side of write_kanban"""
         # Wait for card
         if not self.wait_for_card():
-            self.gui.show_error(
+            self._post(
+                self.gui.show_error,
                 "No Card Detected",
                 "Please place a card on the reader and try again."
             )
-            self.is_busy = False
             return
         
         # Write data
-        success, msg = self.rfid.write_kanban(thread1, thread2)
+        success, msg = self.rfid.write_kanban(thread1, thread2, skip_identical)
+        self._record_operation(
+            'write', success, msg, thread1=thread1, thread2=thread2,
+            blocks_written=self.rfid.last_blocks_written
+        )
         
-        if success:
-            self.gui.log(msg, 'success')
-            self.gui.show_success(
+        if success and self.rfid.last_blocks_written == 0:
+            self._log(msg, 'success')
+            self._post(
+                self.gui.show_success,
+                "Success",
+                f"Kanban card already holds these codes - nothing written.\n\n"
+                f"Thread 1: {thread1}\n"
+                f"Thread 2: {thread2}"
+            )
+        elif success:
+            self._log(msg, 'success')
+            self._post(
+                self.gui.show_success,
                 "Success",
                 f"Kanban card written successfully!\n\n"
                 f"Thread 1: {thread1}\n"
                 f"Thread 2: {thread2}"
             )
         else:
-            self.gui.log(f"Failed to write Kanban: {msg}", 'error')
-            self.gui.show_error(
+            self._log(f"Failed to write Kanban: {msg}", 'error')
+            self._post(
+                # A partially written card must not go back into circulation
+                self.gui.show_fatal if self.rfid.last_rollback_failed else self.gui.show_error,
                 "Write Failed",
                 f"Failed to write Kanban card.\n\n{msg}"
             )
         
         # Disconnect from card
         self.rfid.disconnect()
-        self.is_busy = False  # Re-enable card detection
-        
-        # Force immediate card status check
-        self.root.after(100, self.update_card_status_now)
     
-    def write_multiple(self, thread1: str, thread2: str, quantity: int):
+    def write_multiple(self, thread1: str, thread2: str, quantity: int,
+                       skip_identical: bool = False):
         """
         Write the same thread codes to multiple Kanban cards
         
@@ -151,170 +368,266 @@ class KanbanToolApp:
             thread1: Thread 1 code
             thread2: Thread 2 code
             quantity: Number of cards to write
+            skip_identical: Read each card first and skip blocks that
+                already match (for re-issuing cards)
         """
-        self.is_busy = True  # Disable card detection during operation
+        if not self._begin_operation():
+            return
+        
         self.gui.log(f"=== Writing {quantity} cards ===", 'info')
         self.gui.log(f"Thread1='{thread1}', Thread2='{thread2}'", 'info')
+        if skip_identical:
+            self.gui.log("Read-first mode: unchanged blocks are not rewritten", 'info')
+        self.gui.log("Place cards one after another. Click 'Stop' to end early.", 'warning')
         
-        success_count = 0
-        failed_count = 0
+        job = BatchJob.repeat(
+            thread1, thread2, quantity,
+            skip_identical=skip_identical, stop_event=self.stop_event
+        )
         
-        for i in range(1, quantity + 1):
-            self.gui.log(f"\n[Card {i}/{quantity}] Waiting for card...", 'warning')
-            
-            # Wait for card
-            if not self.wait_for_card():
-                self.gui.log(f"[Card {i}/{quantity}] No card detected - Skipping", 'error')
-                failed_count += 1
-                continue
-            
-            # Write data
-            self.gui.log(f"[Card {i}/{quantity}] Writing data...", 'info')
-            success, msg = self.rfid.write_kanban(thread1, thread2)
-            
-            if success:
-                success_count += 1
-                self.gui.log(f"[Card {i}/{quantity}] ✓ Success!", 'success')
-                
-                # Disconnect and wait for card removal
-                self.rfid.disconnect()
-                
-                if i < quantity:  # Not the last card
-                    self.gui.log(f"[Card {i}/{quantity}] Please remove card and place next card", 'warning')
-                    
-                    # Wait for card to be removed
-                    removed = False
-                    for _ in range(50):  # Wait up to 5 seconds
-                        self.root.update()
-                        if not self.rfid.check_card_present():
-                            removed = True
-                            break
-                        import time
-                        time.sleep(0.1)
-                    
-                    if not removed:
-                        self.gui.log(f"[Card {i}/{quantity}] Warning: Card not removed yet", 'warning')
-            else:
-                failed_count += 1
-                self.gui.log(f"[Card {i}/{quantity}] ✗ Failed: {msg}", 'error')
-                self.rfid.disconnect()
+        readers = len(self.pool.connected_workers)
+        if readers > 1:
+            self.gui.log(f"Using {readers} readers in parallel", 'info')
+        
+        # Create stop button window
+        self.stop_window = self._create_stop_window("Writing Cards")
+        self.gui.set_card_status("Waiting...", False)
+        
+        # Streams card swaps on every reader: each new UID is written as
+        # soon as it appears, sharing one counter across readers
+        self.pool.run_batch(
+            job, log=self._log, on_done=self._write_multiple_done,
+            on_result=self._record_batch_result
+        )
+    
+    def _write_multiple_done(self, job: BatchJob):
+        """Called on the Tk thread when every reader has finished the batch"""
+        quantity = job.quantity
+        success_count = job.success_count
+        failed_count = job.failed_count
+        item = job.items[0]
         
         # Summary
         self.gui.log(f"\n=== Write Multiple Complete ===", 'info')
         self.gui.log(f"Success: {success_count}/{quantity}", 'success')
+        if job.unchanged_count > 0:
+            self.gui.log(f"Already up to date (not rewritten): {job.unchanged_count}", 'info')
         if failed_count > 0:
-            self.gui.log(f"Failed: {failed_count}/{quantity}", 'error')
+            self.gui.log(f"Failed attempts: {failed_count}", 'error')
         
         # Show summary dialog
-        if failed_count == 0:
+        if success_count == quantity and failed_count == 0:
             self.gui.show_success(
                 "All Cards Written",
                 f"Successfully wrote all {quantity} cards!\n\n"
-                f"Thread 1: {thread1}\n"
-                f"Thread 2: {thread2}"
+                f"Thread 1: {item.thread1}\n"
+                f"Thread 2: {item.thread2}"
             )
         else:
             self.gui.show_warning(
                 "Write Complete with Errors",
                 f"Success: {success_count}/{quantity}\n"
-                f"Failed: {failed_count}/{quantity}\n\n"
+                f"Failed attempts: {failed_count}\n\n"
                 f"Please check the log for details."
             )
         
-        self.is_busy = False  # Re-enable card detection
+        self._finish_operation()
+    
+    def write_work_order(self, path: str, skip_identical: bool = False):
+        """
+        Issue every card of a CSV/Excel work order
         
-        # Force immediate card status check
-        self.root.after(100, self.update_card_status_now)
+        Args:
+            path: Work order file (thread1, thread2[, quantity] per row)
+            skip_identical: Read each card first and skip blocks that
+                already match
+        """
+        if self.is_busy:
+            self.gui.log("Another operation is in progress", 'warning')
+            return
+        
+        try:
+            lines, errors = load_work_order(path)
+        except (OSError, ValueError) as e:
+            self.gui.log(f"Cannot load work order: {e}", 'error')
+            self.gui.show_error("Work Order", f"Cannot load work order.\n\n{e}")
+            return
+        
+        # Nothing is written unless every line is valid
+        if errors:
+            for error in errors:
+                self.gui.log(error, 'error')
+            shown = "\n".join(errors[:10])
+            if len(errors) > 10:
+                shown += f"\n... and {len(errors) - 10} more"
+            self.gui.show_error("Invalid Work Order", f"Please fix the work order:\n\n{shown}")
+            return
+        
+        total = sum(line.quantity for line in lines)
+        if not self.gui.ask_yes_no(
+            "Work Order",
+            f"{len(lines)} lines, {total} cards in total.\n\nStart writing?"
+        ):
+            return
+        
+        if not self._begin_operation():
+            return
+        
+        self.gui.log(f"=== Work Order: {len(lines)} lines, {total} cards ===", 'info')
+        if skip_identical:
+            self.gui.log("Read-first mode: unchanged blocks are not rewritten", 'info')
+        self.gui.log("Place cards one after another. Click 'Stop' to end early.", 'warning')
+        
+        job = build_job(lines, skip_identical=skip_identical, stop_event=self.stop_event)
+        
+        self.stop_window = self._create_stop_window("Writing Work Order")
+        self.gui.set_card_status("Waiting...", False)
+        
+        self.pool.run_batch(
+            job, log=self._log,
+            on_done=lambda job: self._work_order_done(path, lines, job),
+            on_result=self._record_batch_result
+        )
+    
+    def _work_order_done(self, path: str, lines: List[WorkOrderLine], job: BatchJob):
+        """Called on the Tk thread when a work order has finished"""
+        self.gui.log(f"\n=== Work Order Complete ===", 'info')
+        self.gui.log(f"Success: {job.success_count}/{job.quantity}", 'success')
+        if job.failed_count > 0:
+            self.gui.log(f"Failed attempts: {job.failed_count}", 'error')
+        
+        try:
+            results_path = export_results(path, lines, job)
+            self.gui.log(f"Results saved to {results_path}", 'info')
+        except OSError as e:
+            results_path = None
+            self.gui.log(f"Failed to save work order results: {e}", 'error')
+        
+        summary = (
+            f"Success: {job.success_count}/{job.quantity}\n"
+            f"Failed attempts: {job.failed_count}"
+        )
+        if results_path:
+            summary += f"\n\nResults: {results_path}"
+        
+        if job.success_count == job.quantity:
+            self.gui.show_success("Work Order Complete", summary)
+        else:
+            self.gui.show_warning("Work Order Incomplete", summary)
+        
+        self._finish_operation()
     
     def read_kanban(self):
         """Read and display thread codes from Kanban card"""
-        self.is_busy = True  # Disable card detection during operation
-        self.gui.log("Reading Kanban card...", 'info')
+        if not self._begin_operation():
+            return
         
+        self.gui.log("Reading Kanban card...", 'info')
+        self._submit_operation(self._read_kanban_job)
+    
+    def _read_kanban_job(self):
+        """Reader worker side of read_kanban"""
         # Wait for card
         if not self.wait_for_card():
-            self.gui.show_error(
+            self._post(
+                self.gui.show_error,
                 "No Card Detected",
                 "Please place a card on the reader and try again."
             )
-            self.is_busy = False
             return
         
         # Read data
         success, thread1, thread2, msg = self.rfid.read_kanban()
+        self._record_operation('read', success, msg, thread1=thread1, thread2=thread2)
         
         if success:
-            self.gui.log(msg, 'success')
-            self.gui.log(f"Thread 1: {thread1}", 'info')
-            self.gui.log(f"Thread 2: {thread2}", 'info')
+            self._log(msg, 'success')
+            self._log(f"Thread 1: {thread1}", 'info')
+            self._log(f"Thread 2: {thread2}", 'info')
             
             # Update GUI inputs
-            self.gui.set_thread_values(thread1, thread2)
+            self._post(self.gui.set_thread_values, thread1, thread2)
             
             # Show results
             if thread1.lower() == BYPASS_KEYWORD.lower():
-                self.gui.show_warning(
+                self._post(
+                    self.gui.show_warning,
                     "Bypass Card",
                     "This is a BYPASS card.\n\n"
                     "Machine will operate without verification."
                 )
             else:
-                self.gui.show_success(
+                self._post(
+                    self.gui.show_success,
                     "Card Read Successfully",
                     f"Thread 1: {thread1}\n"
                     f"Thread 2: {thread2}"
                 )
         else:
-            self.gui.log(f"Failed to read Kanban: {msg}", 'error')
-            self.gui.show_error(
+            self._log(f"Failed to read Kanban: {msg}", 'error')
+            self._post(
+                self.gui.show_error,
                 "Read Failed",
                 f"Failed to read Kanban card.\n\n{msg}"
             )
         
         # Disconnect from card
         self.rfid.disconnect()
-        self.is_busy = False  # Re-enable card detection
-        
-        # Force immediate card status check
-        self.root.after(100, self.update_card_status_now)
     
     def read_multiple(self):
         """
         Read multiple Kanban cards continuously until stopped
         """
-        self.is_busy = True
-        self.stop_multiple_operation = False
+        if not self._begin_operation():
+            return
+        
         self.gui.log(f"=== Reading Multiple Cards (Continuous Mode) ===", 'info')
         self.gui.log("Click 'Stop' button to finish reading.", 'warning')
         
         # Create stop button window
-        stop_window = self._create_stop_window("Reading Cards")
-        
+        self.stop_window = self._create_stop_window("Reading Cards")
+        self._submit_operation(self._read_multiple_job)
+    
+    def _read_multiple_job(self):
+        """Reader worker side of read_multiple"""
         success_count = 0
         failed_count = 0
         cards_data = []
         card_number = 1
+        reader_error = False
         
-        while not self.stop_multiple_operation:
-            self.gui.log(f"\n[Card {card_number}] Waiting for card...", 'warning')
-            self.root.update()
+        while not self.stop_event.is_set():
+            if not reader_error:
+                self._log(f"\n[Card {card_number}] Waiting for card...", 'warning')
             
             # Wait for card with shorter timeout for better responsiveness
-            if not self._wait_for_card_continuous(timeout=10):
-                if self.stop_multiple_operation:
+            found, msg = self._wait_for_card_continuous(timeout=10)
+            if not found:
+                if self.stop_event.is_set():
                     break
-                self.gui.log(f"[Card {card_number}] No card detected - Skipping", 'error')
+                if msg != "Timeout waiting for card":
+                    # Reader gone: reported once, not counted as a card;
+                    # the loop resumes when the reader is back
+                    if not reader_error:
+                        self._log(f"Reader error: {msg} - waiting for the reader", 'error')
+                        reader_error = True
+                    continue
+                self._log(f"[Card {card_number}] No card detected - Skipping", 'error')
+                self.rfid.feedback('failure')
                 failed_count += 1
                 card_number += 1
                 continue
             
-            if self.stop_multiple_operation:
+            reader_error = False
+            
+            if self.stop_event.is_set():
                 self.rfid.disconnect()
                 break
             
             # Read data
-            self.gui.log(f"[Card {card_number}] Reading data...", 'info')
+            self._log(f"[Card {card_number}] Reading data...", 'info')
             success, thread1, thread2, msg = self.rfid.read_kanban()
+            self._record_operation('read', success, msg, thread1=thread1, thread2=thread2, card=card_number)
             
             if success:
                 success_count += 1
@@ -329,58 +642,47 @@ class KanbanToolApp:
                 
                 # Log the data
                 if thread1.lower() == BYPASS_KEYWORD.lower():
-                    self.gui.log(f"[Card {card_number}] ⚠️ BYPASS CARD", 'warning')
+                    self._log(f"[Card {card_number}] ⚠️ BYPASS CARD", 'warning')
                 else:
-                    self.gui.log(f"[Card {card_number}] Thread 1: {thread1}", 'success')
-                    self.gui.log(f"[Card {card_number}] Thread 2: {thread2}", 'success')
+                    self._log(f"[Card {card_number}] Thread 1: {thread1}", 'success')
+                    self._log(f"[Card {card_number}] Thread 2: {thread2}", 'success')
                 
                 # Disconnect and wait for card removal
                 self.rfid.disconnect()
                 
-                if not self.stop_multiple_operation:
-                    self.gui.log(f"[Card {card_number}] Please remove card and place next card", 'warning')
+                if not self.stop_event.is_set():
+                    self._log(f"[Card {card_number}] Please remove card and place next card", 'warning')
                     
-                    # Wait for card to be removed
-                    removed = False
-                    for _ in range(50):
-                        self.root.update()
-                        if self.stop_multiple_operation:
-                            break
-                        if not self.rfid.check_card_present():
-                            removed = True
-                            break
-                        import time
-                        time.sleep(0.1)
+                    # Wait (up to 5 seconds) for card to be removed
+                    removed = self.rfid.wait_for_removal(
+                        timeout=5, cancelled=self.stop_event.is_set
+                    )
                     
-                    if not removed and not self.stop_multiple_operation:
-                        self.gui.log(f"[Card {card_number}] Warning: Card not removed yet", 'warning')
+                    if not removed and not self.stop_event.is_set():
+                        self._log(f"[Card {card_number}] Warning: Card not removed yet", 'warning')
             else:
                 failed_count += 1
-                self.gui.log(f"[Card {card_number}] ✗ Failed: {msg}", 'error')
+                self._log(f"[Card {card_number}] ✗ Failed: {msg}", 'error')
                 self.rfid.disconnect()
             
             card_number += 1
-            self.root.update()
-        
-        # Close stop window
-        stop_window.destroy()
         
         # Summary
         total_cards = card_number - 1
-        self.gui.log(f"\n=== Read Multiple Complete ===", 'info')
-        self.gui.log(f"Total cards processed: {total_cards}", 'info')
-        self.gui.log(f"Success: {success_count}", 'success')
+        self._log(f"\n=== Read Multiple Complete ===", 'info')
+        self._log(f"Total cards processed: {total_cards}", 'info')
+        self._log(f"Success: {success_count}", 'success')
         if failed_count > 0:
-            self.gui.log(f"Failed: {failed_count}", 'error')
+            self._log(f"Failed: {failed_count}", 'error')
         
         # Show detailed summary
         if cards_data:
-            self.gui.log(f"\n--- Cards Summary ---", 'info')
+            self._log(f"\n--- Cards Summary ---", 'info')
             for card in cards_data:
                 if card['is_bypass']:
-                    self.gui.log(f"Card {card['number']}: BYPASS CARD", 'warning')
+                    self._log(f"Card {card['number']}: BYPASS CARD", 'warning')
                 else:
-                    self.gui.log(f"Card {card['number']}: {card['thread1']} / {card['thread2']}", 'info')
+                    self._log(f"Card {card['number']}: {card['thread1']} / {card['thread2']}", 'info')
         
         # Show summary dialog
         if total_cards > 0:
@@ -396,263 +698,330 @@ class KanbanToolApp:
                     if len(cards_data) > 10:
                         summary_text += f"... and {len(cards_data) - 10} more\n"
                 
-                self.gui.show_success("Cards Read", summary_text)
+                self._post(self.gui.show_success, "Cards Read", summary_text)
             else:
-                self.gui.show_warning(
+                self._post(
+                    self.gui.show_warning,
                     "Read Complete",
                     f"Total: {total_cards}\n"
                     f"Success: {success_count}\n"
                     f"Failed: {failed_count}\n\n"
                     f"Please check the log for details."
                 )
-        
-        self.is_busy = False
-        self.root.after(100, self.update_card_status_now)
     
     def write_bypass(self):
         """Write bypass mode to card"""
-        self.is_busy = True  # Disable card detection during operation
-        self.gui.log("Writing BYPASS card...", 'warning')
+        if not self._begin_operation():
+            return
         
+        self.gui.log("Writing BYPASS card...", 'warning')
+        self._submit_operation(self._write_bypass_job)
+    
+    def _write_bypass_job(self):
+        """Reader worker side of write_bypass"""
         # Wait for card
         if not self.wait_for_card():
-            self.gui.show_error(
+            self._post(
+                self.gui.show_error,
                 "No Card Detected",
                 "Please place a card on the reader and try again."
             )
-            self.is_busy = False
             return
         
         # Write bypass
         success, msg = self.rfid.write_bypass()
+        self._record_operation('bypass', success, msg, thread1=BYPASS_KEYWORD, thread2="")
         
         if success:
-            self.gui.log("BYPASS card written successfully", 'success')
-            self.gui.show_success(
+            self._log("BYPASS card written successfully", 'success')
+            self._post(
+                self.gui.show_success,
                 "Success",
                 "BYPASS card written successfully!\n\n"
                 "⚠️ WARNING: This card will bypass all verification.\n"
                 "Use only for maintenance or special operations."
             )
         else:
-            self.gui.log(f"Failed to write BYPASS: {msg}", 'error')
-            self.gui.show_error(
+            self._log(f"Failed to write BYPASS: {msg}", 'error')
+            self._post(
+                self.gui.show_fatal if self.rfid.last_rollback_failed else self.gui.show_error,
                 "Write Failed",
                 f"Failed to write BYPASS card.\n\n{msg}"
             )
         
         # Disconnect from card
         self.rfid.disconnect()
-        self.is_busy = False  # Re-enable card detection
-        
-        # Force immediate card status check
-        self.root.after(100, self.update_card_status_now)
     
     def clear_card(self):
         """Clear all data from card"""
-        self.is_busy = True  # Disable card detection during operation
-        self.gui.log("Clearing card...", 'info')
+        if not self._begin_operation():
+            return
         
+        self.gui.log("Clearing card...", 'info')
+        self._submit_operation(self._clear_card_job)
+    
+    def _clear_card_job(self):
+        """Reader worker side of clear_card"""
         # Wait for card
         if not self.wait_for_card():
-            self.gui.show_error(
+            self._post(
+                self.gui.show_error,
                 "No Card Detected",
                 "Please place a card on the reader and try again."
             )
-            self.is_busy = False
             return
         
         # Clear data
         success, msg = self.rfid.clear_card()
+        self._record_operation('clear', success, msg)
         
         if success:
-            self.gui.log(msg, 'success')
-            self.gui.show_success(
+            self._log(msg, 'success')
+            self._post(
+                self.gui.show_success,
                 "Success",
                 "Card cleared successfully!"
             )
         else:
-            self.gui.log(f"Failed to clear card: {msg}", 'error')
-            self.gui.show_error(
+            self._log(f"Failed to clear card: {msg}", 'error')
+            self._post(
+                self.gui.show_error,
                 "Clear Failed",
                 f"Failed to clear card.\n\n{msg}"
             )
         
         # Disconnect from card
         self.rfid.disconnect()
-        self.is_busy = False  # Re-enable card detection
-        
-        # Force immediate card status check
-        self.root.after(100, self.update_card_status_now)
     
     def clear_multiple(self):
         """
         Clear multiple Kanban cards continuously until stopped
         """
-        self.is_busy = True
-        self.stop_multiple_operation = False
+        if not self._begin_operation():
+            return
+        
         self.gui.log(f"=== Clearing Multiple Cards (Continuous Mode) ===", 'info')
         self.gui.log("Click 'Stop' button to finish clearing.", 'warning')
         
         # Create stop button window
-        stop_window = self._create_stop_window("Clearing Cards")
-        
+        self.stop_window = self._create_stop_window("Clearing Cards")
+        self._submit_operation(self._clear_multiple_job)
+    
+    def _clear_multiple_job(self):
+        """Reader worker side of clear_multiple"""
         success_count = 0
         failed_count = 0
         card_number = 1
+        reader_error = False
         
-        while not self.stop_multiple_operation:
-            self.gui.log(f"\n[Card {card_number}] Waiting for card...", 'warning')
-            self.root.update()
+        while not self.stop_event.is_set():
+            if not reader_error:
+                self._log(f"\n[Card {card_number}] Waiting for card...", 'warning')
             
             # Wait for card with shorter timeout
-            if not self._wait_for_card_continuous(timeout=10):
-                if self.stop_multiple_operation:
+            found, msg = self._wait_for_card_continuous(timeout=10)
+            if not found:
+                if self.stop_event.is_set():
                     break
-                self.gui.log(f"[Card {card_number}] No card detected - Skipping", 'error')
+                if msg != "Timeout waiting for card":
+                    # Reader gone: reported once, not counted as a card;
+                    # the loop resumes when the reader is back
+                    if not reader_error:
+                        self._log(f"Reader error: {msg} - waiting for the reader", 'error')
+                        reader_error = True
+                    continue
+                self._log(f"[Card {card_number}] No card detected - Skipping", 'error')
+                self.rfid.feedback('failure')
                 failed_count += 1
                 card_number += 1
                 continue
             
-            if self.stop_multiple_operation:
+            reader_error = False
+            
+            if self.stop_event.is_set():
                 self.rfid.disconnect()
                 break
             
             # Clear data
-            self.gui.log(f"[Card {card_number}] Clearing data...", 'info')
+            self._log(f"[Card {card_number}] Clearing data...", 'info')
             success, msg = self.rfid.clear_card()
+            self._record_operation('clear', success, msg, card=card_number)
             
             if success:
                 success_count += 1
-                self.gui.log(f"[Card {card_number}] ✓ Cleared!", 'success')
+                self._log(f"[Card {card_number}] ✓ Cleared!", 'success')
                 
                 # Disconnect and wait for card removal
                 self.rfid.disconnect()
                 
-                if not self.stop_multiple_operation:
-                    self.gui.log(f"[Card {card_number}] Please remove card and place next card", 'warning')
+                if not self.stop_event.is_set():
+                    self._log(f"[Card {card_number}] Please remove card and place next card", 'warning')
                     
-                    # Wait for card to be removed
-                    removed = False
-                    for _ in range(50):
-                        self.root.update()
-                        if self.stop_multiple_operation:
-                            break
-                        if not self.rfid.check_card_present():
-                            removed = True
-                            break
-                        import time
-                        time.sleep(0.1)
+                    # Wait (up to 5 seconds) for card to be removed
+                    removed = self.rfid.wait_for_removal(
+                        timeout=5, cancelled=self.stop_event.is_set
+                    )
                     
-                    if not removed and not self.stop_multiple_operation:
-                        self.gui.log(f"[Card {card_number}] Warning: Card not removed yet", 'warning')
+                    if not removed and not self.stop_event.is_set():
+                        self._log(f"[Card {card_number}] Warning: Card not removed yet", 'warning')
             else:
                 failed_count += 1
-                self.gui.log(f"[Card {card_number}] ✗ Failed: {msg}", 'error')
+                self._log(f"[Card {card_number}] ✗ Failed: {msg}", 'error')
                 self.rfid.disconnect()
             
             card_number += 1
-            self.root.update()
-        
-        # Close stop window
-        stop_window.destroy()
         
         # Summary
         total_cards = card_number - 1
-        self.gui.log(f"\n=== Clear Multiple Complete ===", 'info')
-        self.gui.log(f"Total cards processed: {total_cards}", 'info')
-        self.gui.log(f"Success: {success_count}", 'success')
+        self._log(f"\n=== Clear Multiple Complete ===", 'info')
+        self._log(f"Total cards processed: {total_cards}", 'info')
+        self._log(f"Success: {success_count}", 'success')
         if failed_count > 0:
-            self.gui.log(f"Failed: {failed_count}", 'error')
+            self._log(f"Failed: {failed_count}", 'error')
         
         # Show summary dialog
         if total_cards > 0:
             if failed_count == 0:
-                self.gui.show_success(
+                self._post(
+                    self.gui.show_success,
                     "All Cards Cleared",
                     f"Successfully cleared {success_count} cards!"
                 )
             else:
-                self.gui.show_warning(
+                self._post(
+                    self.gui.show_warning,
                     "Clear Complete",
                     f"Total: {total_cards}\n"
                     f"Success: {success_count}\n"
                     f"Failed: {failed_count}\n\n"
                     f"Please check the log for details."
                 )
-        
-        self.is_busy = False
-        self.root.after(100, self.update_card_status_now)
+    
+    def show_stats(self):
+        """Open the APDU statistics window"""
+        self.gui.show_stats_window(self._stats_report, self._reset_stats)
+    
+    def _stats_report(self) -> str:
+        """APDU statistics of every reader as text (snapshots are thread-safe)"""
+        reports = []
+        for worker in self.pool.connected_workers or [self.pool.primary]:
+            stats = worker.rfid.get_stats()
+            reports.append(f"Reader: {stats['reader'] or 'not connected'}")
+            reports.append(worker.rfid.stats.format_report(stats))
+        return "\n\n".join(reports)
+    
+    def _reset_stats(self):
+        """Clear the APDU statistics of every reader"""
+        for worker in self.pool.workers:
+            worker.rfid.reset_stats()
     
     def start_card_detection(self):
-        """Start automatic card detection polling"""
-        if self.rfid.reader is None:
-            # No reader, try again later
-            self.root.after(2000, self.start_card_detection)
+        """Start (or move) event-driven card detection on the primary reader"""
+        reader = self.pool.primary_reader
+        if reader is None:
+            # No reader yet; called again when the supervisor binds one
             return
         
-        self.check_card_status()
+        if self.card_monitor is not None:
+            if self.card_monitor.reader_name == str(reader):
+                return
+            self.card_monitor.stop()
+        
+        self.card_monitor = CardMonitor(reader, self.card_events)
+        self.card_monitor.start()
     
-    def check_card_status(self):
-        """Check if card is present and update GUI"""
-        if not self.is_busy and self.rfid.reader is not None:
-            card_now = self.rfid.check_card_present()
-            
-            # Update GUI only if status changed
-            if card_now != self.card_present:
-                self.card_present = card_now
-                if card_now:
-                    self.gui.set_card_status("Card Detected", True)
-                    # Try to get and display UID
-                    uid = self._get_card_uid_safe()
-                    if uid:
-                        self.gui.set_card_uid(uid)
-                        self.gui.log(f"Card detected - UID: {uid}", 'success')
-                    else:
-                        self.gui.set_card_uid("-")
-                        self.gui.log("Card detected on reader", 'success')
-                else:
-                    self.gui.set_card_status("No Card", False)
-                    self.gui.set_card_uid("-")
-                    self.gui.log("Card removed from reader", 'info')
+    def process_events(self):
+        """Drain worker results and card events on the Tk thread"""
+        self.ui_queue.woken()
+        self.card_events.woken()
+        
+        # One failing callback must not strand the rest of the drain (e.g.
+        # _finish_operation, which clears is_busy)
+        while True:
+            try:
+                func, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.exception(f"GUI callback {getattr(func, '__name__', func)} failed")
+                self.gui.log(f"Internal error: {e}", 'error')
         
-        # Schedule next check (every 500ms)
-        self.root.after(500, self.check_card_status)
+        while True:
+            try:
+                event = self.card_events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._handle_card_event(event)
+            except Exception as e:
+                self.logger.exception("Card event handling failed")
+                self.gui.log(f"Internal error: {e}", 'error')
+    
+    def _handle_card_event(self, event):
+        """Update GUI for a card insert/remove event"""
+        # Operations report their own card status
+        if self.is_busy:
+            return
+        
+        card_now = event.kind == CARD_INSERTED
+        if card_now == self.card_present:
+            return
+        
+        self.card_present = card_now
+        if card_now:
+            self.gui.set_card_status("Card Detected", True)
+            # Prefetch UID/ATR/type on the reader worker; operations on this
+            # card then reuse the cached info
+            self.worker.submit(self._get_card_info_safe, on_done=self._show_detected_card)
+        else:
+            self.gui.set_card_status("No Card", False)
+            self.gui.set_card_uid("-")
+            self.gui.log("Card removed from reader", 'info')
+    
+    def _show_detected_card(self, info: Optional[CardInfo]):
+        """Display the UID and type of a newly detected card"""
+        if info:
+            self.gui.set_card_uid(info.uid)
+            self.gui.log(f"Card detected - UID: {info.uid} ({info.card_type})", 'success')
+            # History comes from the registry index, not from the card
+            self.gui.log(self.registry.describe(self.registry.get(info.uid)), 'info')
+        else:
+            self.gui.set_card_uid("-")
+            self.gui.log("Card detected on reader", 'success')
     
     def update_card_status_now(self):
         """Force immediate card status update (called after operations)"""
         if self.rfid.reader is not None:
-            card_now = self.rfid.check_card_present()
-            self.card_present = card_now
-            
-            if card_now:
-                self.gui.set_card_status("Card Detected", True)
-                uid = self._get_card_uid_safe()
-                self.gui.set_card_uid(uid if uid else "-")
-            else:
-                self.gui.set_card_status("No Card", False)
-                self.gui.set_card_uid("-")
+            self.worker.submit(self._card_status_job, on_done=self._show_card_status)
+    
+    def _card_status_job(self) -> Tuple[bool, Optional[str]]:
+        """Reader worker side of update_card_status_now"""
+        card_now = self.rfid.check_card_present()
+        info = self._get_card_info_safe() if card_now else None
+        return card_now, info.uid if info is not None else None
+    
+    def _show_card_status(self, status: Tuple[bool, Optional[str]]):
+        """Display the result of _card_status_job"""
+        card_now, uid = status
+        self.card_present = card_now
+        
+        if card_now:
+            self.gui.set_card_status("Card Detected", True)
+            self.gui.set_card_uid(uid if uid else "-")
+        else:
+            self.gui.set_card_status("No Card", False)
+            self.gui.set_card_uid("-")
     
-    def _get_card_uid_safe(self) -> Optional[str]:
-        """Safely get card UID without interfering with operations"""
+    def _get_card_info_safe(self) -> Optional[CardInfo]:
+        """Safely get card UID/ATR/type without interfering with operations"""
         try:
-            # Create temporary connection to get UID
-            if self.rfid.reader is None:
+            # Reuses the session card handle (and its cached card info)
+            # instead of a temporary connection
+            if not self.rfid.select_card():
                 return None
-            
-            temp_conn = self.rfid.reader.createConnection()
-            temp_conn.connect()
-            
-            # Get UID
-            from smartcard.util import toHexString
-            get_uid_cmd = [0xFF, 0xCA, 0x00, 0x00, 0x00]
-            data, sw1, sw2 = temp_conn.transmit(get_uid_cmd)
-            
-            temp_conn.disconnect()
-            
-            if sw1 == 0x90 and sw2 == 0x00:
-                return toHexString(data)
-            return None
+            return self.rfid.get_card_info()
         except:
             return None
     
@@ -705,13 +1074,10 @@ class KanbanToolApp:
         ).pack(pady=8)
         
         # Stop button - MUCH LARGER
-        def stop_operation():
-            self.stop_multiple_operation = True
-        
         stop_btn = tk.Button(
             main_frame,
             text="⏹  STOP",
-            command=stop_operation,
+            command=self.stop_event.set,
             font=('Arial', 24, 'bold'),
             bg='#dc3545',
             fg='white',
@@ -725,80 +1091,44 @@ class KanbanToolApp:
         )
         stop_btn.pack(pady=10, ipadx=20, ipady=50)
         
-        stop_win.update()
         return stop_win
     
-    def _wait_for_card_continuous(self, timeout: int = 10) -> bool:
+    def _wait_for_card_continuous(self, timeout: int = 10) -> Tuple[bool, str]:
         """
         Wait for card with continuous operation support (can be interrupted)
         
+        Runs on the reader worker; the Stop button sets stop_event.
+        
         Returns:
-            bool: True if card detected, False otherwise
+            Tuple[bool, str]: (Card detected, Message of RFIDManager.wait_for_card)
         """
-        self.gui.set_card_status("Waiting...", False)
-        self.root.update()
+        self._post(self.gui.set_card_status, "Waiting...", False)
         
-        import time
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if self.stop_multiple_operation:
-                return False
-            
-            # Try to detect card
-            if self.rfid.reader is None:
-                return False
-            
-            # Close any existing connection first
-            if self.rfid.connection is not None:
-                try:
-                    self.rfid.connection.disconnect()
-                except:
-                    pass
-                self.rfid.connection = None
-            
-            try:
-                from smartcard.Exceptions import NoCardException, CardConnectionException
-                
-                # Create new connection
-                self.rfid.connection = self.rfid.reader.createConnection()
-                self.rfid.connection.connect()
-                
-                # Get card ATR
-                atr = self.rfid.connection.getATR()
-                self.gui.set_card_status("Card Detected", True)
-                return True
-                
-            except NoCardException:
-                # No card, keep waiting
-                self.root.update()
-                time.sleep(0.3)
-                continue
-            except CardConnectionException:
-                # Connection error, retry
-                if self.rfid.connection is not None:
-                    try:
-                        self.rfid.connection.disconnect()
-                    except:
-                        pass
-                    self.rfid.connection = None
-                self.root.update()
-                time.sleep(0.3)
-                continue
-            except Exception as e:
-                self.logger.debug(f"Error waiting for card: {e}")
-                self.root.update()
-                time.sleep(0.3)
-                continue
-        
-        self.gui.set_card_status("No Card", False)
-        return False
+        # Blocks on reader status changes instead of retrying connects
+        success, msg = self.rfid.wait_for_card(
+            timeout=timeout, cancelled=self.stop_event.is_set
+        )
+        self.card_info = self.rfid.get_card_info() if success else None
+        if success:
+            self._post(self.gui.set_card_status, "Card Detected", True)
+        else:
+            self._post(self.gui.set_card_status, "No Card", False)
+        return success, msg
     
     def run(self):
         """Start the application"""
         self.gui.log("=== Thread Verification - Kanban Tool ===", 'info')
         self.gui.log("Ready to use. Please ensure ACR122U reader is connected.", 'info')
         self.root.mainloop()
+        
+        # Let a running continuous operation end before shutting down
+        self.stop_event.set()
+        self.supervisor.stop()
+        if self.card_monitor is not None:
+            self.card_monitor.stop()
+        self.pool.stop()
+        self.journal.close()
+        self.registry.close()
 
 
 def main():
@@ -0,0 +1,199 @@
+"""
+CWT Thread Verification System - Reader Pool
+Drives every attached ACR122U reader, each with its own worker and session
+"""
+
+import logging
+import queue
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rfid_manager import RFIDManager, find_readers
+from reader_worker import ReaderWorker
+from batch_writer import BatchJob, BatchResult, StreamingBatchWriter
+
+
+class ReaderPool:
+    """
+    One RFIDManager + ReaderWorker per attached reader
+    
+    The first worker is the primary reader used for single-card
+    operations and card detection. It always exists, so operations fail
+    with "Reader not connected" rather than crashing when no reader is
+    attached. Batch jobs can run on every reader at once.
+    
+    When a reader is unplugged its worker is kept (with its place in any
+    running batch) and rebound when a reader comes back, see
+    handle_reader_change().
+    """
+    
+    def __init__(self, results: queue.Queue,
+                 on_timeout: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            results: Queue the workers post results to
+            on_timeout: Passed to every RFIDManager, called when a reader
+                transaction is cancelled by its watchdog
+        """
+        self.results = results
+        self.on_timeout = on_timeout
+        self.logger = logging.getLogger(__name__)
+        self.workers: List[ReaderWorker] = [ReaderWorker(RFIDManager(on_timeout), results)]
+        
+        self._bound: Dict[ReaderWorker, object] = {}  # Worker -> reader it is bound to
+        self._lost: List[ReaderWorker] = []  # Workers whose reader was unplugged
+    
+    @property
+    def primary(self) -> ReaderWorker:
+        """Worker for the primary reader"""
+        return self.workers[0]
+    
+    @property
+    def primary_reader(self):
+        """Reader of the primary worker, or None if unbound or unplugged"""
+        if self.primary in self._lost:
+            return None
+        return self._bound.get(self.primary)
+    
+    @property
+    def connected_workers(self) -> List[ReaderWorker]:
+        """Workers bound to a reader that is plugged in"""
+        return [w for w in self.workers if w in self._bound and w not in self._lost]
+    
+    def status(self) -> Tuple[str, bool]:
+        """
+        Reader status for the GUI
+        
+        Returns:
+            Tuple[str, bool]: (Status text, Any reader connected)
+        """
+        count = len(self.connected_workers)
+        if count == 0:
+            return ("Disconnected" if self._lost else "Not Connected"), False
+        return ("Connected" if count == 1 else f"Connected ({count} readers)"), True
+    
+    def connect(self) -> Tuple[bool, List[str]]:
+        """
+        Bind a worker to every matching reader
+        
+        Returns:
+            Tuple[bool, List[str]]: (Any reader connected, Messages)
+        """
+        try:
+            reader_list = find_readers()
+        except Exception as e:
+            self.logger.error(f"Failed to list readers: {e}")
+            return False, [f"Failed to connect reader: {str(e)}"]
+        
+        if not reader_list:
+            return False, ["No RFID readers found. Please connect ACR122U."]
+        
+        messages = []
+        for i, reader in enumerate(reader_list):
+            if i >= len(self.workers):
+                worker = ReaderWorker(RFIDManager(self.on_timeout), self.results)
+                self.workers.append(worker)
+            
+            success, msg = self.workers[i].rfid.connect_reader(reader)
+            if success:
+                self._bound[self.workers[i]] = reader
+            messages.append(msg)
+        
+        return self.primary.rfid.reader is not None, messages
+    
+    def handle_reader_change(self, readers: list) -> List[Tuple[str, str]]:
+        """
+        Rebind workers after readers were unplugged or plugged in
+        
+        Called on the GUI thread with the current reader list. A returning
+        reader goes back to the worker that had it (or, if it came back
+        under a new name, to any worker whose reader is gone), so a batch
+        running on that worker resumes. Other new readers bind to an
+        unbound worker or get a new one.
+        
+        Args:
+            readers: Readers currently attached
+            
+        Returns:
+            List[Tuple[str, str]]: (Message, Level) for each change
+        """
+        present = {str(reader): reader for reader in readers}
+        messages = []
+        
+        for worker in self.workers:
+            reader = self._bound.get(worker)
+            if reader is not None and worker not in self._lost and str(reader) not in present:
+                self._lost.append(worker)
+                messages.append((f"Reader disconnected: {reader}", 'error'))
+        
+        in_use = {str(r) for w, r in self._bound.items() if w not in self._lost}
+        for name, reader in present.items():
+            if name in in_use:
+                continue
+            
+            worker = next((w for w in self._lost if str(self._bound[w]) == name), None)
+            if worker is None and self._lost:
+                worker = self._lost[0]
+            if worker is None:
+                worker = next((w for w in self.workers if w not in self._bound), None)
+            if worker is None:
+                worker = ReaderWorker(RFIDManager(self.on_timeout), self.results)
+                self.workers.append(worker)
+                worker.start()
+            
+            if worker in self._lost:
+                self._lost.remove(worker)
+                messages.append((f"Reader reconnected: {reader}", 'success'))
+            else:
+                messages.append((f"Reader connected: {reader}", 'success'))
+            
+            # The worker switches readers itself, even in the middle of a batch
+            self._bound[worker] = reader
+            worker.rfid.request_reader(reader)
+            worker.submit(worker.rfid.apply_pending_reader)
+        
+        return messages
+    
+    def start(self):
+        """Start all worker threads"""
+        for worker in self.workers:
+            worker.start()
+    
+    def stop(self):
+        """Stop all worker threads and close their readers"""
+        for worker in self.workers:
+            worker.stop()
+    
+    def run_batch(self, job: BatchJob, log: Callable[[str, str], None],
+                  on_done: Optional[Callable[[BatchJob], None]] = None,
+                  on_result: Optional[Callable[[BatchResult], None]] = None):
+        """
+        Run a batch job on every connected reader at once
+        
+        All readers share the job, so the quantity counter, the set of
+        written UIDs and the results are common to the whole station.
+        
+        Args:
+            job: Batch job to run
+            log: Progress callback (message, level), called from workers
+            on_done: Called on the GUI thread once every reader has finished
+            on_result: Called from the worker with each card's outcome
+        """
+        workers = self.connected_workers or [self.primary]
+        remaining = [len(workers)]
+        
+        def reader_done(_result=None):
+            # Runs on the GUI thread, so the countdown needs no lock
+            remaining[0] -= 1
+            if remaining[0] == 0 and on_done is not None:
+                on_done(job)
+        
+        def reader_failed(error: Exception):
+            log(f"Reader worker failed: {error}", 'error')
+            reader_done()
+        
+        for i, worker in enumerate(workers):
+            label = f"[R{i + 1}]" if len(workers) > 1 else ""
+            writer = StreamingBatchWriter(
+                worker.rfid, job, log=log, label=label, on_result=on_result
+            )
+            worker.submit(writer.run, on_done=reader_done, on_error=reader_failed)
@@ -0,0 +1,364 @@
+"""
+CWT Thread Verification System - Reader Profiles
+ACR122U polling, buzzer and timeout settings, saved per station and applied on connect
+
+Usage:
+    python reader_profiles.py list
+    python reader_profiles.py show
+    python reader_profiles.py set fast
+    python reader_profiles.py benchmark --cycles 10 --save
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from config import READER_PROFILE_FILE, READER_PROFILE_CYCLES
+
+
+# PICC operating parameter bits (FF 00 51 P2 00)
+PICC_AUTO_POLLING = 0x80   # Reader polls for cards by itself
+PICC_AUTO_ATS = 0x40       # Request ATS from ISO 14443-4 cards
+PICC_POLL_250MS = 0x20     # Polling interval 250 ms (else 500 ms)
+PICC_FELICA_424K = 0x10
+PICC_FELICA_212K = 0x08
+PICC_TOPAZ = 0x04
+PICC_ISO14443B = 0x02
+PICC_ISO14443A = 0x01      # MIFARE Classic, NTAG21x, Ultralight
+
+# Timeout parameter (FF 00 41 P2 00): 0x00 no timeout check,
+# 0x01-0xFE in units of 5 s, 0xFF wait until the card responds
+TIMEOUT_NONE = 0x00
+TIMEOUT_WAIT = 0xFF
+
+
+class ReaderProfile(NamedTuple):
+    """Reader settings applied when a reader is connected"""
+    name: str
+    picc_parameters: int        # PICC_* bits
+    detect_buzzer: bool         # Beep when a card is detected
+    timeout: Optional[int]      # Contactless chip timeout (None: leave as is)
+    description: str = ""
+
+
+BUILTIN_PROFILES = {
+    'default': ReaderProfile(
+        'default', 0xFF, True, None,
+        "ACR122U power-on settings: every card type, 250 ms polling, beep on detect"
+    ),
+    'quiet': ReaderProfile(
+        'quiet', 0xFF, False, None,
+        "Power-on polling without the detect beep (results still beep, see READER_FEEDBACK)"
+    ),
+    'fast': ReaderProfile(
+        'fast', PICC_AUTO_POLLING | PICC_AUTO_ATS | PICC_POLL_250MS | PICC_ISO14443A, False, 0x01,
+        "Poll ISO 14443A cards only (all Kanban card types), 250 ms, no detect beep, 5 s timeout"
+    ),
+}
+
+
+class ProfileResult(NamedTuple):
+    """Latency and stability of one profile over a number of cards"""
+    profile: str
+    cycles: int
+    failures: int                 # Cards not detected or not read
+    detect_ms: Optional[float]    # Mean card placed -> detected (None if unknown)
+    detect_p95_ms: Optional[float]
+    transaction_ms: float         # Mean read_kanban time
+    transaction_p95_ms: float
+
+
+def station_name() -> str:
+    """Name of this station (host name) in the profile file"""
+    return socket.gethostname()
+
+
+def _load_file(path: str) -> dict:
+    """Profile file contents ({} if it does not exist)"""
+    if not os.path.exists(path):
+        return {}
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_file(path: str, data: dict):
+    """Write the profile file atomically (never leaves a half-written file)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_profiles(path: str = READER_PROFILE_FILE) -> Dict[str, ReaderProfile]:
+    """
+    Built-in profiles plus the custom profiles of the profile file
+    
+    Custom profiles are stored under "profiles" as
+    {"name": {"picc_parameters": 225, "detect_buzzer": false, "timeout": 1}}.
+    
+    Returns:
+        Dict[str, ReaderProfile]: Profiles by name
+    """
+    profiles = dict(BUILTIN_PROFILES)
+    
+    for name, values in _load_file(path).get('profiles', {}).items():
+        profiles[name] = ReaderProfile(
+            name,
+            int(values['picc_parameters']) & 0xFF,
+            bool(values.get('detect_buzzer', True)),
+            values.get('timeout'),
+            values.get('description', "")
+        )
+    
+    return profiles
+
+
+def profile_for_reader(reader_name: str, path: str = READER_PROFILE_FILE,
+                       station: Optional[str] = None) -> Optional[ReaderProfile]:
+    """
+    Profile selected for a reader on this station
+    
+    The profile file maps each station to {reader name: profile name};
+    "*" applies to every reader of the station.
+    
+    Returns:
+        Optional[ReaderProfile]: Profile, or None if none is selected
+            (the reader keeps its current settings)
+    """
+    logger = logging.getLogger(__name__)
+    
+    try:
+        data = _load_file(path)
+        selected = data.get('stations', {}).get(station or station_name(), {})
+        name = selected.get(reader_name, selected.get('*'))
+        if name is None:
+            return None
+        
+        profile = load_profiles(path).get(name)
+        if profile is None:
+            logger.warning(f"Unknown reader profile '{name}' for {reader_name}")
+        return profile
+        
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Cannot load reader profiles from {path}: {e}")
+        return None
+
+
+def save_station_profile(profile_name: str, reader_name: str = '*',
+                         path: str = READER_PROFILE_FILE, station: Optional[str] = None):
+    """
+    Select a profile for a reader (default: every reader) of this station
+    
+    Raises:
+        KeyError: If the profile does not exist
+    """
+    data = _load_file(path)
+    if profile_name not in load_profiles(path):
+        raise KeyError(f"Unknown profile '{profile_name}'")
+    
+    data.setdefault('stations', {}).setdefault(station or station_name(), {})[reader_name] = profile_name
+    _save_file(path, data)
+
+
+def profile_commands(profile: ReaderProfile) -> List[List[int]]:
+    """
+    Pseudo-APDUs that apply a profile
+    
+    Returns:
+        List[List[int]]: Commands in the order they are sent
+    """
+    commands = [
+        [0xFF, 0x00, 0x51, profile.picc_parameters & 0xFF, 0x00],
+        [0xFF, 0x00, 0x52, 0xFF if profile.detect_buzzer else 0x00, 0x00],
+    ]
+    if profile.timeout is not None:
+        commands.append([0xFF, 0x00, 0x41, profile.timeout & 0xFF, 0x00])
+    return commands
+
+
+def measure_profile(rfid, profile: ReaderProfile, cycles: int,
+                    place_card: Callable[[int], Optional[float]],
+                    remove_card: Callable[[int], None],
+                    timeout: float = 15) -> ProfileResult:
+    """
+    Apply a profile and time card detection and a Kanban read per card
+    
+    Args:
+        rfid: Connected RFIDManager
+        profile: Profile to measure
+        cycles: Number of cards
+        place_card: Called with the cycle number; places (or asks for) a
+            card and returns its perf_counter() placement time, or None if
+            it is not known (a person placing the card)
+        remove_card: Called with the cycle number to remove the card
+        timeout: Seconds to wait for each card
+        
+    Returns:
+        ProfileResult: Latencies and failures
+    """
+    success, msg = rfid.apply_profile(profile)
+    if not success:
+        raise RuntimeError(msg)
+    
+    detect = []
+    transaction = []
+    failures = 0
+    
+    for cycle in range(1, cycles + 1):
+        placed_at = place_card(cycle)
+        success, msg = rfid.wait_for_card(timeout=timeout)
+        detected_at = time.perf_counter()
+        
+        if success:
+            if placed_at is not None:
+                detect.append((detected_at - placed_at) * 1000)
+            
+            start = time.perf_counter()
+            success, _, _, msg = rfid.read_kanban()
+            if success:
+                transaction.append((time.perf_counter() - start) * 1000)
+        
+        if not success:
+            failures += 1
+        
+        rfid.disconnect()
+        remove_card(cycle)
+        rfid.wait_for_removal(timeout=timeout)
+    
+    def p95(values: List[float]) -> Optional[float]:
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+    
+    return ProfileResult(
+        profile.name,
+        cycles,
+        failures,
+        statistics.mean(detect) if detect else None,
+        p95(detect),
+        statistics.mean(transaction) if transaction else 0.0,
+        p95(transaction) or 0.0
+    )
+
+
+def best_profile(results: List[ProfileResult]) -> Optional[ProfileResult]:
+    """
+    Fastest stable profile: no failures, lowest detection + transaction time
+    
+    Returns:
+        Optional[ProfileResult]: Best result, or None if every profile failed
+    """
+    stable = [r for r in results if r.failures == 0]
+    if not stable:
+        return None
+    return min(stable, key=lambda r: (r.detect_ms or 0.0) + r.transaction_ms)
+
+
+def print_results(results: List[ProfileResult]):
+    """Print profile results as a text table"""
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+    
+    print(f"{'Profile':<12}{'Cards':>6}{'Failed':>8}{'Detect ms':>11}{'p95':>8}{'Read ms':>10}{'p95':>8}")
+    for r in results:
+        print(f"{r.profile:<12}{r.cycles:>6}{r.failures:>8}{ms(r.detect_ms):>11}{ms(r.detect_p95_ms):>8}"
+              f"{ms(r.transaction_ms):>10}{ms(r.transaction_p95_ms):>8}")
+
+
+def _benchmark_hardware(args) -> int:
+    """Measure every profile on the connected reader with operator-placed cards"""
+    from rfid_manager import RFIDManager
+    
+    rfid = RFIDManager()
+    success, msg = rfid.connect_reader()
+    if not success:
+        print(msg, file=sys.stderr)
+        return 2
+    
+    reader_name = str(rfid.reader)
+    
+    def place_card(cycle: int) -> None:
+        print(f"  Place card ({cycle}/{args.cycles})", file=sys.stderr, flush=True)
+        return None
+    
+    def remove_card(cycle: int):
+        print("  Remove card", file=sys.stderr, flush=True)
+    
+    results = []
+    try:
+        for profile in load_profiles(args.file).values():
+            print(f"Profile '{profile.name}': {profile.description}", file=sys.stderr)
+            results.append(measure_profile(rfid, profile, args.cycles, place_card, remove_card))
+    finally:
+        # Back to this station's own settings
+        saved = profile_for_reader(reader_name, args.file)
+        rfid.apply_profile(saved or BUILTIN_PROFILES['default'])
+        rfid.close()
+    
+    print_results(results)
+    
+    best = best_profile(results)
+    if best is None:
+        print("No profile read every card", file=sys.stderr)
+        return 1
+    
+    print(f"Fastest stable profile: {best.profile}")
+    if args.save:
+        save_station_profile(best.profile, reader_name, args.file)
+        print(f"Saved for {reader_name} on {station_name()}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Reader profile tool entry point"""
+    parser = argparse.ArgumentParser(description="ACR122U reader profiles for this station")
+    parser.add_argument('--file', default=READER_PROFILE_FILE,
+                        help="profile file (default: %(default)s)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    sub.add_parser('list', help="list the available profiles")
+    sub.add_parser('show', help="show the profiles selected on this station")
+    
+    select = sub.add_parser('set', help="select a profile on this station")
+    select.add_argument('profile')
+    select.add_argument('--reader', default='*', help="reader name (default: every reader)")
+    
+    bench = sub.add_parser('benchmark', help="time every profile on the connected reader")
+    bench.add_argument('--cycles', type=int, default=READER_PROFILE_CYCLES,
+                       help="cards per profile (default: %(default)s)")
+    bench.add_argument('--save', action='store_true',
+                       help="select the fastest stable profile for this reader")
+    
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    
+    if args.command == 'list':
+        for profile in load_profiles(args.file).values():
+            print(f"{profile.name:<12}PICC {profile.picc_parameters:02X}  {profile.description}")
+    elif args.command == 'show':
+        selected = _load_file(args.file).get('stations', {}).get(station_name(), {})
+        print(json.dumps({station_name(): selected}, indent=2))
+    elif args.command == 'set':
+        try:
+            save_station_profile(args.profile, args.reader, args.file)
+        except KeyError as e:
+            print(e.args[0], file=sys.stderr)
+            return 1
+    else:
+        return _benchmark_hardware(args)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
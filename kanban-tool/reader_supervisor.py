@@ -0,0 +1,77 @@
+"""
+CWT Thread Verification System - Reader Supervisor
+Detects ACR122U readers being unplugged and plugged back in
+"""
+
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from rfid_manager import find_readers
+from config import READER_POLL_INTERVAL
+
+
+class ReaderSupervisor:
+    """
+    Watches the PC/SC reader list for hot-plug changes
+    
+    Lists the readers every READER_POLL_INTERVAL seconds on its own
+    thread (this does not touch any card) and, whenever the list changes,
+    hands the new list to on_change through the results queue, so the
+    callback runs on the GUI thread.
+    """
+    
+    def __init__(self, results: queue.Queue, on_change: Callable[[list], None],
+                 interval: float = READER_POLL_INTERVAL):
+        self.results = results
+        self.on_change = on_change
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start watching the reader list"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ReaderSupervisor", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop watching and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _list_readers(self) -> list:
+        """Current matching readers (none while the PC/SC service is unavailable)"""
+        try:
+            return find_readers()
+        except Exception as e:
+            # Some platforms raise instead of returning an empty list
+            self.logger.debug(f"Cannot list readers: {e}")
+            return []
+    
+    def _run(self):
+        """Thread body: post the reader list whenever it changes"""
+        last_names: Optional[List[str]] = None
+        
+        while True:
+            readers = self._list_readers()
+            names = [str(reader) for reader in readers]
+            
+            if names != last_names:
+                if last_names is not None:
+                    self.logger.info(f"Reader list changed: {names}")
+                last_names = names
+                self.results.put((self.on_change, (readers,)))
+            
+            if self._stop.wait(self.interval):
+                break
@@ -0,0 +1,89 @@
+"""
+CWT Thread Verification System - Reader Worker
+Dedicated thread that owns the RFIDManager and runs queued card commands
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from rfid_manager import RFIDManager
+
+
+class ReaderWorker:
+    """
+    Runs RFID commands on a dedicated thread
+    
+    All PC/SC calls for one reader happen on this thread. Commands are
+    queued with submit(); their results are handed back as callables on
+    the results queue, which the GUI drains on the Tk thread.
+    """
+    
+    _STOP = object()  # Sentinel that ends the worker loop
+    
+    def __init__(self, rfid: RFIDManager, results: queue.Queue):
+        self.rfid = rfid
+        self.results = results
+        self.logger = logging.getLogger(__name__)
+        
+        self._commands: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the worker thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._thread = threading.Thread(
+            target=self._run, name="ReaderWorker", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Finish queued commands, close the reader and stop the thread"""
+        if self._thread is None:
+            return
+        
+        self._commands.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def submit(self, func: Callable, *args,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               **kwargs):
+        """
+        Queue a command to run on the worker thread
+        
+        Args:
+            func: Callable to run on the worker thread
+            on_done: Called on the GUI thread with the command's result
+            on_error: Called on the GUI thread with the raised exception
+        """
+        self._commands.put((func, args, kwargs, on_done, on_error))
+    
+    def post(self, func: Callable, *args):
+        """Queue a callable to run on the GUI thread"""
+        self.results.put((func, args))
+    
+    def _run(self):
+        """Thread body: execute commands in submission order"""
+        while True:
+            command = self._commands.get()
+            if command is self._STOP:
+                break
+            
+            func, args, kwargs, on_done, on_error = command
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.logger.error(f"Reader command failed: {e}", exc_info=True)
+                if on_error is not None:
+                    self.post(on_error, e)
+                continue
+            
+            if on_done is not None:
+                self.post(on_done, result)
+        
+        self.rfid.close()
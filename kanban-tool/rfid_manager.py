@@ -3,27 +3,470 @@ CWT Thread Verification System - RFID Manager
 Handles all RFID card operations using ACR122U reader
 """
 
+import functools
 import logging
-from typing import Optional, Tuple, List
-from smartcard.System import readers
-from smartcard.util import toHexString, toBytes
-from smartcard.Exceptions import CardConnectionException, NoCardException
+import queue
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, List
 import time
 
+from apdu_stats import ApduStats, command_name
+from transaction_watchdog import TransactionTimeout, TransactionWatchdog
+from tag_drivers import TagDriver, block_label, card_type_from_atr, driver_for_atr
+from reader_profiles import ReaderProfile, profile_commands, profile_for_reader
 from config import (
     BLOCK_THREAD1, BLOCK_THREAD2, BLOCK_SIZE,
     DEFAULT_KEY_A, BYPASS_KEYWORD, READER_TIMEOUT,
-    READER_NAME_FILTER
+    READER_NAME_FILTER, CARD_WAIT_SLICE_MS, READER_FEEDBACK,
+    IO_RETRIES, IO_RETRY_BACKOFF_S, IO_RETRY_BACKOFF_MAX_S, READER_ERROR_BACKOFF_MAX_S,
+    APDU_TIMEOUT_S, OPERATION_TIMEOUT_S, ROLLBACK_TIMEOUT_S
 )
 
 
+# pyscard is imported on first use rather than at module load, so the GUI
+# and CLI can start (and paint) before the PC/SC stack is loaded
+
+
+# SCARD_CTL_CODE function number of the CCID escape command (reader pseudo-APDUs
+# without a card, over a SCARD_SHARE_DIRECT connection)
+IOCTL_CCID_ESCAPE = 3500
+
+
+# ACR122U LED/buzzer control: FF 00 40 P2 04 T1 T2 repetitions buzzer
+# P2 holds the final LED state, which LEDs to update, the initial blink
+# state and which LEDs blink. T1/T2 are the two blink phases (100 ms units).
+LED_FINAL_RED = 0x01
+LED_FINAL_GREEN = 0x02
+LED_UPDATE_RED = 0x04
+LED_UPDATE_GREEN = 0x08
+LED_INITIAL_RED = 0x10
+LED_INITIAL_GREEN = 0x20
+LED_BLINK_RED = 0x40
+LED_BLINK_GREEN = 0x80
+BUZZER_T1 = 0x01  # Buzzer on during T1
+BUZZER_T2 = 0x02  # Buzzer on during T2
+
+_LED_UPDATE = LED_FINAL_RED | LED_UPDATE_RED | LED_UPDATE_GREEN  # Back to red (idle) afterwards
+
+# Result pattern -> (P2, T1, T2, repetitions, buzzer)
+FEEDBACK_PATTERNS = {
+    'success': (_LED_UPDATE | LED_INITIAL_GREEN | LED_BLINK_GREEN, 3, 1, 1, BUZZER_T1),  # Green, one beep
+    'failure': (_LED_UPDATE | LED_INITIAL_RED | LED_BLINK_RED, 1, 1, 3, BUZZER_T1 | BUZZER_T2),  # Red blinks, long beeps
+    'bypass': (_LED_UPDATE | LED_INITIAL_GREEN | LED_BLINK_RED | LED_BLINK_GREEN, 1, 1, 4, BUZZER_T1),  # Red/green alternating
+}
+
+
+def _scard():
+    """Import the low-level PC/SC bindings on first use"""
+    from smartcard import scard
+    return scard
+
+
+def _connection_error(message: str) -> Exception:
+    """Build a pyscard CardConnectionException"""
+    from smartcard.Exceptions import CardConnectionException
+    return CardConnectionException(message)
+
+
+def to_hex(data) -> str:
+    """Format bytes as a hex string (same format as smartcard.util.toHexString)"""
+    return ' '.join(f"{b:02X}" for b in data)
+
+
+def find_readers() -> list:
+    """
+    List the PC/SC readers to use for Kanban cards
+    
+    Returns every reader matching READER_NAME_FILTER. If none match, the
+    first available reader is returned as a fallback.
+    
+    Returns:
+        list: Readers (empty if no reader is attached)
+    """
+    from smartcard.System import readers
+    
+    reader_list = readers()
+    
+    # Find ACR122U readers
+    matching = [r for r in reader_list if READER_NAME_FILTER.lower() in str(r).lower()]
+    
+    if not matching and reader_list:
+        # Use first available reader as fallback
+        logging.getLogger(__name__).warning(f"ACR122U not found, using: {reader_list[0]}")
+        matching = [reader_list[0]]
+    
+    return matching
+
+
+def _bounded(operation):
+    """Run an RFIDManager card operation under the per-operation deadline"""
+    @functools.wraps(operation)
+    def wrapper(self, *args, **kwargs):
+        if self._operation_deadline is not None:
+            # Nested operation (e.g. write_bypass -> write_kanban)
+            return operation(self, *args, **kwargs)
+        
+        self.last_timed_out = False
+        self._operation_deadline = time.monotonic() + OPERATION_TIMEOUT_S
+        try:
+            result = operation(self, *args, **kwargs)
+        finally:
+            self._operation_deadline = None
+        
+        if self.last_timed_out and not result[0]:
+            result = result[:-1] + (f"Reader timeout - {result[-1]}",)
+        return result
+    return wrapper
+
+
+class CardInfo(NamedTuple):
+    """Identity of the card on the reader, read once per card handle"""
+    uid: str
+    atr: str
+    card_type: str
+
+
+class CardSession:
+    """
+    Persistent PC/SC session for one reader
+    
+    Holds a single resource manager context for status queries and a single
+    card handle for APDUs. Presence is checked with SCardGetStatusChange,
+    which does not touch the card, and the card handle is only re-created
+    when the reader reports a different card.
+    """
+    
+    def __init__(self, reader):
+        self.reader = reader
+        self.reader_name = str(reader)
+        self.connection = None
+        self.connecting = None  # Handle whose connect() is in progress (see cancel)
+        self.logger = logging.getLogger(__name__)
+        
+        self._context = None
+        self._card_id = None       # (event counter, ATR) of card on reader
+        self._connected_id = None  # card_id the open handle belongs to
+        self._last_state = None     # Last reader state (None = unaware)
+    
+    def _get_context(self):
+        """Establish the status context on first use"""
+        if self._context is None:
+            scard = _scard()
+            hresult, hcontext = scard.SCardEstablishContext(scard.SCARD_SCOPE_USER)
+            if hresult != scard.SCARD_S_SUCCESS:
+                raise _connection_error(
+                    f"Failed to establish context: {scard.SCardGetErrorMessage(hresult)}"
+                )
+            self._context = hcontext
+        return self._context
+    
+    def _release_context(self):
+        """Release the status context (re-established on next query)"""
+        if self._context is not None:
+            try:
+                _scard().SCardReleaseContext(self._context)
+            except:
+                pass
+            self._context = None
+    
+    def query_status(self, timeout_ms: int = 0,
+                     current_state: Optional[int] = None) -> Optional[Tuple[int, List[int]]]:
+        """
+        Query the reader state without connecting to the card
+        
+        Args:
+            timeout_ms: Milliseconds to wait for a change from current_state
+            current_state: Last known reader state (None returns at once)
+            
+        Returns:
+            Optional[Tuple[int, List[int]]]: (Event state, ATR) or None on timeout
+        """
+        scard = _scard()
+        if current_state is None:
+            current_state = scard.SCARD_STATE_UNAWARE
+        
+        # Simulated readers (simulator.py) report their own state
+        get_status_change = getattr(self.reader, 'get_status_change', None)
+        if get_status_change is not None:
+            status = get_status_change(timeout_ms, current_state)
+            if status is None:
+                return None
+            event_state, atr = status
+        else:
+            hcontext = self._get_context()
+            hresult, states = scard.SCardGetStatusChange(
+                hcontext, timeout_ms, [(self.reader_name, current_state)]
+            )
+            
+            if hresult == scard.SCARD_E_TIMEOUT:
+                return None
+            if hresult != scard.SCARD_S_SUCCESS:
+                # Context may be stale (e.g. PC/SC service restarted)
+                self._release_context()
+                raise _connection_error(
+                    f"Failed to get reader status: {scard.SCardGetErrorMessage(hresult)}"
+                )
+            
+            _, event_state, atr = states[0]
+        
+        self._last_state = event_state & ~scard.SCARD_STATE_CHANGED
+        self._update_card_id(event_state, atr)
+        return event_state, list(atr)
+    
+    def wait_for_change(self, timeout_ms: int) -> bool:
+        """
+        Block until the reader state differs from the last query
+        
+        Args:
+            timeout_ms: Maximum milliseconds to block
+            
+        Returns:
+            bool: True if the state changed, False on timeout
+        """
+        return self.query_status(timeout_ms, self._last_state) is not None
+    
+    def _update_card_id(self, event_state: int, atr: List[int]):
+        """Track which card is on the reader and drop a stale handle"""
+        scard = _scard()
+        present = bool(event_state & scard.SCARD_STATE_PRESENT) and \
+            not (event_state & scard.SCARD_STATE_MUTE)
+        
+        if present:
+            # High word of the event state counts card insert/remove events
+            self._card_id = ((event_state >> 16) & 0xFFFF, tuple(atr))
+        else:
+            self._card_id = None
+        
+        if self.connection is not None and self._card_id != self._connected_id:
+            self.logger.debug("Card changed, dropping card handle")
+            self.invalidate()
+    
+    @property
+    def card_present(self) -> bool:
+        """Card presence as of the last status query"""
+        return self._card_id is not None
+    
+    @property
+    def card_id(self) -> Optional[Tuple[int, Tuple[int, ...]]]:
+        """Identity of the card on the reader as of the last status query"""
+        return self._card_id
+    
+    def is_card_present(self) -> bool:
+        """
+        Cheap presence check through the status context
+        
+        Returns:
+            bool: True if a card is present, False otherwise
+        """
+        self.query_status()
+        return self.card_present
+    
+    def connect(self):
+        """
+        Get a card handle for the card currently on the reader
+        
+        Reuses the open handle if the card has not changed since it was
+        created.
+        
+        Returns:
+            Card connection or None if no card is present
+        """
+        if not self.is_card_present():
+            return None
+        
+        if self.connection is not None:
+            return self.connection
+        
+        connection = self.reader.createConnection()
+        # Published before connecting so cancel() can close a hung connect
+        self.connecting = connection
+        try:
+            connection.connect()
+        finally:
+            self.connecting = None
+        
+        self.connection = connection
+        self._connected_id = self._card_id
+        self.logger.info(f"Card connected, ATR: {to_hex(connection.getATR())}")
+        return connection
+    
+    def invalidate(self):
+        """Drop the card handle (e.g. after a transmit error)"""
+        if self.connection is not None:
+            try:
+                self.connection.disconnect()
+            except:
+                pass
+            self.connection = None
+        self._connected_id = None
+    
+    def cancel(self):
+        """
+        Cancel blocking calls of this session from another thread
+        
+        Ends a status wait (SCardCancel on the status context) and closes
+        the handle of a connect in progress. pyscard only releases a handle
+        once SCardConnect has returned, so on real PC/SC a connect hung in
+        the service runs until the reader's own timeout (reader profile
+        FF 00 41); the late handle is then dropped by the caller.
+        """
+        if self._context is not None:
+            try:
+                _scard().SCardCancel(self._context)
+            except Exception as e:
+                self.logger.debug(f"SCardCancel failed: {e}")
+        
+        connecting = self.connecting
+        if connecting is not None:
+            try:
+                connecting.disconnect()
+            except Exception as e:
+                self.logger.debug(f"Closing pending card handle failed: {e}")
+    
+    def close(self):
+        """Release card handle and status context"""
+        self.invalidate()
+        self._release_context()
+        self._card_id = None
+        self._last_state = None
+
+
 class RFIDManager:
     """Manages RFID card operations for Kanban cards"""
     
-    def __init__(self):
+    def __init__(self, on_timeout: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_timeout: Called (from the watchdog thread) with a message
+                when a card transaction is cancelled for exceeding its
+                deadline
+        """
         self.reader = None
+        self.session: Optional[CardSession] = None
         self.connection = None
         self.logger = logging.getLogger(__name__)
+        
+        # Authentication cache: the key loaded into the reader (per reader
+        # session) and the sector authenticated on the current card handle
+        self._loaded_key: Optional[List[int]] = None
+        self._auth_sector: Optional[int] = None
+        self._auth_connection = None
+        
+        # Number of blocks the last write_kanban actually wrote
+        self.last_blocks_written = 0
+        
+        # Last write_kanban failed and could not restore the card
+        self.last_rollback_failed = False
+        
+        # Per-phase durations (ms) of the last Kanban operation
+        self.last_timings: Dict[str, float] = {}
+        
+        # APDU latencies, status words and counters for this reader
+        self.stats = ApduStats()
+        
+        # Reader to switch to at the next card wait (see request_reader)
+        self._pending_reader = None
+        
+        # Reader settings applied at connect (see apply_profile)
+        self.profile: Optional[ReaderProfile] = None
+        
+        # Watchdog bounding each APDU/connect (APDU_TIMEOUT_S) and each
+        # card operation (OPERATION_TIMEOUT_S, see _bounded)
+        self.on_timeout = on_timeout
+        self.last_timed_out = False
+        self._operation_deadline: Optional[float] = None
+        self._watchdog = TransactionWatchdog(self._watchdog_expired)
+        
+        # Serializes APDUs of the operation thread and the feedback thread
+        self._io_lock = threading.Lock()
+        
+        # LED/buzzer commands waiting to be sent (see feedback)
+        self.feedback_enabled = READER_FEEDBACK
+        self._feedback_queue: queue.Queue = queue.Queue()
+        self._feedback_thread: Optional[threading.Thread] = None
+        self._feedback_lock = threading.Lock()
+        
+        # UID/ATR/type of the card, read once per insertion (kept across
+        # handle resets, like the tag driver below)
+        self._card_info: Optional[CardInfo] = None
+        self._card_info_card_id = None
+        
+        # Block I/O driver for the card type, chosen from the ATR once per
+        # insertion (kept across handle resets, so what a driver learns
+        # about the card survives retries)
+        self._driver: Optional[TagDriver] = None
+        self._driver_card_id = None
+    
+    def _mark_phase(self, phase: str, start: float) -> float:
+        """
+        Record the duration of a phase in last_timings
+        
+        Args:
+            phase: Phase name ('read', 'write', 'verify')
+            start: perf_counter() value taken when the phase started
+            
+        Returns:
+            float: perf_counter() now, the start of the next phase
+        """
+        now = time.perf_counter()
+        self.last_timings[phase] = round((now - start) * 1000, 1)
+        return now
+    
+    @staticmethod
+    def sector_of(block: int) -> int:
+        """
+        Get the MIFARE Classic sector that holds a block
+        
+        Sectors 0-31 have 4 blocks; sectors 32-39 (4K cards) have 16 blocks.
+        """
+        if block < 128:
+            return block // 4
+        return 32 + (block - 128) // 16
+    
+    def invalidate_auth(self, key: bool = False):
+        """
+        Forget the authenticated sector (and optionally the loaded key)
+        
+        Args:
+            key: Also force the key to be loaded again
+        """
+        self._auth_sector = None
+        self._auth_connection = None
+        if key:
+            self._loaded_key = None
+    
+    def forget_card_info(self):
+        """Drop the cached card info and tag driver"""
+        self._card_info = None
+        self._card_info_card_id = None
+        self._driver = None
+        self._driver_card_id = None
+    
+    def tag_driver(self) -> Optional[TagDriver]:
+        """
+        Get the block I/O driver for the current card
+        
+        Chosen from the ATR (no APDU) the first time it is needed for a
+        card insertion, see tag_drivers.driver_for_atr.
+        
+        Returns:
+            Optional[TagDriver]: Driver or None if no card is connected
+        """
+        if self.connection is None:
+            return None
+        
+        card_id = self.session.card_id if self.session is not None else None
+        if self._driver is None or card_id is None or self._driver_card_id != card_id:
+            try:
+                atr = list(self.connection.getATR())
+            except Exception as e:
+                self.logger.debug(f"Error getting ATR: {e}")
+                atr = []
+            self._driver = driver_for_atr(self, atr)
+            self._driver_card_id = card_id
+            self.logger.info(f"Using {self._driver.name} driver")
+        
+        return self._driver
     
     def check_card_present(self) -> bool:
         """
@@ -32,43 +475,196 @@ class RFIDManager:
         Returns:
             bool: True if card is present, False otherwise
         """
-        if self.reader is None:
+        if self.session is None:
             return False
         
         try:
-            # Try to create a quick connection
-            temp_connection = self.reader.createConnection()
-            temp_connection.connect()
-            
-            # If we get here, card is present
-            temp_connection.disconnect()
-            return True
-            
-        except (NoCardException, CardConnectionException):
-            return False
+            return self.session.is_card_present()
         except Exception as e:
             self.logger.debug(f"Error checking card presence: {e}")
             return False
     
-    def get_card_uid(self) -> Optional[str]:
+    def select_card(self) -> bool:
         """
-        Get the UID of the current card
+        Attach to the card currently on the reader without waiting
         
         Returns:
-            Optional[str]: UID as hex string or None if not available
+            bool: True if a card handle is available, False otherwise
+        """
+        if self.session is None:
+            return False
+        
+        from smartcard.Exceptions import CardConnectionException, NoCardException
+        
+        previous = self.session.connection
+        self._watchdog.arm(APDU_TIMEOUT_S, "card connect")
+        try:
+            self.connection = self.session.connect()
+        except (NoCardException, CardConnectionException) as e:
+            self.logger.debug(f"Card connection error: {e}")
+            self.stats.count('connect_error')
+            self.session.invalidate()
+            self.connection = None
+        finally:
+            expired = self._watchdog.disarm()
+        
+        if expired:
+            # Connected too late: the watchdog already gave up on it
+            self.last_timed_out = True
+            self.session.invalidate()
+            self.connection = None
+        
+        if self.connection is not None and self.connection is not previous:
+            self.stats.count('card_connect')
+        
+        return self.connection is not None
+    
+    def _transmit(self, apdu: List[int]) -> Tuple[List[int], int, int]:
+        """
+        Send an APDU on the current card handle
+        
+        Drops the session handle if the transmit fails so the next
+        operation reconnects instead of reusing a dead handle. Each APDU
+        runs under the watchdog (APDU_TIMEOUT_S, capped by the operation
+        deadline); a transmit that overruns is cancelled and raises
+        TransactionTimeout.
+        """
+        timeout = APDU_TIMEOUT_S
+        if self._operation_deadline is not None:
+            timeout = min(timeout, self._operation_deadline - time.monotonic())
+            if timeout <= 0:
+                self.last_timed_out = True
+                raise TransactionTimeout(
+                    f"Operation did not complete within {OPERATION_TIMEOUT_S:g} s"
+                )
+        
+        start = time.perf_counter()
+        self._watchdog.arm(timeout, f"APDU '{command_name(apdu)}'")
+        try:
+            with self._io_lock:
+                data, sw1, sw2 = self.connection.transmit(apdu)
+        except Exception as e:
+            expired = self._watchdog.disarm()
+            self.stats.record(apdu, time.perf_counter() - start, error=e)
+            if self.session is not None:
+                self.session.invalidate()
+            self.connection = None
+            if expired:
+                self.last_timed_out = True
+                raise TransactionTimeout(
+                    f"Card did not answer '{command_name(apdu)}' within {timeout:.1f} s"
+                ) from e
+            raise
+        
+        if self._watchdog.disarm():
+            # Answered after the watchdog closed the handle: do not trust it
+            self.stats.record(apdu, time.perf_counter() - start, error=TransactionTimeout())
+            if self.session is not None:
+                self.session.invalidate()
+            self.connection = None
+            self.last_timed_out = True
+            raise TransactionTimeout(
+                f"Card did not answer '{command_name(apdu)}' within {timeout:.1f} s"
+            )
+        
+        self.stats.record(apdu, time.perf_counter() - start, sw1, sw2)
+        return data, sw1, sw2
+    
+    def _watchdog_expired(self, label: str):
+        """
+        Cancel a blocking call that overran its deadline (watchdog thread)
+        
+        Reports the timeout through on_timeout first, then cancels status
+        waits on the session context and closes the card handle (or the
+        one being connected) on a separate thread: on pcsc-lite closing a
+        handle can wait for the very call that is stuck, and neither the
+        report nor the watchdog may wait with it. The operation thread
+        resets its state when the call returns.
+        """
+        self.stats.count('watchdog_timeout')
+        
+        if self.on_timeout is not None:
+            self.on_timeout(f"Reader {self.reader} not responding ({label}) - transaction cancelled")
+        
+        session = self.session
+        if session is not None:
+            threading.Thread(
+                target=self._cancel_session, args=(session,),
+                name="WatchdogCancel", daemon=True
+            ).start()
+    
+    def _cancel_session(self, session: 'CardSession'):
+        """Cancel the blocking calls of a session (see _watchdog_expired)"""
+        session.cancel()
+        connection = session.connection
+        if connection is not None:
+            try:
+                connection.disconnect()
+            except Exception as e:
+                self.logger.debug(f"Closing card handle failed: {e}")
+    
+    def get_card_info(self) -> Optional[CardInfo]:
+        """
+        Get the UID, ATR and type of the current card
+        
+        Read once per card insertion (CardSession.card_id, like the tag
+        driver) and then served from cache, so the status bar, the
+        operation, retries on a new handle and the audit journal share one
+        get UID APDU until the card is removed or replaced.
+        
+        Returns:
+            Optional[CardInfo]: Card info or None if not available
         """
         if self.connection is None:
             return None
         
+        card_id = self.session.card_id if self.session is not None else None
+        if self._card_info is not None and card_id is not None \
+                and self._card_info_card_id == card_id:
+            self.stats.count('card_info_cache_hit')
+            return self._card_info
+        
+        connection = self.connection
+        uid = self._read_uid()
+        if uid is None:
+            return None
+        
+        try:
+            atr = list(connection.getATR())
+        except Exception as e:
+            self.logger.debug(f"Error getting ATR: {e}")
+            atr = []
+        
+        self._card_info = CardInfo(uid, to_hex(atr), card_type_from_atr(atr))
+        self._card_info_card_id = card_id
+        return self._card_info
+    
+    def get_card_uid(self) -> Optional[str]:
+        """
+        Get the UID of the current card (cached per card, see get_card_info)
+        
+        Returns:
+            Optional[str]: UID as hex string or None if not available
+        """
+        info = self.get_card_info()
+        return info.uid if info is not None else None
+    
+    def _read_uid(self) -> Optional[str]:
+        """
+        Read the UID from the card
+        
+        Returns:
+            Optional[str]: UID as hex string or None if not available
+        """
         try:
             # Get UID using APDU command
             # FF CA 00 00 00 - Get Data command for UID
             get_uid_cmd = [0xFF, 0xCA, 0x00, 0x00, 0x00]
-            data, sw1, sw2 = self.connection.transmit(get_uid_cmd)
+            data, sw1, sw2 = self._transmit(get_uid_cmd)
             
             if sw1 == 0x90 and sw2 == 0x00:
                 # Convert UID bytes to hex string
-                uid_hex = toHexString(data)
+                uid_hex = to_hex(data)
                 return uid_hex
             else:
                 self.logger.debug(f"Failed to get UID: {sw1:02X} {sw2:02X}")
@@ -77,121 +673,247 @@ class RFIDManager:
         except Exception as e:
             self.logger.debug(f"Error getting UID: {e}")
             return None
-        
-    def connect_reader(self) -> Tuple[bool, str]:
+    
+    def connect_reader(self, reader=None) -> Tuple[bool, str]:
         """
         Connect to ACR122U RFID reader
         
+        Args:
+            reader: Specific reader to bind to (default: first ACR122U)
+            
         Returns:
             Tuple[bool, str]: (Success status, Message)
         """
         try:
-            # Get list of available readers
-            reader_list = readers()
+            if reader is None:
+                reader_list = find_readers()
+                
+                if len(reader_list) == 0:
+                    return False, "No RFID readers found. Please connect ACR122U."
+                
+                reader = reader_list[0]
             
-            if len(reader_list) == 0:
-                return False, "No RFID readers found. Please connect ACR122U."
+            if self.session is not None:
+                self.session.close()
+            self.connection = None
             
-            # Find ACR122U reader
-            acr122_reader = None
-            for r in reader_list:
-                if READER_NAME_FILTER.lower() in str(r).lower():
-                    acr122_reader = r
-                    break
+            self.reader = reader
+            self.session = CardSession(reader)
+            self.invalidate_auth(key=True)
+            self.forget_card_info()
+            self.logger.info(f"Connected to reader: {self.reader}")
             
-            if acr122_reader is None:
-                # Use first available reader as fallback
-                acr122_reader = reader_list[0]
-                self.logger.warning(f"ACR122U not found, using: {acr122_reader}")
+            # Station settings for this reader; the reader works with its
+            # current settings if they cannot be applied
+            self.profile = None
+            profile = profile_for_reader(str(reader))
+            if profile is not None:
+                success, msg = self.apply_profile(profile)
+                if not success:
+                    self.logger.warning(msg)
+                    return True, f"Reader connected: {self.reader} ({msg})"
+                return True, f"Reader connected: {self.reader} (profile '{profile.name}')"
             
-            self.reader = acr122_reader
-            self.logger.info(f"Connected to reader: {self.reader}")
             return True, f"Reader connected: {self.reader}"
             
         except Exception as e:
             self.logger.error(f"Failed to connect reader: {e}")
             return False, f"Failed to connect reader: {str(e)}"
     
-    def wait_for_card(self, timeout: int = READER_TIMEOUT) -> Tuple[bool, str]:
+    def apply_profile(self, profile: ReaderProfile) -> Tuple[bool, str]:
         """
-        Wait for a card to be placed on the reader
+        Apply reader settings (PICC polling, detect buzzer, timeout)
+        
+        The pseudo-APDUs go to the reader itself through a direct
+        connection and the CCID escape control code, so no card is needed.
+        On Linux the CCID driver must allow escape commands
+        (ifdDriverOptions 0x0001 in Info.plist).
         
         Args:
-            timeout: Maximum seconds to wait for card
+            profile: Settings to apply
             
         Returns:
             Tuple[bool, str]: (Success status, Message)
         """
         if self.reader is None:
-            return False, "Reader not connected"
+            return False, "No reader connected"
         
-        # Close any existing connection first
-        if self.connection is not None:
+        scard = _scard()
+        connection = self.reader.createConnection()
+        
+        try:
+            connection.connect(mode=scard.SCARD_SHARE_DIRECT)
+            
+            for command in profile_commands(profile):
+                response = connection.control(scard.SCARD_CTL_CODE(IOCTL_CCID_ESCAPE), command)
+                if not response or response[0] != 0x90:
+                    return False, f"Reader rejected profile '{profile.name}': {to_hex(command)} -> {to_hex(response)}"
+            
+            self.profile = profile
+            self.logger.info(f"Reader profile '{profile.name}' applied")
+            return True, f"Profile '{profile.name}' applied"
+            
+        except Exception as e:
+            return False, f"Cannot apply reader profile '{profile.name}': {e}"
+        finally:
             try:
-                self.connection.disconnect()
+                connection.disconnect()
             except:
                 pass
-            self.connection = None
+    
+    def request_reader(self, reader):
+        """
+        Ask for a switch to another reader (thread-safe)
         
-        try:
-            # Try to connect to card
-            start_time = time.time()
+        The switch happens on the thread that owns this manager, at its
+        next card wait or apply_pending_reader() call, so an operation in
+        progress (e.g. a batch) carries on with the new reader.
+        
+        Args:
+            reader: Reader to bind to
+        """
+        self._pending_reader = reader
+    
+    def apply_pending_reader(self) -> bool:
+        """
+        Bind to the reader requested with request_reader(), if any
+        
+        Returns:
+            bool: True if the manager switched readers
+        """
+        reader = self._pending_reader
+        if reader is None:
+            return False
+        
+        self._pending_reader = None
+        success, msg = self.connect_reader(reader)
+        return success
+    
+    def wait_for_card(self, timeout: int = READER_TIMEOUT,
+                      cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+        """
+        Wait for a card to be placed on the reader
+        
+        Blocks on reader status changes rather than polling, so the card
+        is picked up as soon as the reader reports it. If the reader
+        becomes unavailable (unplugged, PC/SC service restarted) the wait
+        retries with backoff until the timeout, so callers that loop on it
+        do not spin.
+        
+        Args:
+            timeout: Maximum seconds to wait for card
+            cancelled: Optional callable checked while waiting; returning
+                True aborts the wait
+                
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        self.apply_pending_reader()
+        if self.session is None:
+            return False, "Reader not connected"
+        
+        deadline = time.time() + timeout
+        reader_error: Optional[str] = None  # Set while the reader is unavailable
+        backoff_s = CARD_WAIT_SLICE_MS / 1000
+        
+        while True:
+            if cancelled is not None and cancelled():
+                return False, "Cancelled"
             
-            while time.time() - start_time < timeout:
-                try:
-                    # Create new connection
-                    self.connection = self.reader.createConnection()
-                    self.connection.connect()
-                    
-                    # Get card ATR (Answer To Reset)
-                    atr = self.connection.getATR()
-                    self.logger.info(f"Card detected, ATR: {toHexString(atr)}")
+            try:
+                # Picks up a reader plugged back in during the wait
+                self.apply_pending_reader()
+                if self.session is None:
+                    raise _connection_error("Reader not connected")
+                
+                # Reuses the open card handle if the card has not changed
+                if self.select_card():
                     return True, "Card detected"
-                    
-                except NoCardException:
-                    # No card present, clean up and retry
-                    if self.connection is not None:
-                        try:
-                            self.connection.disconnect()
-                        except:
-                            pass
-                        self.connection = None
-                    time.sleep(0.3)  # Wait before retry
-                    continue
-                    
-                except CardConnectionException as e:
-                    # Connection error, clean up and retry
-                    self.logger.debug(f"Card connection error: {e}")
-                    if self.connection is not None:
-                        try:
-                            self.connection.disconnect()
-                        except:
-                            pass
-                        self.connection = None
-                    time.sleep(0.3)
-                    continue
-                    
-                except Exception as e:
-                    self.logger.error(f"Error connecting to card: {e}")
-                    if self.connection is not None:
-                        try:
-                            self.connection.disconnect()
-                        except:
-                            pass
-                        self.connection = None
-                    time.sleep(0.3)
-                    continue
+                
+                remaining_ms = int((deadline - time.time()) * 1000)
+                if remaining_ms <= 0:
+                    return False, "Timeout waiting for card"
+                
+                # A present card that failed to connect will not produce
+                # another status change, so retry it after a short slice
+                if cancelled is not None or self.session.card_present:
+                    remaining_ms = min(remaining_ms, CARD_WAIT_SLICE_MS)
+                self.session.wait_for_change(remaining_ms)
+                
+                reader_error = None
+                backoff_s = CARD_WAIT_SLICE_MS / 1000
+                
+            except Exception as e:
+                # Unplugged reader or PC/SC service restart: keep waiting
+                # for it (with backoff) rather than failing at once
+                if reader_error is None:
+                    self.logger.warning(f"Reader unavailable, waiting: {e}")
+                reader_error = str(e)
+                
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False, f"Reader unavailable: {reader_error}"
+                
+                pause = min(backoff_s, remaining)
+                while pause > 0:
+                    if cancelled is not None and cancelled():
+                        return False, "Cancelled"
+                    step = min(pause, CARD_WAIT_SLICE_MS / 1000)
+                    time.sleep(step)
+                    pause -= step
+                backoff_s = min(backoff_s * 2, READER_ERROR_BACKOFF_MAX_S)
+    
+    def wait_for_removal(self, timeout: Optional[float] = None,
+                         cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Wait until the card is taken off the reader
+        
+        Blocks on reader status changes, like wait_for_card. A card
+        swapped faster than one status query counts as removed.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits until removed)
+            cancelled: Optional callable checked while waiting; returning
+                True aborts the wait
+                
+        Returns:
+            bool: True if no card is present, False on timeout/cancel/error
+        """
+        if self.session is None:
+            return False
+        
+        try:
+            deadline = None if timeout is None else time.time() + timeout
             
-            return False, "Timeout waiting for card"
+            self.session.query_status()
+            card_id = self.session.card_id
+            
+            while self.session.card_present and self.session.card_id == card_id:
+                if cancelled is not None and cancelled():
+                    return False
+                
+                wait_ms = CARD_WAIT_SLICE_MS if cancelled is not None else 60000
+                if deadline is not None:
+                    remaining_ms = int((deadline - time.time()) * 1000)
+                    if remaining_ms <= 0:
+                        return False
+                    wait_ms = min(wait_ms, remaining_ms)
+                self.session.wait_for_change(wait_ms)
+            
+            return True
             
         except Exception as e:
-            self.logger.error(f"Error in wait_for_card: {e}")
-            return False, f"Error: {str(e)}"
+            self.logger.error(f"Error in wait_for_removal: {e}")
+            return False
     
     def authenticate_block(self, block: int, key: List[int] = None) -> Tuple[bool, str]:
         """
         Authenticate a block using Key A
         
+        The key is loaded once per reader session and each sector is
+        authenticated once per card handle; later blocks in the same sector
+        reuse the cached authentication.
+        
         Args:
             block: Block number to authenticate
             key: 6-byte authentication key (default: DEFAULT_KEY_A)
@@ -205,28 +927,46 @@ class RFIDManager:
         if key is None:
             key = DEFAULT_KEY_A
         
+        sector = self.sector_of(block)
+        
+        # Sector already authenticated on this card handle with this key
+        # (the handle is replaced whenever the card changes)
+        if (self._auth_connection is self.connection and
+                self._auth_sector == sector and self._loaded_key == list(key)):
+            self.logger.debug(f"Block {block} uses cached sector {sector} authentication")
+            self.stats.count('auth_cache_hit')
+            return True, f"Block {block} authenticated"
+        
         try:
-            # Load authentication key into reader
-            # Command: Load Key (FF 82 00 00 06 + 6 key bytes)
-            load_key = [0xFF, 0x82, 0x00, 0x00, 0x06] + key
-            data, sw1, sw2 = self.connection.transmit(load_key)
-            
-            if sw1 != 0x90 or sw2 != 0x00:
-                return False, f"Failed to load key: {sw1:02X} {sw2:02X}"
+            if self._loaded_key != list(key):
+                # Load authentication key into reader
+                # Command: Load Key (FF 82 00 00 06 + 6 key bytes)
+                load_key = [0xFF, 0x82, 0x00, 0x00, 0x06] + list(key)
+                data, sw1, sw2 = self._transmit(load_key)
+                
+                if sw1 != 0x90 or sw2 != 0x00:
+                    self.invalidate_auth(key=True)
+                    return False, f"Failed to load key: {sw1:02X} {sw2:02X}"
+                
+                self._loaded_key = list(key)
             
             # Authenticate block
             # Command: Authenticate (FF 86 00 00 05 01 00 + block + 60 + key_number)
             # 60 = Key A, 61 = Key B
             auth_cmd = [0xFF, 0x86, 0x00, 0x00, 0x05, 0x01, 0x00, block, 0x60, 0x00]
-            data, sw1, sw2 = self.connection.transmit(auth_cmd)
+            data, sw1, sw2 = self._transmit(auth_cmd)
             
             if sw1 != 0x90 or sw2 != 0x00:
+                self.invalidate_auth(key=True)
                 return False, f"Authentication failed: {sw1:02X} {sw2:02X}"
             
+            self._auth_sector = sector
+            self._auth_connection = self.connection
             self.logger.info(f"Block {block} authenticated successfully")
             return True, f"Block {block} authenticated"
             
         except Exception as e:
+            self.invalidate_auth(key=True)
             self.logger.error(f"Error authenticating block {block}: {e}")
             return False, f"Authentication error: {str(e)}"
     
@@ -252,12 +992,14 @@ class RFIDManager:
             # Read binary block
             # Command: Read Binary (FF B0 00 + block + 10)
             read_cmd = [0xFF, 0xB0, 0x00, block, BLOCK_SIZE]
-            data, sw1, sw2 = self.connection.transmit(read_cmd)
+            data, sw1, sw2 = self._transmit(read_cmd)
             
             if sw1 != 0x90 or sw2 != 0x00:
+                # A failed command drops the card's authenticated state
+                self.invalidate_auth()
                 return False, None, f"Read failed: {sw1:02X} {sw2:02X}"
             
-            self.logger.info(f"Block {block} read: {toHexString(data)}")
+            self.logger.info(f"Block {block} read: {to_hex(data)}")
             return True, bytes(data), f"Block {block} read successfully"
             
         except Exception as e:
@@ -290,29 +1032,214 @@ class RFIDManager:
             # Update binary block
             # Command: Update Binary (FF D6 00 + block + 10 + 16 data bytes)
             write_cmd = [0xFF, 0xD6, 0x00, block, BLOCK_SIZE] + list(data)
-            response, sw1, sw2 = self.connection.transmit(write_cmd)
+            response, sw1, sw2 = self._transmit(write_cmd)
             
             if sw1 != 0x90 or sw2 != 0x00:
+                # A failed command drops the card's authenticated state
+                self.invalidate_auth()
                 return False, f"Write failed: {sw1:02X} {sw2:02X}"
             
-            self.logger.info(f"Block {block} written: {toHexString(list(data))}")
+            self.logger.info(f"Block {block} written: {to_hex(list(data))}")
             return True, f"Block {block} written successfully"
             
         except Exception as e:
             self.logger.error(f"Error writing block {block}: {e}")
             return False, f"Write error: {str(e)}"
     
-    def write_kanban(self, thread1: str, thread2: str) -> Tuple[bool, str]:
+    @staticmethod
+    def _block_label(block: int) -> str:
+        """Human-readable name of a block for error messages"""
+        return block_label(block)
+    
+    def read_blocks(self, blocks: List[int]) -> Tuple[bool, Optional[List[bytes]], str]:
+        """
+        Read several blocks in one pass
+        
+        Delegates to the card's tag driver: MIFARE Classic reads sector by
+        sector so each sector is authenticated once; NTAG21x reads every
+        block with one FAST_READ.
+        
+        Args:
+            blocks: Block numbers to read
+            
+        Returns:
+            Tuple[bool, Optional[List[bytes]], str]:
+                (Success status, Data in the order of blocks, Message)
+        """
+        if self.connection is None:
+            return False, None, "No card connected"
+        
+        return self.tag_driver().read_blocks(blocks)
+    
+    def write_blocks(self, blocks: Dict[int, bytes]) -> Tuple[bool, str]:
+        """
+        Write several blocks in one pass
+        
+        Delegates to the card's tag driver (see read_blocks).
+        
+        Args:
+            blocks: Mapping of block number to 16 bytes of data
+            
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        if self.connection is None:
+            return False, "No card connected"
+        
+        return self.tag_driver().write_blocks(blocks)
+    
+    def _reselect(self, uid: Optional[str], card_id) -> Optional[bool]:
+        """
+        Reset the card handle and re-select the same card
+        
+        Drops the handle and the authentication state (a failed command
+        can leave the card's crypto session broken), connects again and
+        checks that it is still the same card.
+        
+        Args:
+            uid: UID the card must have (None: the same insertion, by card_id)
+            card_id: CardSession.card_id of the card when the step started
+            
+        Returns:
+            Optional[bool]: True if the same card is selected again, False
+                if it was removed or another card is on the reader, None
+                if the card could not be identified (worth another try)
+        """
+        self.invalidate_auth()
+        if self.session is not None:
+            self.session.invalidate()
+        self.connection = None
+        
+        if not self.select_card():
+            return False
+        
+        if uid is not None:
+            current_uid = self.get_card_uid()
+            if current_uid is None:
+                # Get UID failed: not known to be another card
+                self.logger.debug("Card UID unreadable after reselect")
+                return None
+            same_card = current_uid == uid
+        else:
+            same_card = self.session.card_id == card_id
+        
+        if not same_card:
+            # Never continue (or roll back) an operation on another card
+            self.logger.warning("A different card is on the reader, not retrying")
+            self.session.invalidate()
+            self.connection = None
+        
+        return same_card
+    
+    def _retry(self, operation: Callable[[], tuple], uid: Optional[str] = None) -> tuple:
+        """
+        Run a card I/O step, retrying failures with exponential backoff
+        
+        Before each retry the card is re-selected (see _reselect); if it
+        has been swapped or removed the step is not retried, and if it
+        cannot be identified the retry waits for the next reselect.
+        Retries stop at the operation deadline (see _bounded).
+        
+        Args:
+            operation: Step returning a tuple whose first item is success
+                and last item is the message
+            uid: UID of the card the step must run on
+            
+        Returns:
+            tuple: Result of the last attempt
+        """
+        card_id = self.session.card_id if self.session is not None else None
+        delay = IO_RETRY_BACKOFF_S
+        
+        result = operation()
+        for attempt in range(1, IO_RETRIES + 1):
+            if result[0]:
+                return result
+            
+            if self._operation_deadline is not None \
+                    and time.monotonic() + delay >= self._operation_deadline:
+                # Out of time: report now rather than overrun the operation
+                return result
+            
+            self.stats.count('retry')
+            self.logger.warning(
+                f"Card I/O failed ({result[-1]}), retry {attempt}/{IO_RETRIES} "
+                f"in {delay * 1000:.0f} ms"
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, IO_RETRY_BACKOFF_MAX_S)
+            
+            reselected = self._reselect(uid, card_id)
+            if reselected is False:
+                return result
+            if reselected:
+                result = operation()
+        
+        return result
+    
+    def _uid_step(self) -> Tuple[bool, Optional[str], str]:
+        """get_card_uid() as a _retry step: (Success status, UID, Message)"""
+        uid = self.get_card_uid()
+        if uid is None:
+            return False, None, "Could not read card UID"
+        return True, uid, "Card UID read"
+    
+    def _write_verified(self, expected: Dict[int, bytes]) -> Tuple[bool, str]:
+        """
+        Write blocks and read them back
+        
+        Args:
+            expected: Block number -> 16 bytes to write
+            
+        Returns:
+            Tuple[bool, str]: (All blocks written and verified, Message)
+        """
+        start = time.perf_counter()
+        success, msg = self.write_blocks(expected)
+        start = self._mark_phase('write', start)
+        if not success:
+            return False, f"Failed to write {msg}"
+        
+        # Verify written data (raw block compare, same sector auth)
+        blocks = list(expected)
+        success, data, msg = self.read_blocks(blocks)
+        self._mark_phase('verify', start)
+        if not success:
+            return False, f"Verification failed: Could not read card for verification: {msg}"
+        
+        for block, actual in zip(blocks, data):
+            if actual != expected[block]:
+                return False, (
+                    f"Verification failed: {self._block_label(block)} mismatch: "
+                    f"expected '{self._decode(expected[block])}', got '{self._decode(actual)}'"
+                )
+        
+        return True, "Blocks written and verified"
+    
+    @_bounded
+    def write_kanban(self, thread1: str, thread2: str,
+                     skip_identical: bool = False) -> Tuple[bool, str]:
         """
         Write thread codes to Kanban card
         
+        The write is atomic from the caller's view: failed steps are
+        retried (see _retry), and if the new codes still cannot be
+        written and verified, the previous block contents are restored
+        (under its own ROLLBACK_TIMEOUT_S deadline).
+        
         Args:
             thread1: Thread 1 code (max 16 characters)
             thread2: Thread 2 code (max 16 characters)
-            
+            skip_identical: Only write (and verify) blocks whose contents
+                differ from what the card already holds
+                
         Returns:
             Tuple[bool, str]: (Success status, Message)
         """
+        self.last_blocks_written = 0
+        self.last_rollback_failed = False
+        self.last_timings = {}
+        
         if self.connection is None:
             return False, "No card connected"
         
@@ -324,30 +1251,71 @@ class RFIDManager:
         
         try:
             # Convert strings to bytes and pad with zeros
-            thread1_bytes = thread1.encode('ascii').ljust(BLOCK_SIZE, b'\x00')
-            thread2_bytes = thread2.encode('ascii').ljust(BLOCK_SIZE, b'\x00')
+            expected = {
+                BLOCK_THREAD1: thread1.encode('ascii').ljust(BLOCK_SIZE, b'\x00'),
+                BLOCK_THREAD2: thread2.encode('ascii').ljust(BLOCK_SIZE, b'\x00'),
+            }
             
-            # Write Thread 1 to Block 4
-            success, msg = self.write_block(BLOCK_THREAD1, thread1_bytes)
+            # Retries and rollback must only ever touch this card
+            success, uid, msg = self._retry(self._uid_step)
             if not success:
-                return False, f"Failed to write Thread 1: {msg}"
+                return False, msg
             
-            # Write Thread 2 to Block 5
-            success, msg = self.write_block(BLOCK_THREAD2, thread2_bytes)
+            # Previous contents: to skip unchanged blocks and to roll back
+            start = time.perf_counter()
+            blocks = list(expected)
+            success, current, msg = self._retry(lambda: self.read_blocks(blocks), uid)
+            self._mark_phase('read', start)
             if not success:
-                return False, f"Failed to write Thread 2: {msg}"
+                return False, f"Failed to read {msg}"
+            previous = dict(zip(blocks, current))
             
-            # Verify written data
-            success, msg = self.verify_data(thread1, thread2)
-            if not success:
-                return False, f"Verification failed: {msg}"
+            if skip_identical:
+                # Read-compare-write: leave blocks that already match alone
+                expected = {
+                    block: data for block, data in expected.items()
+                    if previous[block] != data
+                }
+                if not expected:
+                    return True, "Kanban card already up to date (write skipped)"
+            
+            # Write Thread 1 to Block 4 and Thread 2 to Block 5
+            success, msg = self._retry(lambda: self._write_verified(expected), uid)
+            if success:
+                self.last_blocks_written = len(expected)
+                return True, "Kanban card written and verified successfully"
+            
+            # Could not complete: put back what the card held before. Blocks
+            # the write would not change need no restore (each extra write
+            # is one more chance for the rollback to fail)
+            rollback = {
+                block: previous[block] for block in expected
+                if previous[block] != expected[block]
+            }
+            if not rollback:
+                return False, f"{msg} (card contents unchanged)"
             
-            return True, "Kanban card written and verified successfully"
+            # A write that ran out of time would leave none for the restore
+            if self._operation_deadline is not None:
+                self._operation_deadline = time.monotonic() + ROLLBACK_TIMEOUT_S
+            restored, _ = self._retry(lambda: self._write_verified(rollback), uid)
+            if restored:
+                return False, f"{msg} (card restored to previous contents)"
+            
+            self.logger.error(f"Rollback failed on card {uid}")
+            self.last_rollback_failed = True
+            return False, f"{msg} (ROLLBACK FAILED - card may be partially written)"
             
         except Exception as e:
             self.logger.error(f"Error writing Kanban: {e}")
             return False, f"Write error: {str(e)}"
     
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        """Convert block bytes to a thread code (strip null padding)"""
+        return data.decode('ascii', errors='ignore').rstrip('\x00')
+    
+    @_bounded
     def read_kanban(self) -> Tuple[bool, Optional[str], Optional[str], str]:
         """
         Read thread codes from Kanban card
@@ -356,23 +1324,23 @@ class RFIDManager:
             Tuple[bool, Optional[str], Optional[str], str]: 
                 (Success status, Thread1, Thread2, Message)
         """
+        self.last_timings = {}
+        
         if self.connection is None:
             return False, None, None, "No card connected"
         
         try:
-            # Read Thread 1 from Block 4
-            success, data1, msg = self.read_block(BLOCK_THREAD1)
+            # Read Thread 1 from Block 4 and Thread 2 from Block 5
+            start = time.perf_counter()
+            success, data, msg = self._retry(
+                lambda: self.read_blocks([BLOCK_THREAD1, BLOCK_THREAD2])
+            )
+            self._mark_phase('read', start)
             if not success:
-                return False, None, None, f"Failed to read Thread 1: {msg}"
+                return False, None, None, f"Failed to read {msg}"
             
-            # Read Thread 2 from Block 5
-            success, data2, msg = self.read_block(BLOCK_THREAD2)
-            if not success:
-                return False, None, None, f"Failed to read Thread 2: {msg}"
-            
-            # Convert bytes to strings (strip null padding)
-            thread1 = data1.decode('ascii', errors='ignore').rstrip('\x00')
-            thread2 = data2.decode('ascii', errors='ignore').rstrip('\x00')
+            thread1 = self._decode(data[0])
+            thread2 = self._decode(data[1])
             
             return True, thread1, thread2, "Kanban card read successfully"
             
@@ -413,6 +1381,7 @@ class RFIDManager:
         """
         return self.write_kanban(BYPASS_KEYWORD, "")
     
+    @_bounded
     def clear_card(self) -> Tuple[bool, str]:
         """
         Clear Kanban data from card (write zeros)
@@ -420,17 +1389,20 @@ class RFIDManager:
         Returns:
             Tuple[bool, str]: (Success status, Message)
         """
+        self.last_timings = {}
+        
         try:
             # Write zeros to both blocks
             zero_data = b'\x00' * BLOCK_SIZE
             
-            success, msg = self.write_block(BLOCK_THREAD1, zero_data)
+            start = time.perf_counter()
+            success, msg = self._retry(lambda: self.write_blocks({
+                BLOCK_THREAD1: zero_data,
+                BLOCK_THREAD2: zero_data,
+            }))
+            self._mark_phase('write', start)
             if not success:
-                return False, f"Failed to clear Thread 1: {msg}"
-            
-            success, msg = self.write_block(BLOCK_THREAD2, zero_data)
-            if not success:
-                return False, f"Failed to clear Thread 2: {msg}"
+                return False, f"Failed to clear {msg}"
             
             return True, "Card cleared successfully"
             
@@ -438,14 +1410,121 @@ class RFIDManager:
             self.logger.error(f"Error clearing card: {e}")
             return False, f"Clear error: {str(e)}"
     
-    def disconnect(self):
-        """Disconnect from card (keep reader connected)"""
-        if self.connection is not None:
+    def feedback(self, pattern: str):
+        """
+        Blink the reader's LED and sound its buzzer for a result
+        
+        Fire-and-forget: the command is queued and sent by a background
+        thread, so the caller never waits for the blink sequence. It goes
+        through the card handle when there is one; otherwise (card pulled,
+        timeout, no card placed) through a direct reader connection and
+        the CCID escape, like apply_profile.
+        
+        Args:
+            pattern: 'success', 'failure' or 'bypass' (see FEEDBACK_PATTERNS)
+        """
+        if not self.feedback_enabled or self.reader is None:
+            return
+        
+        p2, t1, t2, repetitions, buzzer = FEEDBACK_PATTERNS[pattern]
+        apdu = [0xFF, 0x00, 0x40, p2, 0x04, t1, t2, repetitions, buzzer]
+        
+        # Also called from the GUI thread (an operation that raised)
+        with self._feedback_lock:
+            if self._feedback_thread is None:
+                self._feedback_thread = threading.Thread(
+                    target=self._feedback_loop, name="ReaderFeedback", daemon=True
+                )
+                self._feedback_thread.start()
+        
+        self._feedback_queue.put((self.connection, self.reader, apdu))
+    
+    def _feedback_loop(self):
+        """Send queued LED/buzzer commands until close()"""
+        while True:
+            item = self._feedback_queue.get()
+            if item is None:
+                return
+            
+            connection, reader, apdu = item
+            if connection is not None:
+                start = time.perf_counter()
+                try:
+                    with self._io_lock:
+                        data, sw1, sw2 = connection.transmit(apdu)
+                    self.stats.record(apdu, time.perf_counter() - start, sw1, sw2)
+                    continue
+                except Exception as e:
+                    # Card gone since the result: fall back to the reader itself
+                    self.stats.record(apdu, time.perf_counter() - start, error=e)
+            
+            start = time.perf_counter()
             try:
-                self.connection.disconnect()
+                response = self._reader_control(reader, apdu)
+            except Exception as e:
+                # The operation result stands, just no blink
+                self.stats.record(apdu, time.perf_counter() - start, error=e)
+                self.logger.debug(f"Reader feedback not sent: {e}")
+                continue
+            
+            sw1, sw2 = (response + [0x00, 0x00])[:2]
+            self.stats.record(apdu, time.perf_counter() - start, sw1, sw2)
+    
+    def _reader_control(self, reader, command: List[int]) -> List[int]:
+        """
+        Send a pseudo-APDU to the reader itself, without a card
+        
+        Opens a direct connection and sends the command with the CCID
+        escape control code (see apply_profile).
+        
+        Returns:
+            List[int]: Reader response (90 xx on success)
+        """
+        scard = _scard()
+        connection = reader.createConnection()
+        connection.connect(mode=scard.SCARD_SHARE_DIRECT)
+        try:
+            with self._io_lock:
+                return connection.control(scard.SCARD_CTL_CODE(IOCTL_CCID_ESCAPE), command)
+        finally:
+            try:
+                connection.disconnect()
             except:
                 pass
-            self.connection = None
+    
+    def get_stats(self) -> dict:
+        """
+        APDU statistics for this reader
         
-        # Keep self.reader connected for reuse
+        Returns:
+            dict: ApduStats snapshot plus the reader name
+        """
+        stats = self.stats.snapshot()
+        stats['reader'] = str(self.reader) if self.reader is not None else None
+        return stats
+    
+    def reset_stats(self):
+        """Clear the APDU statistics"""
+        self.stats.reset()
+    
+    def disconnect(self):
+        """Release the card for this operation (keep reader connected)"""
+        # The session keeps the card handle open until the card changes,
+        # so the next operation on the same card does not reconnect
+        self.connection = None
         self.logger.info("Disconnected from card")
+    
+    def close(self):
+        """Close the reader session and release all PC/SC handles"""
+        self._watchdog.close()
+        
+        if self._feedback_thread is not None:
+            self._feedback_queue.put(None)
+            self._feedback_thread = None
+        
+        self.connection = None
+        self.invalidate_auth(key=True)
+        self.forget_card_info()
+        if self.session is not None:
+            self.session.close()
+            self.session = None
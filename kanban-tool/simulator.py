@@ -0,0 +1,383 @@
+"""
+CWT Thread Verification System - Reader Simulator
+Simulated ACR122U reader, MIFARE Classic 1K and NTAG213 cards for testing without hardware
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from smartcard.Exceptions import CardConnectionException, NoCardException
+from smartcard.scard import (
+    SCARD_STATE_UNAWARE, SCARD_STATE_CHANGED, SCARD_STATE_EMPTY, SCARD_STATE_PRESENT,
+    SCARD_SHARE_DIRECT
+)
+
+from apdu_stats import command_name
+from config import BLOCK_SIZE, DEFAULT_KEY_A
+
+
+# ATR the ACR122U reports for a MIFARE Classic 1K card
+ATR_MIFARE_1K = [
+    0x3B, 0x8F, 0x80, 0x01, 0x80, 0x4F, 0x0C, 0xA0, 0x00, 0x00,
+    0x03, 0x06, 0x03, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x6A
+]
+
+# ATR the ACR122U reports for NTAG21x / MIFARE Ultralight cards
+ATR_ULTRALIGHT = [
+    0x3B, 0x8F, 0x80, 0x01, 0x80, 0x4F, 0x0C, 0xA0, 0x00, 0x00,
+    0x03, 0x06, 0x03, 0x00, 0x03, 0x00, 0x00, 0x00, 0x00, 0x68
+]
+
+class SimulatedCard:
+    """
+    MIFARE Classic 1K memory map (16 sectors x 4 blocks)
+    
+    Block 0 holds the UID and is read-only. The last block of each sector
+    is the trailer with key A (bytes 0-5) and key B (bytes 10-15).
+    """
+    
+    BLOCKS = 64
+    
+    def __init__(self, uid: List[int], key: List[int] = DEFAULT_KEY_A):
+        self.uid = list(uid)
+        self.atr = list(ATR_MIFARE_1K)
+        self.memory = [bytearray(BLOCK_SIZE) for _ in range(self.BLOCKS)]
+        
+        bcc = 0
+        for b in self.uid:
+            bcc ^= b
+        self.memory[0][:len(self.uid) + 1] = bytes(self.uid + [bcc])
+        
+        for trailer in range(3, self.BLOCKS, 4):
+            self.memory[trailer][:] = bytes(key) + bytes([0xFF, 0x07, 0x80, 0x69]) + bytes(key)
+    
+    @staticmethod
+    def sector_of(block: int) -> int:
+        """Sector containing a block"""
+        return block // 4
+    
+    def key_matches(self, block: int, key_type: int, key: List[int]) -> bool:
+        """Check a key against the trailer of the block's sector"""
+        trailer = self.memory[self.sector_of(block) * 4 + 3]
+        stored = trailer[0:6] if key_type == 0x60 else trailer[10:16]
+        return bytes(key) == bytes(stored)
+
+
+class SimulatedNtag:
+    """
+    NTAG213 memory map (45 pages of 4 bytes)
+    
+    Pages 0-3 hold the UID, lock bytes and capability container and are
+    read-only here; user memory is pages 4-39. No authentication.
+    """
+    
+    PAGES = 45
+    USER_PAGES = range(4, 40)
+    
+    def __init__(self, uid: List[int], fast_read: bool = True):
+        self.uid = list(uid)
+        self.atr = list(ATR_ULTRALIGHT)
+        self.fast_read = fast_read  # False: original Ultralight (no FAST_READ)
+        self.pages = [bytearray(4) for _ in range(self.PAGES)]
+        self.pages[0][:3] = bytes(self.uid[:3])
+        self.pages[1][:] = bytes((self.uid[3:] + [0, 0, 0, 0])[:4])
+        self.pages[3][:] = bytes([0xE1, 0x10, 0x12, 0x00])
+    
+    def read(self, start: int, end: int) -> Optional[List[int]]:
+        """Pages start..end as bytes, None if out of range"""
+        if start > end or end >= self.PAGES:
+            return None
+        return [b for page in self.pages[start:end + 1] for b in page]
+
+
+class SimulatedReader:
+    """
+    Simulated ACR122U
+    
+    Provides the pyscard reader surface used by CardSession
+    (createConnection) plus get_status_change(), which CardSession uses
+    instead of SCardGetStatusChange. Cards are placed and removed with
+    insert()/remove(). Every APDU sleeps latency_ms and is counted;
+    stall_next() makes the next APDU hang like a wedged reader.
+    
+    With poll_detection, a placed card is only reported after the reader's
+    next polling round, as set by the PICC operating parameter (FF 00 51):
+    a random delay up to the polling interval (250/500 ms) plus
+    POLL_TYPE_MS for each card type polled. Without auto polling or
+    ISO 14443A polling the card is never reported.
+    """
+    
+    POLL_TYPE_MS = 15  # Approximate cost of one card type in a polling round
+    
+    def __init__(self, name: str = "Simulated ACR122U PICC Interface 00",
+                 latency_ms: float = 0.0, poll_detection: bool = False):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.poll_detection = poll_detection
+        self.card: Optional[SimulatedCard] = None
+        
+        self.apdu_counts: Counter = Counter()  # APDU name -> count
+        self.keys = {}  # Key slot -> key (reader volatile memory, kept across cards)
+        
+        # Reader settings (FF 00 51 / 52 / 41), power-on values
+        self.picc_parameters = 0xFF
+        self.detect_buzzer = True
+        self.timeout = 0xFF
+        
+        self._stall_s = 0.0  # Hang of the next APDU (see stall_next)
+        self._events = 0  # Insert/remove counter (high word of the event state)
+        self._visible_at = 0.0  # monotonic() time the placed card is reported
+        self._cond = threading.Condition()
+    
+    def __str__(self):
+        return self.name
+    
+    def __repr__(self):
+        return self.name
+    
+    @property
+    def apdu_total(self) -> int:
+        """APDUs transmitted since the last reset_stats()"""
+        return sum(self.apdu_counts.values())
+    
+    def reset_stats(self):
+        """Reset the APDU counters"""
+        self.apdu_counts.clear()
+    
+    def detection_delay(self) -> Optional[float]:
+        """Seconds until a placed card is reported (None: never)"""
+        if not self.poll_detection:
+            return 0.0
+        if not (self.picc_parameters & 0x80) or not (self.picc_parameters & 0x01):
+            return None
+        
+        interval = 0.25 if self.picc_parameters & 0x20 else 0.5
+        types = bin(self.picc_parameters & 0x1F).count('1')
+        return random.uniform(0, interval) + types * self.POLL_TYPE_MS / 1000
+    
+    def stall_next(self, seconds: float):
+        """
+        Hang the next APDU or card connect for seconds, or until its card
+        handle is closed
+        
+        A closed handle makes the hung call fail, as a real reader does
+        when its handle is released from another thread.
+        """
+        self._stall_s = seconds
+    
+    def insert(self, card: SimulatedCard):
+        """Place a card on the reader"""
+        with self._cond:
+            delay = self.detection_delay()
+            self.card = card
+            self._visible_at = time.monotonic() + delay if delay is not None else float('inf')
+            self._events += 1
+            self._cond.notify_all()
+    
+    def remove(self):
+        """Take the card off the reader"""
+        with self._cond:
+            self.card = None
+            self._events += 1
+            self._cond.notify_all()
+    
+    def _detected(self) -> bool:
+        """A card is on the reader and the reader has polled it"""
+        return self.card is not None and time.monotonic() >= self._visible_at
+    
+    def _state(self) -> int:
+        """Current event state without the CHANGED flag"""
+        if self.card is not None and not self._detected():
+            # Not polled yet: still the state from before the insert
+            return (((self._events - 1) & 0xFFFF) << 16) | SCARD_STATE_EMPTY
+        present = SCARD_STATE_PRESENT if self.card is not None else SCARD_STATE_EMPTY
+        return ((self._events & 0xFFFF) << 16) | present
+    
+    def get_status_change(self, timeout_ms: int,
+                          current_state: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        SCardGetStatusChange for this reader
+        
+        Args:
+            timeout_ms: Milliseconds to wait for a change from current_state
+            current_state: Last known state (UNAWARE returns at once)
+            
+        Returns:
+            Optional[Tuple[int, List[int]]]: (Event state, ATR) or None on timeout
+        """
+        deadline = time.monotonic() + timeout_ms / 1000
+        
+        with self._cond:
+            while current_state != SCARD_STATE_UNAWARE and self._state() == current_state:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                if self.card is not None and not self._detected():
+                    remaining = min(remaining, self._visible_at - time.monotonic())
+                self._cond.wait(max(remaining, 0.001))
+            
+            state = self._state()
+            if state != current_state:
+                state |= SCARD_STATE_CHANGED
+            atr = list(self.card.atr) if self._detected() else []
+            return state, atr
+    
+    def createConnection(self) -> 'SimulatedConnection':
+        return SimulatedConnection(self)
+
+
+class SimulatedConnection:
+    """
+    Card handle on a SimulatedReader
+    
+    Emulates the ACR122U pseudo-APDUs used by RFIDManager: get UID,
+    load key, authenticate, read/update binary and the reader's own
+    FF 00 commands. Loaded keys stay in the reader; authentication state
+    is per handle and lost when the card leaves the field.
+    """
+    
+    def __init__(self, reader: SimulatedReader):
+        self.reader = reader
+        self.card: Optional[SimulatedCard] = None
+        self._auth_sector: Optional[int] = None
+        self._closed = threading.Event()
+    
+    def connect(self, protocol=None, mode=None, disposition=None):
+        if mode == SCARD_SHARE_DIRECT:
+            # Reader-only connection for control(); no card needed
+            return
+        
+        self._closed.clear()
+        stall, self.reader._stall_s = self.reader._stall_s, 0.0
+        if stall and self._closed.wait(stall):
+            raise CardConnectionException("Card handle closed during connect")
+        
+        card = self.reader.card
+        if card is None or not self.reader._detected():
+            raise NoCardException("No card on simulated reader", 0)
+        self.card = card
+        self._auth_sector = None
+    
+    def disconnect(self):
+        self.card = None
+        self._auth_sector = None
+        self._closed.set()
+    
+    def control(self, code: int, command: List[int]) -> List[int]:
+        """Reader escape command: PICC parameter, detect buzzer, timeout, LED/buzzer"""
+        if len(command) < 5 or command[:2] != [0xFF, 0x00]:
+            return [0x63, 0x00]
+        
+        ins, value = command[2], command[3]
+        self.reader.apdu_counts[f"control {ins:02X}"] += 1
+        if ins == 0x51:
+            self.reader.picc_parameters = value
+        elif ins == 0x52:
+            self.reader.detect_buzzer = value != 0x00
+        elif ins == 0x41:
+            self.reader.timeout = value
+        elif ins == 0x40:
+            return [0x90, value & 0x03]  # Final LED state
+        else:
+            return [0x63, 0x00]
+        return [0x90, value]
+    
+    def getATR(self) -> List[int]:
+        return list(self.card.atr) if self.card is not None else []
+    
+    def transmit(self, apdu: List[int]) -> Tuple[List[int], int, int]:
+        """Execute one pseudo-APDU, returning (data, SW1, SW2)"""
+        if self.card is None:
+            raise CardConnectionException("Card not connected")
+        if self.reader.card is not self.card:
+            # Card left the field: the handle is dead
+            raise CardConnectionException("Card was removed")
+        
+        if self.reader.latency_ms:
+            time.sleep(self.reader.latency_ms / 1000)
+        
+        stall, self.reader._stall_s = self.reader._stall_s, 0.0
+        if stall and self._closed.wait(stall):
+            raise CardConnectionException("Card handle closed during transmit")
+        
+        if len(apdu) < 4 or apdu[0] != 0xFF:
+            return [], 0x6E, 0x00  # Class not supported
+        
+        ins = apdu[1]
+        self.reader.apdu_counts[command_name(apdu)] += 1
+        
+        if ins == 0xCA:
+            return list(self.card.uid), 0x90, 0x00
+        
+        if isinstance(self.card, SimulatedNtag):
+            return self._transmit_ntag(apdu)
+        
+        if ins == 0x82:
+            slot = apdu[3]
+            self.reader.keys[slot] = list(apdu[5:11])
+            return [], 0x90, 0x00
+        
+        if ins == 0x86:
+            block, key_type, slot = apdu[7], apdu[8], apdu[9]
+            key = self.reader.keys.get(slot)
+            if block >= SimulatedCard.BLOCKS or key is None or \
+                    not self.card.key_matches(block, key_type, key):
+                self._auth_sector = None
+                return [], 0x63, 0x00
+            self._auth_sector = SimulatedCard.sector_of(block)
+            return [], 0x90, 0x00
+        
+        if ins in (0xB0, 0xD6):
+            block = apdu[3]
+            if block >= SimulatedCard.BLOCKS or \
+                    SimulatedCard.sector_of(block) != self._auth_sector:
+                return [], 0x63, 0x00
+            
+            if ins == 0xB0:
+                return list(self.card.memory[block]), 0x90, 0x00
+            
+            data = apdu[5:5 + apdu[4]]
+            if block == 0 or len(data) != BLOCK_SIZE:
+                return [], 0x63, 0x00  # Manufacturer block is read-only
+            self.card.memory[block][:] = bytes(data)
+            return [], 0x90, 0x00
+        
+        if ins == 0x00:
+            # Reader commands (LED/buzzer, PICC parameters, direct transmit)
+            return [], 0x90, 0x00
+        
+        return [], 0x6A, 0x81  # Function not supported
+    
+    def _transmit_ntag(self, apdu: List[int]) -> Tuple[List[int], int, int]:
+        """Pseudo-APDUs on an NTAG/Ultralight card (4-byte pages, no auth)"""
+        ins = apdu[1]
+        
+        if ins == 0xB0:
+            # Read Binary returns 4 pages from the start page
+            data = self.card.read(apdu[3], apdu[3] + 3)
+            return (data, 0x90, 0x00) if data is not None else ([], 0x63, 0x00)
+        
+        if ins == 0xD6:
+            page, data = apdu[3], apdu[5:5 + apdu[4]]
+            if page not in SimulatedNtag.USER_PAGES or len(data) != 4:
+                return [], 0x63, 0x00
+            self.card.pages[page][:] = bytes(data)
+            return [], 0x90, 0x00
+        
+        if ins == 0x00 and list(apdu[5:7]) == [0xD4, 0x42]:
+            # Direct transmit to the card through the PN532
+            command = apdu[7]
+            if command == 0x3A and self.card.fast_read:
+                data = self.card.read(apdu[8], apdu[9])
+                if data is not None:
+                    return [0xD5, 0x43, 0x00] + data, 0x90, 0x00
+            # NAK: the PN532 reports a timeout/protocol error
+            return [0xD5, 0x43, 0x01], 0x90, 0x00
+        
+        if ins == 0x00:
+            return [], 0x90, 0x00
+        
+        return [], 0x6A, 0x81
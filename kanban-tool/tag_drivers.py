@@ -0,0 +1,285 @@
+"""
+CWT Thread Verification System - Tag Drivers
+Card-type specific block I/O for Kanban cards (MIFARE Classic, NTAG21x/Ultralight)
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from config import (
+    BLOCK_THREAD1, BLOCK_THREAD2, BLOCK_SIZE,
+    NTAG_USER_PAGE, NTAG_PAGE_SIZE, NTAG_FAST_READ_MAX_PAGES
+)
+
+if TYPE_CHECKING:
+    from rfid_manager import RFIDManager
+
+
+# Card name bytes (13-14) of a PC/SC Part 3 contactless ATR
+CARD_NAMES = {
+    (0x00, 0x01): "MIFARE Classic 1K",
+    (0x00, 0x02): "MIFARE Classic 4K",
+    (0x00, 0x03): "MIFARE Ultralight",
+    (0x00, 0x26): "MIFARE Mini",
+    (0x00, 0x3A): "MIFARE Ultralight C",
+    (0xF0, 0x04): "Topaz/Jewel",
+    (0xF0, 0x11): "FeliCa 212K",
+    (0xF0, 0x12): "FeliCa 424K",
+}
+
+# Registered application provider ID (PC/SC Workgroup) in a contactless ATR
+PCSC_RID = [0xA0, 0x00, 0x00, 0x03, 0x06]
+
+# PN532 InCommunicateThru, sent through the ACR122U direct transmit (FF 00 00 00)
+PN532_COMMUNICATE_THRU = [0xD4, 0x42]
+PN532_COMMUNICATE_THRU_RESPONSE = [0xD5, 0x43, 0x00]
+
+# NTAG21x / Ultralight EV1 command: read pages start..end in one frame
+NTAG_FAST_READ = 0x3A
+
+
+def card_name(atr) -> Optional[Tuple[int, int]]:
+    """Card name bytes of a PC/SC contactless ATR, or None for other ATRs"""
+    atr = list(atr)
+    if len(atr) < 15 or atr[7:12] != PCSC_RID:
+        return None
+    return atr[13], atr[14]
+
+
+def card_type_from_atr(atr) -> str:
+    """
+    Name the card type from its ATR
+    
+    The ACR122U builds a PC/SC Part 3 ATR for contactless cards:
+    3B 8F 80 01 80 4F 0C A0 00 00 03 06 SS C0 C1 00 00 00 00 TCK, where
+    C0 C1 is the card name.
+    
+    Args:
+        atr: ATR bytes
+        
+    Returns:
+        str: Card type, or "Unknown" if the ATR is not a PC/SC contactless ATR
+    """
+    name = card_name(atr)
+    if name is None:
+        return "Unknown"
+    return CARD_NAMES.get(name, f"Unknown ({name[0]:02X} {name[1]:02X})")
+
+
+def block_label(block: int) -> str:
+    """Human-readable name of a Kanban block for error messages"""
+    if block == BLOCK_THREAD1:
+        return "Thread 1"
+    if block == BLOCK_THREAD2:
+        return "Thread 2"
+    return f"Block {block}"
+
+
+class TagDriver(ABC):
+    """
+    Block I/O for one card type
+    
+    Kanban data is addressed in 16-byte blocks (BLOCK_THREAD1/2)
+    whatever the card; a driver maps them onto the card's memory and
+    commands. A driver is created per card insertion by RFIDManager, so
+    it may keep per-card state. Subclasses must implement read_blocks and
+    write_blocks; a missing one fails when the driver is created.
+    """
+    
+    name = "Unknown"
+    
+    def __init__(self, rfid: 'RFIDManager'):
+        self.rfid = rfid
+        self.logger = logging.getLogger(__name__)
+    
+    @abstractmethod
+    def read_blocks(self, blocks: List[int]) -> Tuple[bool, Optional[List[bytes]], str]:
+        """
+        Read Kanban blocks
+        
+        Args:
+            blocks: Block numbers to read
+            
+        Returns:
+            Tuple[bool, Optional[List[bytes]], str]:
+                (Success status, Data in the order of blocks, Message)
+        """
+    
+    @abstractmethod
+    def write_blocks(self, blocks: Dict[int, bytes]) -> Tuple[bool, str]:
+        """
+        Write Kanban blocks
+        
+        Args:
+            blocks: Mapping of block number to 16 bytes of data
+            
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+
+
+class MifareClassicDriver(TagDriver):
+    """
+    MIFARE Classic 1K/4K (and Mini): Key A authentication per sector,
+    then Read/Update Binary on 16-byte blocks
+    """
+    
+    name = "MIFARE Classic"
+    
+    def _sector_order(self, blocks) -> List[int]:
+        """Blocks grouped by sector so each sector is authenticated once"""
+        return sorted(blocks, key=lambda b: (self.rfid.sector_of(b), b))
+    
+    def read_blocks(self, blocks: List[int]) -> Tuple[bool, Optional[List[bytes]], str]:
+        results = {}
+        for block in self._sector_order(blocks):
+            success, data, msg = self.rfid.read_block(block)
+            if not success:
+                return False, None, f"{block_label(block)}: {msg}"
+            results[block] = data
+        
+        return True, [results[block] for block in blocks], f"{len(blocks)} blocks read"
+    
+    def write_blocks(self, blocks: Dict[int, bytes]) -> Tuple[bool, str]:
+        for block in self._sector_order(blocks):
+            success, msg = self.rfid.write_block(block, blocks[block])
+            if not success:
+                return False, f"{block_label(block)}: {msg}"
+        
+        return True, f"{len(blocks)} blocks written"
+
+
+class UltralightDriver(TagDriver):
+    """
+    NTAG21x and MIFARE Ultralight: 4-byte pages, no authentication
+    
+    Kanban block BLOCK_THREAD1 starts at page NTAG_USER_PAGE and each block
+    takes 4 pages. Reads use FAST_READ, which returns every requested page
+    in one APDU; cards without FAST_READ (original Ultralight/Ultralight C)
+    fall back to Read Binary (4 pages per APDU). Writes are one page each.
+    """
+    
+    name = "NTAG21x/Ultralight"
+    
+    PAGES_PER_BLOCK = BLOCK_SIZE // NTAG_PAGE_SIZE
+    
+    def __init__(self, rfid: 'RFIDManager'):
+        super().__init__(rfid)
+        # Learned on the first read: None until tried
+        self.fast_read: Optional[bool] = None
+    
+    def first_page(self, block: int) -> int:
+        """First page of a Kanban block"""
+        if block < BLOCK_THREAD1:
+            raise ValueError(f"Block {block} is not mapped on NTAG/Ultralight cards")
+        return NTAG_USER_PAGE + (block - BLOCK_THREAD1) * self.PAGES_PER_BLOCK
+    
+    def _fast_read(self, start: int, end: int) -> Optional[bytes]:
+        """
+        Read pages start..end with FAST_READ
+        
+        Returns:
+            Optional[bytes]: Page data, or None if the card rejected the command
+        """
+        frame = PN532_COMMUNICATE_THRU + [NTAG_FAST_READ, start, end]
+        data, sw1, sw2 = self.rfid._transmit([0xFF, 0x00, 0x00, 0x00, len(frame)] + frame)
+        
+        expected = (end - start + 1) * NTAG_PAGE_SIZE
+        prefix = len(PN532_COMMUNICATE_THRU_RESPONSE)
+        if sw1 != 0x90 or sw2 != 0x00 or list(data[:prefix]) != PN532_COMMUNICATE_THRU_RESPONSE \
+                or len(data) != prefix + expected:
+            self.logger.debug(f"FAST_READ {start}-{end} not supported: {sw1:02X} {sw2:02X}")
+            return None
+        
+        return bytes(data[prefix:])
+    
+    def _read_block(self, block: int) -> Tuple[bool, Optional[bytes], str]:
+        """Read one block (4 pages) with Read Binary"""
+        read_cmd = [0xFF, 0xB0, 0x00, self.first_page(block), BLOCK_SIZE]
+        data, sw1, sw2 = self.rfid._transmit(read_cmd)
+        
+        if sw1 != 0x90 or sw2 != 0x00 or len(data) != BLOCK_SIZE:
+            return False, None, f"Read failed: {sw1:02X} {sw2:02X}"
+        return True, bytes(data), f"Block {block} read successfully"
+    
+    def read_blocks(self, blocks: List[int]) -> Tuple[bool, Optional[List[bytes]], str]:
+        try:
+            start = min(self.first_page(b) for b in blocks)
+            end = max(self.first_page(b) for b in blocks) + self.PAGES_PER_BLOCK - 1
+            
+            if self.fast_read is not False and end - start < NTAG_FAST_READ_MAX_PAGES:
+                pages = self._fast_read(start, end)
+                self.fast_read = pages is not None
+                if pages is not None:
+                    results = []
+                    for block in blocks:
+                        offset = (self.first_page(block) - start) * NTAG_PAGE_SIZE
+                        results.append(pages[offset:offset + BLOCK_SIZE])
+                    return True, results, f"{len(blocks)} blocks read"
+            
+            results = []
+            for block in blocks:
+                success, data, msg = self._read_block(block)
+                if not success:
+                    return False, None, f"{block_label(block)}: {msg}"
+                results.append(data)
+            return True, results, f"{len(blocks)} blocks read"
+            
+        except Exception as e:
+            self.logger.error(f"Error reading pages: {e}")
+            return False, None, f"Read error: {str(e)}"
+    
+    def write_blocks(self, blocks: Dict[int, bytes]) -> Tuple[bool, str]:
+        try:
+            for block in sorted(blocks):
+                data = blocks[block]
+                if len(data) != BLOCK_SIZE:
+                    return False, f"{block_label(block)}: Data must be exactly {BLOCK_SIZE} bytes"
+                
+                first = self.first_page(block)
+                for i in range(self.PAGES_PER_BLOCK):
+                    # Update Binary writes one page (4 bytes) on these cards
+                    page_data = list(data[i * NTAG_PAGE_SIZE:(i + 1) * NTAG_PAGE_SIZE])
+                    write_cmd = [0xFF, 0xD6, 0x00, first + i, NTAG_PAGE_SIZE] + page_data
+                    response, sw1, sw2 = self.rfid._transmit(write_cmd)
+                    
+                    if sw1 != 0x90 or sw2 != 0x00:
+                        return False, f"{block_label(block)}: Write failed at page {first + i}: {sw1:02X} {sw2:02X}"
+                
+                self.logger.info(f"Block {block} written to pages {first}-{first + self.PAGES_PER_BLOCK - 1}")
+            
+            return True, f"{len(blocks)} blocks written"
+            
+        except Exception as e:
+            self.logger.error(f"Error writing pages: {e}")
+            return False, f"Write error: {str(e)}"
+
+
+# Drivers by ATR card name; other cards are treated as MIFARE Classic
+DRIVERS = {
+    (0x00, 0x01): MifareClassicDriver,
+    (0x00, 0x02): MifareClassicDriver,
+    (0x00, 0x26): MifareClassicDriver,
+    (0x00, 0x03): UltralightDriver,
+    (0x00, 0x3A): UltralightDriver,
+}
+
+
+def driver_for_atr(rfid: 'RFIDManager', atr) -> TagDriver:
+    """
+    Create the driver for the card with this ATR
+    
+    NTAG21x cards report the Ultralight card name (00 03) through the
+    ACR122U. Unknown cards get the MIFARE Classic driver, which was the
+    only behaviour before drivers existed.
+    
+    Args:
+        rfid: Manager whose card handle the driver uses
+        atr: ATR of the card
+        
+    Returns:
+        TagDriver: Driver instance for this card
+    """
+    return DRIVERS.get(card_name(atr), MifareClassicDriver)(rfid)
+
@@ -0,0 +1,111 @@
+"""
+CWT Thread Verification System - Transaction Watchdog
+Deadlines for blocking PC/SC calls, cancelled from a monitor thread on expiry
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TransactionTimeout(Exception):
+    """A card transaction did not complete within its deadline"""
+    pass
+
+
+class TransactionWatchdog:
+    """
+    Deadline monitor for one reader's blocking calls
+    
+    The thread that owns the reader arms a deadline before each blocking
+    call (transmit, connect) and disarms it afterwards. If the deadline
+    passes first, on_expire is called from the watchdog thread so it can
+    report the timeout and cancel the call (SCardCancel, closing the card
+    handle); the owning thread learns about it from disarm().
+    
+    The report is on time, but ending the call is best effort. PC/SC
+    has no way to cancel SCardTransmit or SCardConnect (SCardCancel only
+    ends SCardGetStatusChange), and on pcsc-lite closing the handle may
+    wait for the stuck call itself. A call hung inside the PC/SC service
+    therefore keeps the owning thread blocked until the service or the
+    reader's contactless timeout (FF 00 41, see reader_profiles.py) ends it.
+    """
+    
+    def __init__(self, on_expire: Callable[[str], None]):
+        self.on_expire = on_expire
+        self.logger = logging.getLogger(__name__)
+        
+        self._cond = threading.Condition()
+        self._deadline: Optional[float] = None  # monotonic() expiry of the armed call
+        self._label = ""
+        self._expired = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def arm(self, seconds: float, label: str):
+        """
+        Start the deadline of a blocking call
+        
+        Args:
+            seconds: Time the call may take
+            label: What is being waited for (for messages)
+        """
+        with self._cond:
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(
+                    target=self._run, name="TransactionWatchdog", daemon=True
+                )
+                self._thread.start()
+            
+            self._deadline = time.monotonic() + seconds
+            self._label = label
+            self._expired = False
+            self._cond.notify()
+    
+    def disarm(self) -> bool:
+        """
+        End the deadline of the current call
+        
+        Returns:
+            bool: True if the deadline expired (the call was cancelled)
+        """
+        with self._cond:
+            self._deadline = None
+            expired = self._expired
+            self._expired = False
+            return expired
+    
+    def close(self):
+        """Stop the watchdog thread"""
+        with self._cond:
+            self._stopped = True
+            self._deadline = None
+            self._cond.notify()
+            self._thread = None
+    
+    def _run(self):
+        """Wait for armed deadlines and fire on_expire when one passes"""
+        while True:
+            with self._cond:
+                while not self._stopped and self._deadline is None:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    # Re-checked after a disarm/re-arm or at the deadline
+                    self._cond.wait(remaining)
+                    continue
+                
+                label = self._label
+                self._deadline = None
+                self._expired = True
+            
+            self.logger.error(f"Transaction watchdog: {label} exceeded its deadline, cancelling")
+            try:
+                self.on_expire(label)
+            except Exception as e:
+                self.logger.error(f"Transaction watchdog: cancel failed: {e}")
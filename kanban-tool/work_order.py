@@ -0,0 +1,194 @@
+"""
+CWT Thread Verification System - Work Order
+Bulk Kanban issuing from a CSV or Excel work order
+"""
+
+import csv
+import os
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from batch_writer import BatchItem, BatchJob
+from config import BLOCK_SIZE
+
+
+class WorkOrderLine(NamedTuple):
+    """One line of a work order: a thread code pair and how many cards"""
+    row: int  # Row number in the source file (1-based)
+    thread1: str
+    thread2: str
+    quantity: int
+
+
+def _cell_text(value) -> str:
+    """Convert a spreadsheet cell to text (5.0 -> "5", None -> "")"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _read_rows(path: str) -> Iterable[Tuple[int, List[str]]]:
+    """Yield (row number, cells) from a .csv or .xlsx file"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("Reading Excel work orders requires openpyxl (pip install openpyxl)")
+        
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            for number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                yield number, [_cell_text(value) for value in row]
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for number, row in enumerate(csv.reader(f), start=1):
+                yield number, [cell.strip() for cell in row]
+
+
+def _is_header(cells: List[str]) -> bool:
+    """True for a column header row such as "Thread 1, Thread 2, Quantity" """
+    name = cells[0].lower().replace(' ', '').replace('_', '')
+    return name in ('thread1', 'thread')
+
+
+def _check_code(label: str, code: str) -> Optional[str]:
+    """Apply the write_kanban rules to one thread code"""
+    if not code:
+        return f"{label} code is empty"
+    if len(code) > BLOCK_SIZE:
+        return f"{label} code too long (max {BLOCK_SIZE} chars)"
+    if not code.isascii():
+        return f"{label} code must be ASCII"
+    return None
+
+
+def load_work_order(path: str) -> Tuple[List[WorkOrderLine], List[str]]:
+    """
+    Load and validate a work order
+    
+    Each row is "thread1, thread2[, quantity]" (quantity defaults to 1).
+    An optional header row, blank rows and rows starting with '#' are
+    ignored. Every row is checked before anything is written, so one bad
+    line cannot stop a run halfway.
+    
+    Args:
+        path: .csv or .xlsx file path
+        
+    Returns:
+        Tuple[List[WorkOrderLine], List[str]]: (Lines, Errors per row)
+        
+    Raises:
+        OSError: File cannot be read
+        ValueError: Excel file given but openpyxl is not installed
+    """
+    lines = []
+    errors = []
+    first = True
+    
+    for number, cells in _read_rows(path):
+        if not any(cells) or cells[0].startswith('#'):
+            continue
+        
+        if first and _is_header(cells):
+            first = False
+            continue
+        first = False
+        
+        thread1 = cells[0]
+        thread2 = cells[1] if len(cells) > 1 else ""
+        quantity_text = cells[2] if len(cells) > 2 else ""
+        
+        row_errors = [
+            error for error in (
+                _check_code("Thread 1", thread1),
+                _check_code("Thread 2", thread2),
+            ) if error
+        ]
+        
+        try:
+            quantity = int(quantity_text) if quantity_text else 1
+            if quantity < 1:
+                row_errors.append(f"Quantity must be at least 1 (got {quantity})")
+        except ValueError:
+            quantity = 0
+            row_errors.append(f"Quantity is not a number: '{quantity_text}'")
+        
+        if row_errors:
+            errors.extend(f"Row {number}: {error}" for error in row_errors)
+        else:
+            lines.append(WorkOrderLine(number, thread1, thread2, quantity))
+    
+    if not lines and not errors:
+        errors.append("Work order contains no lines")
+    
+    return lines, errors
+
+
+def build_job(lines: List[WorkOrderLine], **kwargs) -> BatchJob:
+    """
+    Create a batch job that writes the work order in file order
+    
+    Args:
+        lines: Validated work order lines
+        **kwargs: Passed to BatchJob (skip_identical, stop_event)
+    """
+    items = []
+    for line in lines:
+        items.extend([BatchItem(line.thread1, line.thread2)] * line.quantity)
+    return BatchJob(items, **kwargs)
+
+
+def export_results(path: str, lines: List[WorkOrderLine], job: BatchJob) -> str:
+    """
+    Write the per-line outcome of a work order to a CSV file
+    
+    The file is created next to the work order, named
+    <work order>_results_<timestamp>.csv.
+    
+    Args:
+        path: Work order file path
+        lines: Lines the job was built from
+        job: Finished (or stopped) batch job
+        
+    Returns:
+        str: Results file path
+    """
+    base = os.path.splitext(path)[0]
+    results_path = f"{base}_results_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    
+    # Item indexes of each line, in the order build_job laid them out
+    line_of = []
+    for i, line in enumerate(lines):
+        line_of.extend([i] * line.quantity)
+    
+    written = [[] for _ in lines]
+    unchanged = [0] * len(lines)
+    failed = [0] * len(lines)
+    for result in job.results:
+        i = line_of[result.index]
+        if result.success:
+            written[i].append(result.uid)
+            unchanged[i] += result.unchanged
+        else:
+            failed[i] += 1
+    
+    with open(results_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            'row', 'thread1', 'thread2', 'quantity', 'written',
+            'unchanged', 'failed_attempts', 'status', 'uids'
+        ])
+        for i, line in enumerate(lines):
+            writer.writerow([
+                line.row, line.thread1, line.thread2, line.quantity,
+                len(written[i]), unchanged[i], failed[i],
+                'done' if len(written[i]) == line.quantity else 'incomplete',
+                ';'.join(written[i])
+            ])
+    
+    return results_path